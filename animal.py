@@ -0,0 +1,230 @@
+import sys
+from enum import StrEnum
+from typing import Any, Dict, List, Optional
+
+
+class AdoptionStatus(StrEnum):
+    AVAILABLE = 'Disponível'
+    IN_PROCESS = 'Em processo'
+    ADOPTED = 'Adotado'
+
+
+class Size(StrEnum):
+    SMALL = 'Pequeno'
+    MEDIUM = 'Médio'
+    LARGE = 'Grande'
+
+
+class Gender(StrEnum):
+    MALE = 'Macho'
+    FEMALE = 'Fêmea'
+
+
+class EnergyLevel(StrEnum):
+    LOW = 'Baixa'
+    MEDIUM = 'Média'
+    HIGH = 'Alta'
+
+
+# Boolean health/behavior fields packed into Animal.flags, one bit each
+FLAG_BITS: Dict[str, int] = {
+    name: 1 << bit for bit, name in enumerate((
+        'vaccinated', 'dewormed', 'castrated', 'special_needs',
+        'good_with_kids', 'good_with_other_dogs', 'good_with_cats',
+        'good_with_other_animals', 'litter_trained',
+    ))
+}
+
+# Non-boolean nested fields that get their own slot
+SECTION_FIELDS = {
+    'health': ('health_notes',),
+    'behavior': ('temperament', 'energy_level', 'training_level', 'behavior_notes'),
+}
+
+TOP_LEVEL_FIELDS = ('id', 'name', 'species', 'breed', 'age', 'gender', 'size',
+                    'history', 'adoption_status', 'photos')
+
+ENUM_FIELDS = {
+    'adoption_status': AdoptionStatus,
+    'size': Size,
+    'gender': Gender,
+    'energy_level': EnergyLevel,
+}
+
+DEFAULT_LAYOUT = (
+    ('id', 'name', 'breed', 'age', 'gender', 'size', 'health', 'behavior',
+     'history', 'adoption_status', 'photos'),
+    ('vaccinated', 'dewormed', 'castrated', 'special_needs', 'health_notes'),
+    ('temperament', 'energy_level', 'good_with_kids', 'good_with_other_dogs',
+     'good_with_cats', 'training_level', 'behavior_notes'),
+)
+
+_MISSING = object()
+
+# Key orders seen in the data file, shared between all records with the same layout
+_LAYOUTS: Dict[tuple, tuple] = {}
+
+
+def _coerce(field: str, value: Any) -> Any:
+    """Map known labels to their enum member and intern unknown strings"""
+    enum_cls = ENUM_FIELDS.get(field)
+    if enum_cls is not None and isinstance(value, str):
+        member = enum_cls._value2member_map_.get(value)
+        if member is not None:
+            return member
+    if isinstance(value, str):
+        return sys.intern(value)
+    return value
+
+
+def _plain(value: Any) -> Any:
+    """Return enum members as plain strings for serialisation"""
+    if isinstance(value, StrEnum):
+        return value.value
+    return value
+
+
+class Animal:
+    """Compact catalogue record for one animal.
+
+    Replaces the nested dicts loaded from animals.json. Labels are enums, the
+    boolean health/behavior fields are bits in `flags`, and the original key
+    order is kept in a shared layout so to_dict() reproduces the JSON format.
+    """
+
+    __slots__ = (
+        'id', 'name', 'species', 'breed', 'age', 'gender', 'size', 'history',
+        'adoption_status', 'photos', 'flags', 'health_notes', 'temperament',
+        'energy_level', 'training_level', 'behavior_notes', 'layout', 'extra',
+    )
+
+    def __init__(self, id: int, name: str, breed: str = None, age: Optional[int] = None,
+                 gender: str = None, size: str = None, history: str = None,
+                 adoption_status: str = AdoptionStatus.AVAILABLE, photos: Optional[List[str]] = None,
+                 species: Optional[str] = None):
+        self.id = id
+        self.name = name
+        self.species = _coerce('species', species)
+        self.breed = _coerce('breed', breed)
+        self.age = age
+        self.gender = _coerce('gender', gender)
+        self.size = _coerce('size', size)
+        self.history = history
+        self.adoption_status = _coerce('adoption_status', adoption_status)
+        self.photos = photos if photos is not None else []
+        self.flags = 0
+        self.health_notes = None
+        self.temperament = None
+        self.energy_level = None
+        self.training_level = None
+        self.behavior_notes = None
+        self.layout = DEFAULT_LAYOUT
+        self.extra = None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Animal':
+        """Build a record from an animals.json entry"""
+        animal = cls(data['id'], data.get('name'))
+        extra = {}
+        for key, value in data.items():
+            if key in ('health', 'behavior') and isinstance(value, dict):
+                for subkey, subvalue in value.items():
+                    bit = FLAG_BITS.get(subkey)
+                    if bit is not None and isinstance(subvalue, bool):
+                        if subvalue:
+                            animal.flags |= bit
+                    elif subkey in SECTION_FIELDS[key]:
+                        setattr(animal, subkey, _coerce(subkey, subvalue))
+                    else:
+                        extra[f'{key}.{subkey}'] = subvalue
+            elif key in TOP_LEVEL_FIELDS:
+                setattr(animal, key, _coerce(key, value))
+            else:
+                extra[key] = value
+
+        health = data.get('health')
+        behavior = data.get('behavior')
+        layout = (
+            tuple(data),
+            tuple(health) if isinstance(health, dict) else (),
+            tuple(behavior) if isinstance(behavior, dict) else (),
+        )
+        animal.layout = _LAYOUTS.setdefault(layout, layout)
+        animal.extra = extra or None
+        return animal
+
+    def _section_value(self, section: str, key: str) -> Any:
+        if self.extra and f'{section}.{key}' in self.extra:
+            return self.extra[f'{section}.{key}']
+        bit = FLAG_BITS.get(key)
+        if bit is not None:
+            return bool(self.flags & bit)
+        if key in SECTION_FIELDS[section]:
+            return _plain(getattr(self, key))
+        return _MISSING
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialise back to the animals.json entry format"""
+        top_keys, health_keys, behavior_keys = self.layout
+        data = {}
+        for key in top_keys:
+            if key in TOP_LEVEL_FIELDS:
+                data[key] = _plain(getattr(self, key))
+            elif self.extra and key in self.extra:
+                data[key] = self.extra[key]
+            else:
+                keys = health_keys if key == 'health' else behavior_keys
+                data[key] = {subkey: self._section_value(key, subkey) for subkey in keys}
+        return data
+
+    def update(self, updates: Dict[str, Any]) -> None:
+        """Apply a dict of top-level updates, as dict.update did on the old records"""
+        data = self.to_dict()
+        data.update(updates)
+        updated = Animal.from_dict(data)
+        for slot in self.__slots__:
+            setattr(self, slot, getattr(updated, slot))
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Look up a top-level field by its animals.json key"""
+        if key in TOP_LEVEL_FIELDS:
+            value = getattr(self, key)
+            return default if value is None else value
+        if self.extra and key in self.extra:
+            return self.extra[key]
+        return default
+
+    def matches(self, criteria: Dict[str, Any]) -> bool:
+        """Check search criteria; keys the record does not have are ignored"""
+        top_keys = self.layout[0]
+        for key, value in criteria.items():
+            if key not in top_keys:
+                continue
+            if key == 'health' or key == 'behavior':
+                section_keys = self.layout[1 if key == 'health' else 2]
+                for subkey, subvalue in value.items():
+                    if subkey in section_keys and self._section_value(key, subkey) != subvalue:
+                        return False
+            elif key in TOP_LEVEL_FIELDS:
+                if getattr(self, key) != value:
+                    return False
+            elif self.extra.get(key) != value:
+                return False
+        return True
+
+    def __repr__(self) -> str:
+        return f"Animal(id={self.id!r}, name={self.name!r}, adoption_status={_plain(self.adoption_status)!r})"
+
+
+def _flag_property(bit: int) -> property:
+    def getter(self: Animal) -> bool:
+        return bool(self.flags & bit)
+
+    def setter(self: Animal, value: bool) -> None:
+        self.flags = self.flags | bit if value else self.flags & ~bit
+
+    return property(getter, setter)
+
+
+for _name, _bit in FLAG_BITS.items():
+    setattr(Animal, _name, _flag_property(_bit))
@@ -2,6 +2,7 @@ import json
 import os
 from datetime import datetime
 import logging
+from animal import Animal, AdoptionStatus
 
 logger = logging.getLogger(__name__)
 
@@ -9,6 +10,14 @@ class AnimalManager:
     def __init__(self, data_file):
         self.data_file = data_file
         self.animals = self._load_data()
+        self._index = {
+            (animal_type, animal.id): animal
+            for animal_type, animals in self.animals.items()
+            for animal in animals
+        }
+        # Bumped on every mutation so rendered cards can be cached (see render_cache.py)
+        self._versions = {}
+        self.catalogue_version = 0
 
     def _load_data(self):
         """Load animal data from JSON file"""
@@ -20,7 +29,11 @@ class AnimalManager:
                 return self.animals
             
             with open(self.data_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+                data = json.load(f)
+            return {
+                animal_type: [Animal.from_dict(animal) for animal in animals]
+                for animal_type, animals in data.items()
+            }
         except Exception as e:
             logger.error(f"Error loading data file: {str(e)}")
             return {"dogs": [], "cats": [], "others": []}
@@ -30,11 +43,25 @@ class AnimalManager:
         try:
             os.makedirs(os.path.dirname(self.data_file), exist_ok=True)
             with open(self.data_file, 'w', encoding='utf-8') as f:
-                json.dump(self.animals, f, ensure_ascii=False, indent=4)
+                data = {
+                    animal_type: [animal.to_dict() for animal in animals]
+                    for animal_type, animals in self.animals.items()
+                }
+                json.dump(data, f, ensure_ascii=False, indent=4)
         except Exception as e:
             logger.error(f"Error saving data file: {str(e)}")
             raise
 
+    def get_version(self, animal_type, animal_id):
+        """Get the mutation counter of an animal"""
+        return self._versions.get((animal_type, animal_id), 0)
+
+    def _bump_version(self, animal_type, animal_id):
+        """Invalidate cached renderings of an animal and of the listings"""
+        key = (animal_type, animal_id)
+        self._versions[key] = self._versions.get(key, 0) + 1
+        self.catalogue_version += 1
+
     def add_animal(self, animal_type, animal_data):
         """Add a new animal to the database"""
         if animal_type not in self.animals:
@@ -44,48 +71,50 @@ class AnimalManager:
         if not self.animals[animal_type]:
             new_id = 1
         else:
-            new_id = max(animal['id'] for animal in self.animals[animal_type]) + 1
+            new_id = max(animal.id for animal in self.animals[animal_type]) + 1
         
         animal_data['id'] = new_id
-        animal_data['adoption_status'] = 'Disponível'
+        animal_data['adoption_status'] = AdoptionStatus.AVAILABLE.value
         animal_data['photos'] = []
         
-        self.animals[animal_type].append(animal_data)
+        animal = Animal.from_dict(animal_data)
+        self.animals[animal_type].append(animal)
+        self._index[(animal_type, new_id)] = animal
+        self._bump_version(animal_type, new_id)
         self._save_data()
         return new_id
 
     def update_animal(self, animal_type, animal_id, updates):
         """Update animal information"""
-        for animal in self.animals[animal_type]:
-            if animal['id'] == animal_id:
-                animal.update(updates)
-                self._save_data()
-                return True
-        return False
+        animal = self.get_animal(animal_type, animal_id)
+        if animal is None:
+            return False
+        animal.update(updates)
+        self._bump_version(animal_type, animal_id)
+        self._save_data()
+        return True
 
     def get_animal(self, animal_type, animal_id):
         """Get animal information by ID"""
-        for animal in self.animals[animal_type]:
-            if animal['id'] == animal_id:
-                return animal
-        return None
+        return self._index.get((animal_type, animal_id))
 
     def get_available_animals(self, animal_type):
         """Get list of available animals of a specific type"""
-        return [animal for animal in self.animals[animal_type] 
-                if animal['adoption_status'] == 'Disponível']
+        return [animal for animal in self.animals[animal_type]
+                if animal.adoption_status is AdoptionStatus.AVAILABLE]
 
     def add_photo(self, animal_type, animal_id, photo_path):
         """Add photo path to animal's photo list"""
         try:
-            for animal in self.animals[animal_type]:
-                if animal['id'] == animal_id:
-                    if os.path.isabs(photo_path):
-                        photo_path = os.path.relpath(photo_path, os.path.dirname(self.data_file))
-                    animal['photos'].append(photo_path)
-                    self._save_data()
-                    return True
-            return False
+            animal = self.get_animal(animal_type, animal_id)
+            if animal is None:
+                return False
+            if os.path.isabs(photo_path):
+                photo_path = os.path.relpath(photo_path, os.path.dirname(self.data_file))
+            animal.photos.append(photo_path)
+            self._bump_version(animal_type, animal_id)
+            self._save_data()
+            return True
         except Exception as e:
             logger.error(f"Error adding photo: {str(e)}")
             return False
@@ -102,7 +131,7 @@ class AnimalManager:
 
     def update_adoption_status(self, animal_type, animal_id, status):
         """Update animal's adoption status"""
-        valid_statuses = ['Disponível', 'Em processo', 'Adotado']
+        valid_statuses = [status.value for status in AdoptionStatus]
         if status not in valid_statuses:
             raise ValueError(f"Invalid status. Must be one of: {valid_statuses}")
         
@@ -111,52 +140,36 @@ class AnimalManager:
     def generate_animal_card(self, animal):
         """Generate a formatted text card with animal information"""
         card = f"""
-🐾 *{animal['name']}* 🐾
+🐾 *{animal.name}* 🐾
 
 *Informações Básicas:*
-• Tipo: {animal.get('species', 'Cão/Gato')}
-• Raça: {animal['breed']}
-• Idade: {animal['age']} anos
-• Gênero: {animal['gender']}
-• Porte: {animal['size']}
+• Tipo: {animal.species or 'Cão/Gato'}
+• Raça: {animal.breed}
+• Idade: {animal.age} anos
+• Gênero: {animal.gender}
+• Porte: {animal.size}
 
 *Saúde:*
-• Vacinado: {'Sim' if animal['health']['vaccinated'] else 'Não'}
-• Vermifugado: {'Sim' if animal['health']['dewormed'] else 'Não'}
-• Castrado: {'Sim' if animal['health']['castrated'] else 'Não'}
-• Necessidades especiais: {'Sim' if animal['health']['special_needs'] else 'Não'}
-• Observações: {animal['health']['health_notes']}
+• Vacinado: {'Sim' if animal.vaccinated else 'Não'}
+• Vermifugado: {'Sim' if animal.dewormed else 'Não'}
+• Castrado: {'Sim' if animal.castrated else 'Não'}
+• Necessidades especiais: {'Sim' if animal.special_needs else 'Não'}
+• Observações: {animal.health_notes}
 
 *Comportamento:*
-• Temperamento: {animal['behavior']['temperament']}
-• Nível de energia: {animal['behavior']['energy_level']}
-• Bom com crianças: {'Sim' if animal['behavior']['good_with_kids'] else 'Não'}
-• Observações: {animal['behavior']['behavior_notes']}
+• Temperamento: {animal.temperament}
+• Nível de energia: {animal.energy_level}
+• Bom com crianças: {'Sim' if animal.good_with_kids else 'Não'}
+• Observações: {animal.behavior_notes}
 
 *História:*
-{animal['history']}
+{animal.history}
 
 *Status de Adoção:*
-{animal['adoption_status']}
+{animal.adoption_status}
 """
         return card
 
     def search_animals(self, animal_type, criteria):
         """Search animals based on criteria"""
-        results = []
-        for animal in self.animals[animal_type]:
-            match = True
-            for key, value in criteria.items():
-                if key in animal:
-                    if isinstance(animal[key], dict):
-                        if key in ['health', 'behavior']:
-                            for subkey, subvalue in value.items():
-                                if subkey in animal[key] and animal[key][subkey] != subvalue:
-                                    match = False
-                                    break
-                    elif animal[key] != value:
-                        match = False
-                        break
-            if match:
-                results.append(animal)
-        return results 
\ No newline at end of file
+        return [animal for animal in self.animals[animal_type] if animal.matches(criteria)]
@@ -1,58 +1,314 @@
 import flask
-import geopy.geocoders
-import json
 import os
+import re
+import math
+from care_index import CareIndex
+from intent_matcher import IntentMatcher
+from shelter_index import ShelterIndex
+from geocoder import Gazetteer, GeocodeCache, Geocoder, nominatim_geocoder
+from response_cache import ResponseCache, make_response
+from text_utils import fold
 
 app = flask.Flask(__name__)
 
-with open('data/pet_care.json', 'r', encoding='utf-8') as f:
-    pet_care_data = json.load(f)
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
 
-def get_nearby_shelters(location):
+# Pet care answers are retrieved by similarity; editing the JSON takes effect without a restart
+care_index = CareIndex(os.path.join(DATA_DIR, 'pet_care.json'))
+# Keyword intents, matched in one pass over the message
+intents = IntentMatcher()
+# Shelter registry, indexed by position
+shelter_index = ShelterIndex.load(os.path.join(DATA_DIR, 'shelters.json'))
+NEARBY_SHELTERS = 3
+MAX_SHELTERS = 20
+
+# Free-text locations resolve offline through the gazetteer; GEOCODER=nominatim also asks
+# OpenStreetMap for places it does not know, caching the answers in data/geocode_cache.json
+GEOCODER = os.getenv('GEOCODER', 'offline').lower()
+geocoder = Geocoder(
+    Gazetteer.load(os.path.join(DATA_DIR, 'gazetteer.json')),
+    GeocodeCache(os.path.join(DATA_DIR, 'geocode_cache.json')),
+    nominatim_geocoder('pet-adoption-chatbot') if GEOCODER == 'nominatim' else None
+)
+
+# Serialized /chat responses by normalized message and location (per process; 0 disables)
+response_cache = ResponseCache(int(os.getenv('CHAT_CACHE_ENTRIES', '4096')))
+# Most messages accepted by /chat/batch and /chat/stream in one request
+CHAT_BATCH_LIMIT = int(os.getenv('CHAT_BATCH_LIMIT', '100'))
+# Messages /chat/stream computes together before emitting their results
+CHAT_STREAM_CHUNK = 16
+
+_COORDINATES = re.compile(r'^\s*(-?\d+(?:\.\d+)?)\s*[,;]\s*(-?\d+(?:\.\d+)?)\s*$')
+
+def valid_point(lat, lon):
+    """Finite coordinates within the latitude and longitude ranges"""
+    return math.isfinite(lat) and math.isfinite(lon) and -90 <= lat <= 90 and -180 <= lon <= 180
+
+def parse_coordinates(text):
+    """'-23.55, -46.63' -> (-23.55, -46.63), or None"""
+    match = _COORDINATES.match(text or '')
+    if not match:
+        return None
+    lat, lon = float(match.group(1)), float(match.group(2))
+    if valid_point(lat, lon):
+        return lat, lon
+    return None
+
+def locate(location):
+    """Coordinates of a free-text location: 'lat, lon', a known place, or a city with registered shelters"""
+    point = parse_coordinates(location)
+    if point is not None:
+        return point
+    place = geocoder.resolve(location)
+    if place is not None:
+        return place.lat, place.lon
+    return shelter_index.city_center(location or '')
+
+def get_nearby_shelters(location, lat=None, lon=None, radius_km=None):
+    """Shelters nearest to coordinates or to a free-text location"""
+    if lat is not None and lon is not None:
+        point = (lat, lon)
+    else:
+        point = locate(location)
+    if point is None:
+        return []
+    if radius_km:
+        found = shelter_index.within(*point, radius_km, limit=MAX_SHELTERS)
+    else:
+        found = shelter_index.nearest(*point, k=NEARBY_SHELTERS)
     return [
-        {"name": "Happy Paws Shelter", "address": "123 Pet Street, " + location, "distance": "2.5 miles"},
-        {"name": "Furry Friends Rescue", "address": "456 Animal Avenue, " + location, "distance": "3.1 miles"},
-        {"name": "Paws and Claws Sanctuary", "address": "789 Rescue Road, " + location, "distance": "4.2 miles"}
+        {
+            "name": shelter.name,
+            "address": shelter.address,
+            "city": shelter.city,
+            "distance": f"{distance:.1f} km",
+            "distance_km": round(distance, 2)
+        }
+        for shelter, distance in found
     ]
 
 def get_pet_care_info(topic):
-    return pet_care_data.get(topic, "I'm sorry, I don't have information about that topic yet.")
+    return care_index.get(topic) or "I'm sorry, I don't have information about that topic yet."
 
 @app.route('/')
 def home():
     return flask.render_template('index.html')
 
+def parse_number(data, name):
+    """A numeric field of a request body as a float, or None when it is absent"""
+    value = data.get(name)
+    if value is None:
+        return None
+    if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+        raise ValueError(f"{name} must be a number")
+    return float(value)
+
+def parse_request(data):
+    """A /chat request body with its coordinates parsed; ValueError says why it is invalid"""
+    if not isinstance(data, dict):
+        raise ValueError('Each message must be a string or an object')
+    message = data.get('message') or ''
+    location = data.get('location') or ''
+    if not isinstance(message, str) or not isinstance(location, str):
+        raise ValueError('message and location must be strings')
+    try:
+        lat, lon, radius_km = (parse_number(data, name) for name in ('lat', 'lon', 'radius_km'))
+    except ValueError:
+        raise ValueError('lat, lon and radius_km must be numbers')
+    # Either coordinate may come alone (it is then ignored), but each must be in range
+    if not valid_point(0.0 if lat is None else lat, 0.0 if lon is None else lon):
+        raise ValueError('lat must be between -90 and 90 and lon between -180 and 180')
+    if radius_km is not None and not (math.isfinite(radius_km) and radius_km >= 0):
+        raise ValueError('radius_km must be a positive number')
+    return {
+        'message': message,
+        'location': location,
+        'lat': lat,
+        'lon': lon,
+        'radius_km': radius_km or None
+    }
+
+def shelter_response(request):
+    """Response payload, status and whether it may be cached, for a shelter search"""
+    shelters = get_nearby_shelters(request['location'], request['lat'], request['lon'], request['radius_km'])
+    if not shelters:
+        # Not cached: a remote geocoder may know the place next time
+        return {
+            'response': "I couldn't find shelters for that location. "
+                        "Send a city or coordinates like '-23.55, -46.63'."
+        }, 200, False
+    return {
+        'response': 'Here are some nearby shelters:',
+        'shelters': shelters
+    }, 200, True
+
+def care_response(hits):
+    """Response payload, status and whether it may be cached, for the care topics found"""
+    if hits:
+        return {
+            'response': hits[0].answer,
+            'topic': hits[0].topic,
+            'related': [hit.topic for hit in hits[1:]]
+        }, 200, True
+
+    return {
+        'response': "I can help you with information about pet adoption, nearby shelters, and pet care. What would you like to know?"
+    }, 200, True
+
+def chat_responses(batch):
+    """(payload, status, cacheable) for each parsed /chat request, in order.
+
+    Shelter searches are answered one by one; the care questions of the
+    whole batch are ranked together in one index search.
+    """
+    results = [None] * len(batch)
+    care_rows = []
+    for row, data in enumerate(batch):
+        scores = {match.intent: match.score for match in intents.match(data['message'])}
+        if scores.get('shelter', 0) + scores.get('adopt', 0) > scores.get('care', 0):
+            results[row] = shelter_response(data)
+        else:
+            care_rows.append(row)
+    hits = care_index.search_many([batch[row]['message'] for row in care_rows], k=3)
+    for row, row_hits in zip(care_rows, hits):
+        results[row] = care_response(row_hits)
+    return results
+
+def chat_response(request):
+    """Response payload, status and whether it may be cached, for a parsed /chat request"""
+    return chat_responses([request])[0]
+
+def cache_key(request):
+    """Requests differing only in case, accents, spacing or how coordinates are written share a response"""
+    return (
+        care_index.version,
+        ' '.join(fold(str(request['message'])).split()),
+        ' '.join(fold(str(request['location'])).split()),
+        *(None if request[name] is None else round(request[name], 6) for name in ('lat', 'lon', 'radius_km'))
+    )
+
+def precompute_responses():
+    """Cache the answers to the bare care topic names and the default reply"""
+    for message in ['', *(topic.replace('_', ' ') for topic in care_index.topics())]:
+        request = parse_request({'message': message})
+        payload, status, cacheable = chat_response(request)
+        if cacheable:
+            response_cache.put(cache_key(request), make_response(payload, status))
+
+def refresh_care_index():
+    """Pick up edits to the pet care JSON, re-warming the response cache when it changed"""
+    version = care_index.version
+    care_index.refresh()
+    if care_index.version != version:
+        precompute_responses()
+
+def compute_responses(batch):
+    """Serialized responses for parsed requests missing from the cache; repeated requests are computed once"""
+    keys = [cache_key(data) for data in batch]
+    unique = {}
+    for key, data in zip(keys, batch):
+        unique.setdefault(key, data)
+    computed = {}
+    for key, (payload, status, cacheable) in zip(unique, chat_responses(list(unique.values()))):
+        computed[key] = make_response(payload, status)
+        if cacheable:
+            response_cache.put(key, computed[key])
+    return [computed[key] for key in keys]
+
+def iter_responses(batch, chunk_size):
+    """(row, serialized response) for each request body: invalid and cached ones first, then the rest chunk_size at a time"""
+    requests = [None] * len(batch)
+    pending = []
+    for row, data in enumerate(batch):
+        try:
+            requests[row] = parse_request(data)
+        except ValueError as e:
+            # Rejected before it reaches the cache
+            yield row, make_response({'error': str(e)}, 400)
+            continue
+        cached = response_cache.get(cache_key(requests[row]))
+        if cached is None:
+            pending.append(row)
+        else:
+            yield row, cached
+    for start in range(0, len(pending), chunk_size):
+        rows = pending[start:start + chunk_size]
+        yield from zip(rows, compute_responses([requests[row] for row in rows]))
+
+def with_fields(cached, **fields):
+    """A cached JSON object with fields prepended, spliced in without re-serializing it"""
+    prefix = ','.join(f'"{name}":{value}' for name, value in fields.items())
+    return b'{' + prefix.encode() + b',' + cached.body[1:]
+
+def read_batch():
+    """(request bodies, None) from a {"messages": [...]} or bare list body, or (None, error response).
+
+    Messages may be strings or /chat request objects; any other item gets
+    its own 400 result, like an object that fails validation.
+    """
+    body = flask.request.get_json(silent=True)
+    messages = body.get('messages') if isinstance(body, dict) else body
+    if not isinstance(messages, list):
+        return None, (flask.jsonify({'error': 'Send {"messages": [...]}'}), 400)
+    if len(messages) > CHAT_BATCH_LIMIT:
+        return None, (flask.jsonify({'error': f'At most {CHAT_BATCH_LIMIT} messages per request'}), 413)
+    return [{'message': message} if isinstance(message, str) else message for message in messages], None
+
 @app.route('/chat', methods=['POST'])
 def chat():
-    data = flask.request.json
-    message = data.get('message', '').lower()
-    
-    if 'shelter' in message or 'adopt' in message:
-        location = data.get('location', '')
-        shelters = get_nearby_shelters(location)
-        return flask.jsonify({
-            'response': 'Here are some nearby shelters:',
-            'shelters': shelters
-        })
-    
-    elif 'care' in message or 'feed' in message or 'vaccine' in message:
-        topic = 'general_care'  # Default topic
-        if 'feed' in message:
-            topic = 'feeding'
-        elif 'vaccine' in message:
-            topic = 'vaccination'
-        elif 'adapt' in message or 'new home' in message:
-            topic = 'adaptation'
-        
-        info = get_pet_care_info(topic)
-        return flask.jsonify({
-            'response': info
-        })
-    
+    data = flask.request.get_json(silent=True)
+    if not isinstance(data, dict):
+        data = {}
+    refresh_care_index()
+    _, cached = next(iter_responses([data], 1))
+
+    if cached.status == 200 and cached.etag in flask.request.if_none_match:
+        response = flask.Response(status=304)
     else:
-        return flask.jsonify({
-            'response': "I can help you with information about pet adoption, nearby shelters, and pet care. What would you like to know?"
-        })
+        response = flask.Response(cached.body, status=cached.status, mimetype='application/json')
+    response.set_etag(cached.etag)
+    return response
+
+@app.route('/chat/batch', methods=['POST'])
+def chat_batch():
+    """Answers to a list of messages, in order, each with its own status"""
+    batch, error = read_batch()
+    if error:
+        return error
+    refresh_care_index()
+    results = [None] * len(batch)
+    for row, cached in iter_responses(batch, max(len(batch), 1)):
+        results[row] = with_fields(cached, status=cached.status)
+    return flask.Response(b'{"results":[' + b','.join(results) + b']}', mimetype='application/json')
+
+@app.route('/chat/stream', methods=['POST'])
+def chat_stream():
+    """Answers to a list of messages as they are ready, tagged with their index.
+
+    Newline-delimited JSON by default; Server-Sent Events, ending with a
+    'done' event, when the client accepts text/event-stream.
+    """
+    batch, error = read_batch()
+    if error:
+        return error
+    refresh_care_index()
+    sse = flask.request.accept_mimetypes.best_match(
+        ['application/x-ndjson', 'text/event-stream']) == 'text/event-stream'
+
+    def generate():
+        for row, cached in iter_responses(batch, CHAT_STREAM_CHUNK):
+            line = with_fields(cached, index=row, status=cached.status)
+            yield b'id: %d\ndata: %s\n\n' % (row, line) if sse else line + b'\n'
+        if sse:
+            yield b'event: done\ndata: {}\n\n'
+
+    response = flask.Response(generate(), mimetype='text/event-stream' if sse else 'application/x-ndjson')
+    response.headers['Cache-Control'] = 'no-cache'
+    # Keep proxies such as nginx from buffering the stream
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+precompute_responses()
 
 if __name__ == '__main__':
     app.run(debug=True) 
\ No newline at end of file
@@ -0,0 +1,119 @@
+"""Micro-benchmark for callback_data decoding and dispatch.
+
+Compares the old chain of startswith/split checks from telegram_bot.button
+with CallbackRouter.decode on the same mix of button presses.
+
+    python benchmarks/bench_callback_dispatch.py [iterations]
+"""
+import os
+import sys
+import asyncio
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from callback_router import CallbackRouter, Action
+
+
+async def _noop(update, context, *args):
+    return args
+
+
+def build_router():
+    router = CallbackRouter()
+    router.route(Action.BACK_TO_TYPES)(_noop)
+    router.route(Action.LIST_ANIMALS, 'T')(_noop)
+    router.route(Action.ANIMAL_DETAILS, 'TI')(_noop)
+    router.route(Action.START_INTERVIEW, 'TI')(_noop)
+    return router
+
+
+def legacy_decode(data):
+    """The routing logic telegram_bot.button used before CallbackRouter"""
+    if data == 'back_to_types':
+        return 'back', ()
+    elif data.startswith('animal_'):
+        animal_type = data.split('_')[1]
+        if animal_type not in ['dog', 'cat']:
+            raise ValueError(f"Invalid animal type: {animal_type}")
+        return 'list', (animal_type,)
+    elif data.startswith('list_'):
+        animal_type = data.split('_')[1]
+        if animal_type not in ['dog', 'cat']:
+            raise ValueError(f"Invalid animal type: {animal_type}")
+        return 'list', (animal_type,)
+    elif data.startswith('select_animal_'):
+        _, _, animal_type, animal_id = data.split('_')
+        if animal_type not in ['dog', 'cat']:
+            raise ValueError(f"Invalid animal type: {animal_type}")
+        return 'details', (animal_type, int(animal_id))
+    elif data.startswith('start_interview_'):
+        _, _, animal_type, animal_id = data.split('_')
+        if animal_type not in ['dog', 'cat']:
+            raise ValueError(f"Invalid animal type: {animal_type}")
+        return 'interview', (animal_type, int(animal_id))
+    return None
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    router = build_router()
+
+    legacy_payloads = [
+        'back_to_types', 'animal_dog', 'list_cat',
+        'select_animal_dog_12', 'start_interview_cat_4711',
+    ]
+    compact_payloads = [
+        router.encode(Action.BACK_TO_TYPES),
+        router.encode(Action.LIST_ANIMALS, 'dogs'),
+        router.encode(Action.LIST_ANIMALS, 'cats'),
+        router.encode(Action.ANIMAL_DETAILS, 'dogs', 12),
+        router.encode(Action.START_INTERVIEW, 'cats', 4711),
+    ]
+
+    print("Payload sizes (bytes):")
+    for legacy, compact in zip(legacy_payloads, compact_payloads):
+        print(f"  {legacy:<28} {len(legacy):>3}   {compact:<14} {len(compact):>3}")
+
+    def run_legacy():
+        for data in legacy_payloads:
+            legacy_decode(data)
+
+    def run_compact():
+        for data in compact_payloads:
+            router.decode(data)
+
+    def run_compact_uncached():
+        for data in compact_payloads:
+            router._decode_compact(data)
+
+    def run_legacy_compat():
+        for data in legacy_payloads:
+            router.decode(data)
+
+    print(f"\nDecode cost per callback ({iterations} rounds of {len(legacy_payloads)}):")
+    for name, func in (
+        ('startswith chain', run_legacy),
+        ('CallbackRouter (compact)', run_compact),
+        ('CallbackRouter (compact, cold)', run_compact_uncached),
+        ('CallbackRouter (legacy strings)', run_legacy_compat),
+    ):
+        seconds = min(timeit.repeat(func, number=iterations, repeat=3))
+        per_call = seconds / (iterations * len(legacy_payloads)) * 1e9
+        print(f"  {name:<32} {per_call:8.1f} ns")
+
+    async def dispatch_all():
+        for _ in range(iterations // 10):
+            for data in compact_payloads:
+                handler, args = router.decode(data)
+                await handler(None, None, *args)
+
+    loop = asyncio.new_event_loop()
+    seconds = min(timeit.repeat(lambda: loop.run_until_complete(dispatch_all()), number=1, repeat=3))
+    per_call = seconds / ((iterations // 10) * len(compact_payloads)) * 1e9
+    print(f"  {'decode + await handler':<32} {per_call:8.1f} ns")
+    loop.close()
+
+
+if __name__ == '__main__':
+    main()
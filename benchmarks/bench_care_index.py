@@ -0,0 +1,99 @@
+"""Pet care retrieval latency as the knowledge base grows.
+
+Builds CareIndex over synthetic knowledge bases of increasing size (the
+real data/pet_care.json entries plus generated topics drawn from a
+vocabulary of English and Portuguese pet care words) and reports the
+build time, per-query latency percentiles and the time per query when
+--batch queries are ranked together with search_many().
+
+    python benchmarks/bench_care_index.py --sizes 4 100 1000 5000
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+import logging
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from care_index import CareIndex
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+WORDS = (
+    "dog cat puppy kitten food feeding diet water vaccine vaccination booster rabies vet "
+    "grooming bath brushing nails teeth exercise walk play toys training leash litter box "
+    "adoption shelter home routine anxiety fleas ticks worms parasites weight senior "
+    "cachorro gato filhote ração comida água vacina vacinação veterinário banho escovação "
+    "unhas dentes passeio brinquedos treinamento coleira caixa de areia adoção abrigo "
+    "casa rotina ansiedade pulgas carrapatos vermes peso idoso castração alimentação"
+).split()
+
+QUERIES = [
+    "how often should I feed my puppy",
+    "vaccines for kittens",
+    "my dog needs to adapt to the new home",
+    "qual ração devo dar ao filhote",
+    "como tirar pulgas do gato",
+    "senior cat weight loss",
+]
+
+
+def knowledge_base(size, rng):
+    with open(os.path.join(BASE_DIR, 'data', 'pet_care.json'), 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    for index in range(len(data), size):
+        words = rng.choices(WORDS, k=60)
+        data[f"topic_{index}"] = {
+            "answer": ' '.join(words),
+            "keywords": rng.sample(WORDS, 5)
+        }
+    return dict(list(data.items())[:size])
+
+
+def percentile(samples, fraction):
+    return samples[min(len(samples) - 1, int(len(samples) * fraction))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[4, 100, 1000, 5000])
+    parser.add_argument('--queries', type=int, default=2000)
+    parser.add_argument('--batch', type=int, default=100, help="queries per search_many() call")
+    args = parser.parse_args()
+    logging.getLogger('care_index').setLevel(logging.WARNING)
+    rng = random.Random(42)
+
+    print(f"{'topics':>7} {'build ms':>9} {'p50 us':>8} {'p99 us':>8} {'batch us/query':>15}")
+    for size in args.sizes:
+        with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False, encoding='utf-8') as f:
+            json.dump(knowledge_base(size, rng), f, ensure_ascii=False)
+        try:
+            started = time.perf_counter()
+            index = CareIndex(f.name, check_interval=3600)
+            build = time.perf_counter() - started
+            samples = []
+            for i in range(args.queries):
+                query = QUERIES[i % len(QUERIES)]
+                started = time.perf_counter()
+                index.search(query)
+                samples.append(time.perf_counter() - started)
+            samples.sort()
+            batch = [QUERIES[i % len(QUERIES)] for i in range(args.batch)]
+            started = time.perf_counter()
+            rounds = max(1, args.queries // args.batch)
+            for _ in range(rounds):
+                index.search_many(batch)
+            batched = (time.perf_counter() - started) / (rounds * args.batch)
+            print(f"{size:>7} {build * 1000:>9.1f} "
+                  f"{percentile(samples, 0.5) * 1e6:>8.0f} {percentile(samples, 0.99) * 1e6:>8.0f} "
+                  f"{batched * 1e6:>15.0f}")
+        finally:
+            os.remove(f.name)
+
+
+if __name__ == '__main__':
+    main()
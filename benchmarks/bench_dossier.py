@@ -0,0 +1,96 @@
+"""Batch dossier vs one PDF per interview.
+
+Builds one consolidated PDF of the same interviews two ways: rendering a
+separate PDF per interview (one canvas each, as generate_pdf does) and
+merging them with pypdf, and dossier.build_dossier, inline and with a
+process pool. Reports wall time, or with --memory the peak memory
+allocated in this process (tracemalloc, which slows rendering down).
+
+    python benchmarks/bench_dossier.py --interviews 1000 --workers 4
+    python benchmarks/bench_dossier.py --interviews 5000 --memory
+"""
+import os
+import sys
+import time
+import argparse
+import tracemalloc
+from io import BytesIO
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+from pypdf import PdfWriter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dossier import build_dossier
+from pdf_generator import render_interview_pdf
+
+
+def make_interviews(count, answers_per_interview):
+    answers = {
+        f"Pergunta {i + 1}: Qual é a sua experiência com animais?": f"Resposta número {i + 1}."
+        for i in range(answers_per_interview)
+    }
+    now = datetime.now()
+    for interview_id in range(1, count + 1):
+        yield {
+            'interview': {
+                'id': interview_id, 'interviewee_id': interview_id, 'animal_type': 'cats',
+                'animal_id': 1, 'status': 'pending', 'created_at': now, 'completed_at': now,
+            },
+            'interviewee': {'id': 1000 + interview_id, 'username': 'adotante', 'first_name': 'Maria', 'last_name': 'Silva'},
+            'answers': answers,
+            'files': [],
+        }
+
+
+def report(label, started, size, memory):
+    line = f"{label:>22}: {time.perf_counter() - started:6.2f} s, {size / 1024:8.0f} KB"
+    if memory:
+        line += f", peak {tracemalloc.get_traced_memory()[1] / 2 ** 20:6.1f} MB"
+        tracemalloc.reset_peak()
+    print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--interviews', type=int, default=500)
+    parser.add_argument('--answers', type=int, default=10)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--memory', action='store_true', help='report peak allocations')
+    args = parser.parse_args()
+    if args.memory:
+        tracemalloc.start()
+
+    print(f"{args.interviews} interviews with {args.answers} answers")
+
+    started = time.perf_counter()
+    writer = PdfWriter()
+    for result in make_interviews(args.interviews, args.answers):
+        writer.append(BytesIO(render_interview_pdf(
+            result['interviewee']['id'], result['interviewee'], result['answers'],
+            'Amora (ID: 1)', result['interview']['completed_at']
+        )))
+    output = BytesIO()
+    writer.write(output)
+    report('separate PDFs, merged', started, len(output.getvalue()), args.memory)
+    del writer, output
+
+    started = time.perf_counter()
+    output = BytesIO()
+    build_dossier(make_interviews(args.interviews, args.answers), output, label_for=lambda *_: 'Amora (ID: 1)')
+    report('dossier (inline)', started, len(output.getvalue()), args.memory)
+    del output
+
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        executor.submit(int).result()  # start the workers before timing
+        started = time.perf_counter()
+        output = BytesIO()
+        build_dossier(
+            make_interviews(args.interviews, args.answers), output, label_for=lambda *_: 'Amora (ID: 1)',
+            executor=executor, max_in_flight=2 * args.workers
+        )
+        report(f'dossier ({args.workers} processes)', started, len(output.getvalue()), args.memory)
+
+
+if __name__ == '__main__':
+    main()
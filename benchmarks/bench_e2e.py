@@ -0,0 +1,238 @@
+"""End-to-end benchmark of the bot's handlers against the fake Bot API.
+
+Every simulated user goes through the whole adoption journey with the real
+handlers: /start (catalogue listing with photos), the type filter, an
+animal's details, the start of the interview, --photos photos and the ten
+answers, the last of which completes the interview. A user waits for the
+bot to finish an update before sending the next one, as a person would,
+and --users of them run at once. The Bot API is
+benchmarks/fake_telegram.py with --latency added to every call.
+
+For each number of users it reports updates and journeys per second, the
+p50/p99 latency of every stage, how long the owner notifications queued
+by completions took to drain, and where the time went inside the bot
+(Bot API calls and internal operations, from the bot's metrics).
+--photo-archive serves catalogue photos from the packed archive instead
+of compressing them for every listing.
+
+The database and stored files go to a scratch directory; the repository's
+data directory is not touched.
+
+    python benchmarks/bench_e2e.py --users 1 10 50 --latency 0.05
+    python benchmarks/bench_e2e.py --users 10 --photo-archive
+"""
+import os
+import io
+import sys
+import time
+import shutil
+import asyncio
+import argparse
+import tempfile
+from collections import defaultdict
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BASE_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, BASE_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+from fake_telegram import FakeTelegramServer
+from bench_webhook_throughput import text_update
+
+TOKEN = '123456:FAKE-TOKEN'
+OWNER_ID = 1
+STAGES = ('start', 'list', 'details', 'interview', 'photo', 'answer', 'completion')
+ANSWERS = [
+    'Maria da Silva', '34 anos', 'Rua das Flores, 100', 'casa com quintal', 'um gato idoso',
+    'sim, todos', 'sim, uma cadela que viveu 15 anos', 'umas quatro horas', 'sim, tenho',
+    'quero dar um lar para um animal'
+]
+
+
+def photo_pool(count):
+    """Distinct JPEGs (smooth colour fields), so the bot does not drop them as resends"""
+    import numpy as np
+    from PIL import Image
+
+    rng = np.random.default_rng(7)
+    pool = []
+    for _ in range(count):
+        field = Image.fromarray(rng.integers(0, 256, (6, 8, 3), dtype=np.uint8))
+        output = io.BytesIO()
+        field.resize((1280, 960), Image.BILINEAR).save(output, format='JPEG', quality=90)
+        pool.append(output.getvalue())
+    return pool
+
+
+def photo_update(update_id, user_id, file_id):
+    update = text_update(update_id, user_id, '')
+    del update['message']['text']
+    update['message']['photo'] = [{'file_id': file_id, 'file_unique_id': file_id, 'width': 1280, 'height': 960}]
+    return update
+
+
+def callback_update(update_id, user_id, data):
+    user = {'id': user_id, 'is_bot': False, 'first_name': f'User{user_id}', 'username': f'user{user_id}'}
+    return {
+        'update_id': update_id,
+        'callback_query': {
+            'id': str(update_id), 'from': user, 'chat_instance': str(user_id), 'data': data,
+            'message': {
+                'message_id': update_id, 'date': int(time.time()), 'from': user,
+                'chat': {'id': user_id, 'type': 'private'}, 'text': 'menu',
+            },
+        },
+    }
+
+
+def command_update(update_id, user_id, command):
+    update = text_update(update_id, user_id, command)
+    update['message']['entities'] = [{'type': 'bot_command', 'offset': 0, 'length': len(command)}]
+    return update
+
+
+def journey(telegram_bot, user_id, animal_type, animal_id, photos):
+    """(stage, update) pairs of one user's adoption journey"""
+    router, Action = telegram_bot.router, telegram_bot.Action
+    steps = [
+        ('start', command_update(0, user_id, '/start')),
+        ('list', callback_update(0, user_id, router.encode(Action.LIST_ANIMALS, animal_type))),
+        ('details', callback_update(0, user_id, router.encode(Action.ANIMAL_DETAILS, animal_type, animal_id))),
+        ('interview', callback_update(0, user_id, router.encode(Action.START_INTERVIEW, animal_type, animal_id))),
+    ]
+    steps += [('photo', photo_update(0, user_id, f'bench-{user_id}-{index}')) for index in range(photos)]
+    steps += [
+        ('answer' if index < len(ANSWERS) - 1 else 'completion', text_update(0, user_id, answer))
+        for index, answer in enumerate(ANSWERS)
+    ]
+    return steps
+
+
+async def run_user(application, steps, latencies, next_update_id):
+    from telegram import Update
+
+    for stage, data in steps:
+        data['update_id'] = next_update_id()
+        update = Update.de_json(data, application.bot)
+        started = time.perf_counter()
+        await application.process_update(update)
+        latencies[stage].append(time.perf_counter() - started)
+
+
+def metric_totals(telegram_bot):
+    totals = {}
+    for kind, operations in (('api', telegram_bot.telegram_metrics), ('op', telegram_bot.operation_metrics)):
+        for (name,), (count, seconds) in operations.seconds.totals().items():
+            totals[(kind, name)] = (count, seconds)
+    return totals
+
+
+async def run_round(telegram_bot, fake, users, photos, animals, first_user):
+    application = telegram_bot.build_application(TOKEN)
+    await application.initialize()
+    await application.start()
+    fake.reset()
+    before = metric_totals(telegram_bot)
+
+    counter = iter(range(1, 10 ** 9))
+    latencies = defaultdict(list)
+    journeys = []
+    for user in range(users):
+        animal_type, animal_id = animals[user % len(animals)]
+        journeys.append(journey(telegram_bot, first_user + user, animal_type, animal_id, photos))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        run_user(application, steps, latencies, lambda: next(counter)) for steps in journeys
+    ))
+    elapsed = time.perf_counter() - started
+    # Completions leave the owner notifications running in the background; stop() waits for them
+    drain_started = time.perf_counter()
+    await application.stop()
+    drain = time.perf_counter() - drain_started
+    await application.shutdown()
+
+    after = metric_totals(telegram_bot)
+    internals = {}
+    for key, (count, seconds) in after.items():
+        previous = before.get(key, (0, 0.0))
+        if count > previous[0]:
+            internals[key] = (count - previous[0], seconds - previous[1])
+    return elapsed, drain, latencies, internals, fake.count()
+
+
+def percentile(samples, fraction):
+    return samples[min(len(samples) - 1, int(len(samples) * fraction))]
+
+
+def report(users, elapsed, drain, latencies, internals, api_calls):
+    updates = sum(len(samples) for samples in latencies.values())
+    print(f"\n{users} users: {updates} updates in {elapsed:.2f} s, {updates / elapsed:.1f} updates/s, "
+          f"{users / elapsed:.2f} journeys/s; owner notifications drained {drain:.2f} s later, "
+          f"{api_calls} Bot API calls")
+    print(f"  {'stage':<12} {'updates':>8} {'p50 ms':>9} {'p99 ms':>9} {'max ms':>9} {'share':>7}")
+    total = sum(sum(samples) for samples in latencies.values()) or 1
+    for stage in STAGES:
+        samples = sorted(latencies.get(stage, []))
+        if not samples:
+            continue
+        print(f"  {stage:<12} {len(samples):>8} {percentile(samples, 0.5) * 1000:>9.1f} "
+              f"{percentile(samples, 0.99) * 1000:>9.1f} {samples[-1] * 1000:>9.1f} {sum(samples) / total:>7.1%}")
+    print(f"  {'inside the bot':<28} {'calls':>7} {'mean ms':>9} {'total s':>9}")
+    for (kind, name), (count, seconds) in sorted(internals.items(), key=lambda item: -item[1][1]):
+        label = f"{'Bot API' if kind == 'api' else 'operation'} {name}"
+        print(f"  {label:<28} {count:>7} {seconds / count * 1000:>9.1f} {seconds:>9.2f}")
+
+
+async def main_async(args):
+    pool = photo_pool(max(args.photos, 1))
+    fake = FakeTelegramServer(
+        latency=args.latency,
+        file_bytes=lambda path: pool[int(path.rsplit('-', 1)[-1].split('.')[0]) % len(pool)]
+    ).start()
+    os.environ['TELEGRAM_API_URL'] = fake.url
+    os.environ['BOT_OWNER_ID'] = str(OWNER_ID)
+    import telegram_bot
+    telegram_bot.TELEGRAM_API_URL = fake.url
+    telegram_bot.BOT_OWNER_ID = OWNER_ID
+    telegram_bot.PHOTO_ARCHIVE = args.photo_archive
+
+    scratch = tempfile.mkdtemp()
+    try:
+        telegram_bot.DATA_DIR = os.path.join(scratch, 'data')
+        telegram_bot.BLOB_DIR = os.path.join(scratch, 'data', 'blobs')
+        os.makedirs(telegram_bot.DATA_DIR)
+        shutil.copy(os.path.join(BASE_DIR, 'data', 'animals.json'), telegram_bot.DATA_DIR)
+        telegram_bot.create_components()
+        animals = [
+            (animal_type, payload.animal_id)
+            for animal_type in ('cats', 'dogs')
+            for payload in telegram_bot.render_cache.get_listing(animal_type)
+        ]
+
+        print(f"Bot API latency {args.latency * 1000:.0f} ms, {args.photos} photos per interview, "
+              f"{len(animals)} animals in the catalogue, PDFs: {telegram_bot.INTERVIEW_PDF_MODE}, "
+              f"photo archive: {'on' if args.photo_archive else 'off'}")
+        # Fresh user ids every round, so no interview session carries over
+        first_user = 10000
+        for users in args.users:
+            result = await run_round(telegram_bot, fake, users, args.photos, animals, first_user)
+            first_user += users
+            report(users, *result)
+    finally:
+        telegram_bot.close_components()
+        fake.stop()
+        shutil.rmtree(scratch, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, nargs='+', default=[1, 10, 50], help='concurrent users per round')
+    parser.add_argument('--photos', type=int, default=2, help='photos sent during each interview')
+    parser.add_argument('--latency', type=float, default=0.05, help='seconds per Bot API call')
+    parser.add_argument('--photo-archive', action='store_true', help='serve catalogue photos from the pack')
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == '__main__':
+    main()
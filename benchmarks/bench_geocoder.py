@@ -0,0 +1,59 @@
+"""Location resolution cost: cached, gazetteer (exact, prefix, fuzzy) and remote.
+
+The remote geocoder is geocoder.StaticGeocoder behind an artificial
+delay standing in for a network round trip, so the script runs offline.
+
+    python benchmarks/bench_geocoder.py --remote-latency 0.2
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from geocoder import Gazetteer, GeocodeCache, Geocoder, StaticGeocoder
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+QUERIES = {
+    'exact': 'Rio de Janeiro',
+    'prefix': 'Copaca',
+    'fuzzy': 'Curitba',
+    'parts': 'Vila Mariana, São Paulo, SP',
+    'remote': 'Sorocaba',
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--remote-latency', type=float, default=0.2)
+    parser.add_argument('--rounds', type=int, default=20000)
+    args = parser.parse_args()
+
+    stub = StaticGeocoder({'Sorocaba': (-23.50, -47.45)})
+
+    def remote(location):
+        time.sleep(args.remote_latency)
+        return stub(location)
+
+    gazetteer = Gazetteer.load(os.path.join(BASE_DIR, 'data', 'gazetteer.json'))
+    with tempfile.TemporaryDirectory() as directory:
+        geocoder = Geocoder(gazetteer, GeocodeCache(os.path.join(directory, 'cache.json')), remote)
+        print(f"{len(gazetteer)} gazetteer names")
+        print(f"{'query':>8} {'first us':>10} {'cached us':>10}  result")
+        for kind, query in QUERIES.items():
+            started = time.perf_counter()
+            point = geocoder.resolve(query)
+            first = time.perf_counter() - started
+            started = time.perf_counter()
+            for _ in range(args.rounds):
+                geocoder.resolve(query)
+            cached = (time.perf_counter() - started) / args.rounds
+            print(f"{kind:>8} {first * 1e6:>10.1f} {cached * 1e6:>10.2f}  {point.name if point else None}")
+        print(f"remote calls: {stub.calls}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""Intent matching cost as the number of keywords grows.
+
+Compares a chain of substring checks, one scan of the lowercased message
+per keyword (how app.chat used to route), with IntentMatcher's single
+pass over the message. Keywords beyond the built-in CHAT_INTENTS are
+random pseudo-words spread over extra intents.
+
+    python benchmarks/bench_intent_matcher.py --keywords 10 100 1000 10000
+"""
+import os
+import sys
+import time
+import random
+import string
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from intent_matcher import CHAT_INTENTS, IntentMatcher
+
+MESSAGES = [
+    "Hi! I would like to know how to feed and vaccinate the puppy I am about to adopt",
+    "Olá, existe algum abrigo perto de mim com gatinhos para adoção?",
+    "como cuidar da alimentação do meu cão na nova casa",
+]
+
+
+def intents_with(keywords, rng):
+    intents = {intent: dict(words) for intent, words in CHAT_INTENTS.items()}
+    count = sum(len(words) for words in intents.values())
+    while count < keywords:
+        word = ''.join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 9)))
+        intents.setdefault(f"extra_{count % 50}", {})[word] = 1.0
+        count += 1
+    return intents
+
+
+def chained(intents):
+    pairs = [(intent, keyword.rstrip('*')) for intent, words in intents.items() for keyword in words]
+
+    def match(message):
+        message = message.lower()
+        return {intent for intent, keyword in pairs if keyword in message}
+    return match
+
+
+def time_per_message(match, rounds):
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for message in MESSAGES:
+            match(message)
+    return (time.perf_counter() - started) / (rounds * len(MESSAGES))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--keywords', type=int, nargs='+', default=[10, 100, 1000, 10000])
+    parser.add_argument('--rounds', type=int, default=500)
+    args = parser.parse_args()
+    rng = random.Random(7)
+
+    print(f"{'keywords':>9} {'build ms':>9} {'chained us':>11} {'automaton us':>13}")
+    for keywords in args.keywords:
+        intents = intents_with(keywords, rng)
+        started = time.perf_counter()
+        matcher = IntentMatcher(intents)
+        build = time.perf_counter() - started
+        print(f"{len(matcher):>9} {build * 1000:>9.1f} "
+              f"{time_per_message(chained(intents), args.rounds) * 1e6:>11.1f} "
+              f"{time_per_message(matcher.match, args.rounds) * 1e6:>13.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""Overhead of the metrics layer.
+
+Times a no-op function called directly and through OperationMetrics.track
+(plain and async), and how long rendering the registry takes once it
+holds --labels operations.
+
+    python benchmarks/bench_metrics.py --calls 200000 --labels 50
+"""
+import os
+import sys
+import time
+import asyncio
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from metrics import Registry
+
+
+def noop():
+    return None
+
+
+async def async_noop():
+    return None
+
+
+def per_call(func, calls):
+    started = time.perf_counter()
+    for _ in range(calls):
+        func()
+    return (time.perf_counter() - started) / calls
+
+
+async def per_async_call(func, calls):
+    started = time.perf_counter()
+    for _ in range(calls):
+        await func()
+    return (time.perf_counter() - started) / calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--calls', type=int, default=200000)
+    parser.add_argument('--labels', type=int, default=50)
+    args = parser.parse_args()
+
+    registry = Registry('bench')
+    operations = registry.operations('operation', 'operation', 'operations')
+
+    plain = per_call(noop, args.calls)
+    tracked = per_call(operations.track('noop')(noop), args.calls)
+    async_plain = asyncio.run(per_async_call(async_noop, args.calls))
+    async_tracked = asyncio.run(per_async_call(operations.track('async_noop')(async_noop), args.calls))
+
+    print(f"{'call':<16} {'direct us':>10} {'tracked us':>11} {'overhead us':>12}")
+    for label, direct, wrapped in (('sync', plain, tracked), ('async', async_plain, async_tracked)):
+        print(f"{label:<16} {direct * 1e6:>10.3f} {wrapped * 1e6:>11.3f} {(wrapped - direct) * 1e6:>12.3f}")
+
+    for index in range(args.labels):
+        with operations.time(f'operation_{index}'):
+            pass
+    runs = 100
+    started = time.perf_counter()
+    for _ in range(runs):
+        text = registry.render()
+    elapsed = (time.perf_counter() - started) / runs
+    print(f"render with {args.labels} labels: {elapsed * 1000:.2f} ms, "
+          f"{len(text.splitlines())} lines, {len(text) / 1024:.1f} KiB")
+
+
+if __name__ == '__main__':
+    main()
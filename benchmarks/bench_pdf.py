@@ -0,0 +1,97 @@
+"""Interview PDF throughput.
+
+Renders interviews with 10, 100 and 1000 answers and reports PDFs per
+second for the old write-to-disk/read-back/delete path, in-memory
+rendering on the calling thread, and PDFRenderer with thread and process
+pools. Pooled modes render `--concurrency` PDFs at once.
+
+    python benchmarks/bench_pdf.py --seconds 3 --concurrency 8
+"""
+import os
+import sys
+import time
+import asyncio
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pdf_generator import PDFRenderer, render_interview_pdf
+
+USER_INFO = {'username': 'adotante', 'first_name': 'Maria', 'last_name': 'Silva'}
+
+
+def make_answers(count):
+    return {
+        f"Pergunta {i + 1}: Qual é a sua experiência com animais?": f"Resposta número {i + 1} com algum texto."
+        for i in range(count)
+    }
+
+
+def bench_disk(answers, seconds):
+    """Old path: render to a file in data/, reopen it to send, delete it"""
+    directory = tempfile.mkdtemp()
+    done = 0
+    started = time.perf_counter()
+    while time.perf_counter() - started < seconds:
+        path = os.path.join(directory, f'interview_{done}.pdf')
+        with open(path, 'wb') as f:
+            f.write(render_interview_pdf(1, USER_INFO, answers, 'Rex (ID: 1)'))
+        with open(path, 'rb') as f:
+            f.read()
+        os.remove(path)
+        done += 1
+    os.rmdir(directory)
+    return done / (time.perf_counter() - started)
+
+
+def bench_inline(answers, seconds):
+    done = 0
+    started = time.perf_counter()
+    while time.perf_counter() - started < seconds:
+        render_interview_pdf(1, USER_INFO, answers, 'Rex (ID: 1)')
+        done += 1
+    return done / (time.perf_counter() - started)
+
+
+async def bench_pool(renderer, answers, seconds, concurrency):
+    # Warm the pool so worker start-up is not counted
+    await renderer.render_interview(1, USER_INFO, make_answers(1))
+    done = 0
+    started = time.perf_counter()
+    while time.perf_counter() - started < seconds:
+        await asyncio.gather(*(
+            renderer.render_interview(1, USER_INFO, answers, 'Rex (ID: 1)') for _ in range(concurrency)
+        ))
+        done += concurrency
+    return done / (time.perf_counter() - started)
+
+
+async def main_async(args):
+    thread_renderer = PDFRenderer(max_workers=args.workers, use_processes=False)
+    process_renderer = PDFRenderer(max_workers=args.workers, use_processes=True)
+    print(f"PDFs per second ({args.seconds:.0f} s per cell, {thread_renderer.max_workers} workers, "
+          f"{args.concurrency} in flight for pools)")
+    print(f"{'answers':>8} {'disk (old)':>11} {'in-memory':>10} {'threads':>9} {'processes':>10} {'size KB':>8}")
+    for count in (10, 100, 1000):
+        answers = make_answers(count)
+        size = len(render_interview_pdf(1, USER_INFO, answers)) / 1024
+        disk = bench_disk(answers, args.seconds)
+        inline = bench_inline(answers, args.seconds)
+        threads = await bench_pool(thread_renderer, answers, args.seconds, args.concurrency)
+        processes = await bench_pool(process_renderer, answers, args.seconds, args.concurrency)
+        print(f"{count:>8} {disk:>11.1f} {inline:>10.1f} {threads:>9.1f} {processes:>10.1f} {size:>8.1f}")
+    thread_renderer.shutdown()
+    process_renderer.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--seconds', type=float, default=3.0)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--concurrency', type=int, default=8)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == '__main__':
+    main()
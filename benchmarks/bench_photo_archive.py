@@ -0,0 +1,93 @@
+"""Cost of the catalogue photos of one listing, per-file compression vs photo archive.
+
+Sends the photos under images/ the way send_animal_listing does without
+the archive (compress_image on every photo, every time) and with
+PHOTO_ARCHIVE=1 (a memoryview out of the mapped pack, copied once into
+bytes for the Bot API client). Also times a full archive build and an
+incremental sync after one photo changed. Read counters come from
+/proc/self/io, so the archive's page-cache reads, which go through the
+mapping, show up as no read() calls at all.
+
+    python benchmarks/bench_photo_archive.py --listings 5
+"""
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import logging
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_photo_io import io_counters
+from image_compressor import ImageCompressor
+from photo_archive import PhotoArchive
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def catalogue_photos(directory):
+    return sorted(
+        os.path.join(root, name)
+        for root, _, names in os.walk(directory)
+        for name in names if name.lower().endswith(('.jpg', '.jpeg', '.png'))
+    )
+
+
+def measure(send, photos, listings):
+    before = io_counters()
+    started = time.perf_counter()
+    for _ in range(listings):
+        for photo in photos:
+            send(photo)
+    elapsed = time.perf_counter() - started
+    after = io_counters()
+    sends = listings * len(photos)
+    return elapsed / sends, (after['syscr'] - before['syscr']) / sends, (after['rchar'] - before['rchar']) / sends
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--listings', type=int, default=5)
+    parser.add_argument('--images', default=os.path.join(BASE_DIR, 'images'))
+    args = parser.parse_args()
+    logging.getLogger('image_compressor').setLevel(logging.WARNING)
+
+    work_dir = tempfile.mkdtemp(prefix='photo_archive_')
+    try:
+        images = os.path.join(work_dir, 'images')
+        shutil.copytree(args.images, images)
+        photos = catalogue_photos(images)
+        if not photos:
+            print(f"No photos under {args.images}")
+            return
+        compressor = ImageCompressor(max_size_kb=500, quality=85)
+        archive = PhotoArchive(os.path.join(work_dir, 'catalogue_photos.pack'), compressor.compress_image, work_dir)
+
+        started = time.perf_counter()
+        archive.sync(photos)
+        build = time.perf_counter() - started
+        os.utime(photos[0])
+        started = time.perf_counter()
+        recompressed = archive.sync(photos)
+        incremental = time.perf_counter() - started
+        print(f"{len(photos)} photos, archive of {os.path.getsize(archive.path) / 1024:.0f} KB")
+        print(f"full build {build * 1000:.0f} ms, sync after one change {incremental * 1000:.0f} ms "
+              f"({recompressed} compressed)")
+
+        print(f"{args.listings} listings, per photo sent:")
+        print(f"{'path':>10} {'ms':>9} {'read()':>7} {'rchar KB':>9}")
+        for name, send in (
+            ('per-file', compressor.compress_image),
+            ('archive', lambda photo: bytes(archive.get(photo))),
+        ):
+            seconds, reads, rchar = measure(send, photos, args.listings)
+            print(f"{name:>10} {seconds * 1000:>9.3f} {reads:>7.1f} {rchar / 1024:>9.0f}")
+    finally:
+        shutil.rmtree(work_dir)
+
+
+if __name__ == '__main__':
+    main()
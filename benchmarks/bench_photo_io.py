@@ -0,0 +1,106 @@
+"""Disk I/O per uploaded photo, old path vs in-memory path.
+
+Downloads a large JPEG from benchmarks/fake_telegram.py through the real
+Bot API client and handles it the way handle_message used to
+(download_to_drive, compress_image from the file, rewrite the file,
+compress_image again for the owner) and the way it does now
+(download_to_memory, compress_bytes, one write). Reports per-photo
+counters from /proc/self/io: rchar/wchar count bytes passed through
+read()/write(), write_bytes what reached the block layer. The download
+itself arrives through recv() and is not included.
+
+    python benchmarks/bench_photo_io.py --photos 20
+"""
+import os
+import sys
+import time
+import asyncio
+import argparse
+import tempfile
+import logging
+from io import BytesIO
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from PIL import Image
+from telegram import Bot
+from fake_telegram import FakeTelegramServer
+from image_compressor import ImageCompressor
+
+FIELDS = ('rchar', 'wchar', 'syscr', 'syscw', 'write_bytes')
+
+
+def io_counters():
+    with open('/proc/self/io') as f:
+        counters = dict(line.split(': ') for line in f.read().splitlines())
+    return {field: int(counters[field]) for field in FIELDS}
+
+
+def large_jpeg(width=2400, height=1800):
+    """A noisy photo well above the compressor's 500 KB target"""
+    image = Image.frombytes('RGB', (width, height), os.urandom(width * height * 3))
+    output = BytesIO()
+    image.resize((width, height)).save(output, format='JPEG', quality=90)
+    return output.getvalue()
+
+
+async def old_path(bot, compressor, directory, index):
+    photo_file = await bot.get_file(f'photo{index}')
+    file_path = os.path.join(directory, f'old_{index}.jpg')
+    await photo_file.download_to_drive(file_path)
+    compressed_image = compressor.compress_image(file_path)
+    with open(file_path, 'wb') as f:
+        f.write(compressed_image)
+    # Owner notification compressed the stored file again
+    compressor.compress_image(file_path)
+
+
+async def new_path(bot, compressor, directory, index):
+    photo_file = await bot.get_file(f'photo{index}')
+    buffer = BytesIO()
+    await photo_file.download_to_memory(buffer)
+    compressed_image = await asyncio.to_thread(compressor.compress_bytes, buffer.getvalue(), photo_file.file_id)
+    with open(os.path.join(directory, f'new_{index}.jpg'), 'wb') as f:
+        f.write(compressed_image)
+
+
+async def measure(path, bot, compressor, photos):
+    directory = tempfile.mkdtemp()
+    before = io_counters()
+    started = time.perf_counter()
+    for index in range(photos):
+        await path(bot, compressor, directory, index)
+    elapsed = time.perf_counter() - started
+    after = io_counters()
+    for name in os.listdir(directory):
+        os.remove(os.path.join(directory, name))
+    os.rmdir(directory)
+    return {field: (after[field] - before[field]) / photos for field in FIELDS}, elapsed / photos
+
+
+async def main_async(args):
+    logging.getLogger('image_compressor').setLevel(logging.WARNING)
+    photo = large_jpeg()
+    fake = FakeTelegramServer(file_bytes=photo).start()
+    bot = Bot('123456:FAKE-TOKEN', base_url=f'{fake.url}/bot', base_file_url=f'{fake.url}/file/bot')
+    compressor = ImageCompressor(max_size_kb=500, quality=85)
+    async with bot:
+        print(f"{args.photos} photos of {len(photo) / 1024:.0f} KB, per photo:")
+        print(f"{'path':>10} {'rchar KB':>9} {'wchar KB':>9} {'read()':>7} {'write()':>8} {'disk write KB':>14} {'ms':>7}")
+        for name, path in (('old', old_path), ('in-memory', new_path)):
+            counters, seconds = await measure(path, bot, compressor, args.photos)
+            print(f"{name:>10} {counters['rchar'] / 1024:>9.0f} {counters['wchar'] / 1024:>9.0f} "
+                  f"{counters['syscr']:>7.0f} {counters['syscw']:>8.0f} {counters['write_bytes'] / 1024:>14.0f} "
+                  f"{seconds * 1000:>7.1f}")
+    fake.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--photos', type=int, default=20)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == '__main__':
+    main()
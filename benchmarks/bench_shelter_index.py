@@ -0,0 +1,71 @@
+"""Shelter lookups with the grid index vs a full haversine scan.
+
+Generates random shelters clustered around Brazilian and US cities and
+times nearest-3 and 25 km radius queries through ShelterIndex against a
+vectorized haversine over every shelter.
+
+    python benchmarks/bench_shelter_index.py --shelters 1000 10000 50000
+"""
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from shelter_index import Shelter, ShelterIndex, haversine_km
+
+CITIES = [
+    (-23.55, -46.63), (-22.91, -43.17), (-19.92, -43.94), (-25.43, -49.27), (-30.03, -51.23),
+    (-8.05, -34.88), (-12.97, -38.50), (-15.79, -47.88), (40.71, -74.01), (34.05, -118.24),
+]
+
+
+def random_shelters(count, rng):
+    shelters = []
+    for index in range(count):
+        lat, lon = rng.choice(CITIES)
+        shelters.append(Shelter(f"Abrigo {index}", '', '', lat + rng.gauss(0, 0.5), lon + rng.gauss(0, 0.5)))
+    return shelters
+
+
+def per_query(function, queries):
+    started = time.perf_counter()
+    for lat, lon in queries:
+        function(lat, lon)
+    return (time.perf_counter() - started) / len(queries) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--shelters', type=int, nargs='+', default=[1000, 10000, 50000])
+    parser.add_argument('--queries', type=int, default=500)
+    args = parser.parse_args()
+    rng = random.Random(11)
+
+    print(f"{'shelters':>9} {'build ms':>9} {'nearest us':>11} {'25 km us':>9} {'full scan us':>13}")
+    for count in args.shelters:
+        shelters = random_shelters(count, rng)
+        started = time.perf_counter()
+        index = ShelterIndex(shelters)
+        build = time.perf_counter() - started
+        lats = np.array([shelter.lat for shelter in shelters])
+        lons = np.array([shelter.lon for shelter in shelters])
+        queries = [(lat + rng.gauss(0, 0.3), lon + rng.gauss(0, 0.3))
+                   for lat, lon in (rng.choice(CITIES) for _ in range(args.queries))]
+
+        def full_scan(lat, lon):
+            distances = haversine_km(lat, lon, lats, lons)
+            nearest = np.argpartition(distances, 2)[:3]
+            return nearest[np.argsort(distances[nearest])]
+
+        print(f"{count:>9} {build * 1000:>9.1f} "
+              f"{per_query(lambda lat, lon: index.nearest(lat, lon, 3), queries):>11.0f} "
+              f"{per_query(lambda lat, lon: index.within(lat, lon, 25), queries):>9.0f} "
+              f"{per_query(full_scan, queries):>13.0f}")
+
+
+if __name__ == '__main__':
+    main()
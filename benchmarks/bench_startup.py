@@ -0,0 +1,88 @@
+"""Cold start of the Telegram bot, broken down by stage.
+
+Each run is a fresh interpreter that imports telegram_bot, creates its
+components against a scratch copy of the catalogue (the repository's
+data directory is not touched) and builds the Application without
+contacting Telegram. Reports the median and worst time of every stage
+and the heavy modules that importing telegram_bot alone loaded.
+
+    python benchmarks/bench_startup.py --runs 10
+"""
+import os
+import sys
+import json
+import shutil
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+# Deferred until first use; none of them should be loaded by the import
+HEAVY_MODULES = ('PIL.Image', 'reportlab.pdfgen.canvas', 'pypdf')
+
+
+def child(scratch):
+    """One cold start; prints its stages as JSON"""
+    from startup import StartupTimer
+    startup = StartupTimer()
+    import telegram_bot
+    startup.mark('imports')
+    heavy = [name for name in HEAVY_MODULES if name in sys.modules]
+
+    telegram_bot.DATA_DIR = os.path.join(scratch, 'data')
+    telegram_bot.BLOB_DIR = os.path.join(scratch, 'data', 'blobs')
+    telegram_bot.DOGS_DIR = os.path.join(scratch, 'images', 'dogs')
+    telegram_bot.CATS_DIR = os.path.join(scratch, 'images', 'cats')
+    telegram_bot.OTHERS_DIR = os.path.join(scratch, 'images', 'others')
+    os.makedirs(telegram_bot.DATA_DIR)
+    shutil.copy(os.path.join(BASE_DIR, 'data', 'animals.json'), telegram_bot.DATA_DIR)
+
+    telegram_bot.build_application('1:TOKEN', startup)
+    telegram_bot.close_components()
+    print(json.dumps({
+        'total': startup.elapsed(),
+        'stages': [(stage.name, stage.group, stage.duration) for stage in startup.stages],
+        'heavy': heavy,
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(args.child)
+        return
+
+    runs = []
+    for _ in range(args.runs):
+        scratch = tempfile.mkdtemp()
+        try:
+            output = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), '--child', scratch],
+                cwd=BASE_DIR, capture_output=True, text=True, check=True
+            ).stdout
+        finally:
+            shutil.rmtree(scratch, ignore_errors=True)
+        runs.append(json.loads(output.strip().splitlines()[-1]))
+
+    durations = {}
+    for run in runs:
+        durations.setdefault(('total', None), []).append(run['total'])
+        for name, group, duration in run['stages']:
+            durations.setdefault((name, group), []).append(duration)
+
+    print(f"{'stage':<22} {'median ms':>10} {'max ms':>8}")
+    for (name, group), samples in durations.items():
+        label = f"  {group}/{name}" if group else name
+        print(f"{label:<22} {statistics.median(samples) * 1000:>10.1f} {max(samples) * 1000:>8.1f}")
+    heavy = sorted({name for run in runs for name in run['heavy']})
+    print("heavy modules loaded by the import: " + (', '.join(heavy) if heavy else 'none'))
+
+
+if __name__ == '__main__':
+    main()
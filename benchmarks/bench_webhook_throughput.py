@@ -0,0 +1,105 @@
+"""Webhook throughput against the fake Bot API.
+
+Starts benchmarks/fake_telegram.py in-process with a simulated network
+latency, runs the bot in webhook mode against it and posts text-message
+updates from several users, once per CONCURRENT_UPDATES setting. Reports
+updates per second and whether any user's updates overlapped.
+
+    python benchmarks/bench_webhook_throughput.py --users 50 --messages 4 --latency 0.05
+"""
+import os
+import sys
+import time
+import socket
+import asyncio
+import argparse
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+from fake_telegram import FakeTelegramServer
+
+TOKEN = '123456:FAKE-TOKEN'
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def text_update(update_id, user_id, text):
+    user = {'id': user_id, 'is_bot': False, 'first_name': f'User{user_id}', 'username': f'user{user_id}'}
+    return {
+        'update_id': update_id,
+        'message': {
+            'message_id': update_id,
+            'date': int(time.time()),
+            'chat': {'id': user_id, 'type': 'private', 'first_name': user['first_name']},
+            'from': user,
+            'text': text,
+        },
+    }
+
+
+async def run_round(telegram_bot, fake, concurrency, users, messages):
+    import httpx
+
+    telegram_bot.CONCURRENT_UPDATES = concurrency
+    application = telegram_bot.build_application(TOKEN)
+    port = free_port()
+    await application.initialize()
+    await application.start()
+    await application.updater.start_webhook(
+        listen='127.0.0.1', port=port, url_path='telegram',
+        webhook_url=f'http://127.0.0.1:{port}/telegram'
+    )
+    fake.reset()
+
+    updates = [
+        text_update(message * users + user + 1, 1000 + user, f'mensagem {message}')
+        for message in range(messages)
+        for user in range(users)
+    ]
+    started = time.perf_counter()
+    async with httpx.AsyncClient(timeout=30) as client:
+        await asyncio.gather(*(
+            client.post(f'http://127.0.0.1:{port}/telegram', json=update) for update in updates
+        ))
+    done = await asyncio.to_thread(fake.wait_for, 'sendMessage', len(updates), 120)
+    elapsed = time.perf_counter() - started
+
+    await application.updater.stop()
+    await application.stop()
+    await application.shutdown()
+    return elapsed, done
+
+
+async def main_async(args):
+    fake = FakeTelegramServer(latency=args.latency).start()
+    os.environ['TELEGRAM_API_URL'] = fake.url
+    import telegram_bot
+    telegram_bot.TELEGRAM_API_URL = fake.url
+
+    total = args.users * args.messages
+    print(f"{total} updates from {args.users} users, Bot API latency {args.latency * 1000:.0f} ms")
+    print(f"{'concurrency':>12} {'seconds':>9} {'updates/s':>10} {'max overlap/user':>17}")
+    for concurrency in args.concurrency:
+        elapsed, done = await run_round(telegram_bot, fake, concurrency, args.users, args.messages)
+        status = '' if done else '  (timed out)'
+        print(f"{concurrency:>12} {elapsed:>9.2f} {total / elapsed:>10.1f} {fake.max_concurrent_per_chat:>17}{status}")
+    fake.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=50)
+    parser.add_argument('--messages', type=int, default=4, help='updates per user')
+    parser.add_argument('--latency', type=float, default=0.05, help='seconds per Bot API call')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 16, 64])
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,289 @@
+"""Local stand-in for the Telegram Bot API.
+
+Answers the Bot API methods the bot uses with plausible results, records
+every call and can add a fixed latency to each request, so the bot can be
+measured offline. Point the bot at it with TELEGRAM_API_URL=<server.url>.
+
+    python benchmarks/fake_telegram.py --port 8081 --latency 0.05
+"""
+import io
+import json
+import time
+import email.parser
+import email.policy
+import argparse
+import threading
+from collections import defaultdict, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl
+
+BOT_USER = {
+    'id': 1,
+    'is_bot': True,
+    'first_name': 'FakeBot',
+    'username': 'fake_bot',
+    'can_join_groups': False,
+    'can_read_all_group_messages': False,
+    'supports_inline_queries': False,
+}
+
+# Methods that return a single Message for chat_id
+_MESSAGE_METHODS = {'sendMessage', 'sendPhoto', 'sendDocument', 'editMessageText'}
+
+
+def _default_photo_bytes():
+    """A small JPEG served for downloaded files"""
+    try:
+        from PIL import Image
+        output = io.BytesIO()
+        Image.new('RGB', (640, 480), (200, 120, 40)).save(output, format='JPEG', quality=85)
+        return output.getvalue()
+    except ImportError:
+        return b'\xff\xd8\xff\xd9'
+
+
+class RecordedCall:
+    __slots__ = ('method', 'params', 'files', 'started', 'finished')
+
+    def __init__(self, method, params, files, started, finished):
+        self.method = method
+        self.params = params
+        self.files = files
+        self.started = started
+        self.finished = finished
+
+
+class FakeTelegramServer:
+    """Threaded HTTP server speaking enough of the Bot API for the bot.
+
+    Args:
+        host, port: Address to bind; port 0 picks a free port.
+        latency: Seconds to sleep before answering each call, to mimic
+            the round trip to api.telegram.org.
+        file_bytes: Content of every downloaded file, or a function of the
+            file path returning it (to serve different photos).
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, latency=0.0, file_bytes=None):
+        self.latency = latency
+        self.file_bytes = file_bytes if file_bytes is not None else _default_photo_bytes()
+        self.calls = []
+        self.max_concurrent_per_chat = 0
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._message_id = 0
+        self._in_flight = defaultdict(int)
+        self._updates = deque()
+        self._update_id = 0
+        self._thread = None
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """Serve requests in a background thread"""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def reset(self):
+        """Forget recorded calls and queued updates"""
+        with self._lock:
+            self.calls.clear()
+            self._updates.clear()
+            self.max_concurrent_per_chat = 0
+
+    def count(self, method=None):
+        with self._lock:
+            if method is None:
+                return len(self.calls)
+            return sum(1 for call in self.calls if call.method == method)
+
+    def wait_for(self, method, count, timeout=60.0):
+        """Block until `count` calls of `method` were answered; returns False on timeout"""
+        deadline = time.monotonic() + timeout
+        with self._changed:
+            while sum(1 for call in self.calls if call.method == method) < count:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._changed.wait(remaining)
+        return True
+
+    def enqueue_update(self, update):
+        """Queue an update dict for getUpdates (polling mode); update_id is filled in"""
+        with self._changed:
+            self._update_id += 1
+            update = dict(update, update_id=self._update_id)
+            self._updates.append(update)
+            self._changed.notify_all()
+        return update
+
+    def _next_message(self, method, params):
+        with self._lock:
+            self._message_id += 1
+            message_id = self._message_id
+        chat_id = int(params.get('chat_id', 0) or 0)
+        message = {
+            'message_id': message_id,
+            'date': int(time.time()),
+            'chat': {'id': chat_id, 'type': 'private'},
+            'from': BOT_USER,
+        }
+        if 'text' in params:
+            message['text'] = params['text']
+        if 'caption' in params:
+            message['caption'] = params['caption']
+        if method == 'sendPhoto':
+            message['photo'] = [{
+                'file_id': f'photo{message_id}', 'file_unique_id': f'u{message_id}',
+                'width': 640, 'height': 480,
+            }]
+        elif method == 'sendDocument':
+            message['document'] = {'file_id': f'doc{message_id}', 'file_unique_id': f'd{message_id}'}
+        return message
+
+    def _get_updates(self, params):
+        timeout = float(params.get('timeout', 0) or 0)
+        offset = int(params.get('offset', 0) or 0)
+        deadline = time.monotonic() + timeout
+        with self._changed:
+            while self._updates and self._updates[0]['update_id'] < offset:
+                self._updates.popleft()
+            while not self._updates and time.monotonic() < deadline:
+                self._changed.wait(deadline - time.monotonic())
+            return list(self._updates)
+
+    def _answer(self, method, params):
+        if method == 'getMe':
+            return BOT_USER
+        if method in _MESSAGE_METHODS:
+            return self._next_message(method, params)
+        if method == 'sendMediaGroup':
+            media = json.loads(params.get('media', '[]'))
+            return [self._next_message('sendPhoto', params) for _ in media]
+        if method == 'getFile':
+            file_id = params.get('file_id', 'file')
+            file_path = f'photos/{file_id}.jpg'
+            return {
+                'file_id': file_id, 'file_unique_id': f'u{file_id}',
+                'file_size': len(self.file_content(file_path)), 'file_path': file_path,
+            }
+        if method == 'getChat':
+            return {'id': int(params.get('chat_id', 0) or 0), 'type': 'private'}
+        if method == 'getUpdates':
+            return self._get_updates(params)
+        return True
+
+    def file_content(self, path):
+        return self.file_bytes(path) if callable(self.file_bytes) else self.file_bytes
+
+    def _record(self, method, params, files, started):
+        chat_id = params.get('chat_id')
+        if chat_id is not None:
+            with self._lock:
+                self._in_flight[chat_id] += 1
+                self.max_concurrent_per_chat = max(self.max_concurrent_per_chat, self._in_flight[chat_id])
+        try:
+            if self.latency and method != 'getUpdates':
+                time.sleep(self.latency)
+            result = self._answer(method, params)
+        finally:
+            if chat_id is not None:
+                with self._lock:
+                    self._in_flight[chat_id] -= 1
+        with self._changed:
+            self.calls.append(RecordedCall(method, params, files, started, time.monotonic()))
+            self._changed.notify_all()
+        return result
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send_json(self, payload, status=200):
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _parse_body(self):
+                length = int(self.headers.get('Content-Length', 0) or 0)
+                body = self.rfile.read(length) if length else b''
+                content_type = self.headers.get('Content-Type', '')
+                params, files = {}, {}
+                if content_type.startswith('application/json'):
+                    params = json.loads(body or b'{}')
+                elif content_type.startswith('multipart/form-data'):
+                    message = email.parser.BytesParser(policy=email.policy.HTTP).parsebytes(
+                        f'Content-Type: {content_type}\r\n\r\n'.encode() + body
+                    )
+                    for part in message.iter_parts():
+                        name = part.get_param('name', header='content-disposition')
+                        payload = part.get_payload(decode=True) or b''
+                        if part.get_filename():
+                            files[name] = len(payload)
+                        else:
+                            params[name] = payload.decode()
+                else:
+                    params = dict(parse_qsl(body.decode()))
+                return params, files
+
+            def do_POST(self):
+                started = time.monotonic()
+                parts = self.path.strip('/').split('/')
+                if len(parts) != 2 or not parts[0].startswith('bot'):
+                    self._send_json({'ok': False, 'error_code': 404, 'description': 'Not Found'}, 404)
+                    return
+                params, files = self._parse_body()
+                result = server._record(parts[1], params, files, started)
+                self._send_json({'ok': True, 'result': result})
+
+            def do_GET(self):
+                if self.path.startswith('/file/'):
+                    content = server.file_content(self.path)
+                    self.send_response(200)
+                    self.send_header('Content-Type', 'application/octet-stream')
+                    self.send_header('Content-Length', str(len(content)))
+                    self.end_headers()
+                    self.wfile.write(content)
+                else:
+                    self.do_POST()
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8081)
+    parser.add_argument('--latency', type=float, default=0.05, help='seconds added to every call')
+    args = parser.parse_args()
+
+    server = FakeTelegramServer(args.host, args.port, args.latency)
+    print(f"Fake Bot API listening on {server.url} (latency {args.latency * 1000:.0f} ms)")
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._server.server_close()
+
+
+if __name__ == '__main__':
+    main()
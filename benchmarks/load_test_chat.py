@@ -0,0 +1,165 @@
+"""Load test for the web chat's /chat endpoint.
+
+Starts the app on a local port (gunicorn with gunicorn.conf.py, or the
+Flask development server) unless --url points at a running one, then
+keeps --clients keep-alive connections busy for --duration seconds with
+a mix of care, shelter and small-talk messages. Reports requests per
+second and latency percentiles. --etag replays each message with the
+ETag of its previous response, --no-cache starts the server with the
+response cache disabled. --batch N sends N messages per request to
+/chat/batch (or /chat/stream with --stream) and also reports messages
+per second.
+
+    python benchmarks/load_test_chat.py --server gunicorn --workers 2 --clients 16
+    python benchmarks/load_test_chat.py --no-cache
+    python benchmarks/load_test_chat.py --no-cache --batch 20 --stream
+"""
+import os
+import sys
+import json
+import time
+import socket
+import random
+import argparse
+import threading
+import subprocess
+import http.client
+from collections import Counter
+from urllib.parse import urlsplit
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MESSAGES = [
+    {'message': 'How do I feed my cat?'},
+    {'message': 'what food is best for a puppy'},
+    {'message': 'vaccines for kittens'},
+    {'message': 'my dog needs to adapt to the new home'},
+    {'message': 'feeding'},
+    {'message': 'Quais vacinas o gato precisa?'},
+    {'message': 'shelter near me', 'location': 'New York'},
+    {'message': 'abrigo perto de mim', 'location': 'Copacabana, Rio de Janeiro'},
+    {'message': 'I want to adopt', 'lat': -23.55, 'lon': -46.63},
+    {'message': 'hello'},
+]
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def start_server(kind, port, workers, env):
+    if kind == 'gunicorn':
+        command = [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py',
+                   '--bind', f'127.0.0.1:{port}', '--workers', str(workers), 'wsgi:app']
+    else:
+        command = [sys.executable, '-c',
+                   f"from app import app; app.run(host='127.0.0.1', port={port}, threaded=True)"]
+    process = subprocess.Popen(command, cwd=BASE_DIR, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=0.2):
+                return process
+        except OSError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError(f"{kind} server did not start on port {port}")
+
+
+def client(host, port, deadline, use_etag, batch, path, seed, latencies, statuses):
+    rng = random.Random(seed)
+    connection = http.client.HTTPConnection(host, port, timeout=10)
+    etags = {}
+    while time.monotonic() < deadline:
+        index = rng.randrange(len(MESSAGES))
+        headers = {'Content-Type': 'application/json'}
+        if use_etag and index in etags:
+            headers['If-None-Match'] = etags[index]
+        if batch:
+            body = json.dumps({'messages': [rng.choice(MESSAGES) for _ in range(batch)]})
+        else:
+            body = json.dumps(MESSAGES[index])
+        started = time.perf_counter()
+        try:
+            connection.request('POST', path, body=body, headers=headers)
+            response = connection.getresponse()
+            response.read()
+        except (OSError, http.client.HTTPException):
+            statuses['error'] += 1
+            connection.close()
+            connection = http.client.HTTPConnection(host, port, timeout=10)
+            continue
+        latencies.append(time.perf_counter() - started)
+        statuses[response.status] += 1
+        if response.getheader('ETag'):
+            etags[index] = response.getheader('ETag')
+    connection.close()
+
+
+def percentile(samples, fraction):
+    return samples[min(len(samples) - 1, int(len(samples) * fraction))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', help="test a running server instead of starting one")
+    parser.add_argument('--server', choices=('gunicorn', 'flask'), default='gunicorn')
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--clients', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--etag', action='store_true', help="send If-None-Match with the last ETag")
+    parser.add_argument('--no-cache', action='store_true', help="start the server with CHAT_CACHE_ENTRIES=0")
+    parser.add_argument('--batch', type=int, default=0, help="messages per request to /chat/batch")
+    parser.add_argument('--stream', action='store_true', help="with --batch, use /chat/stream")
+    args = parser.parse_args()
+
+    path = ('/chat/stream' if args.stream else '/chat/batch') if args.batch else '/chat'
+    process = None
+    if args.url:
+        parts = urlsplit(args.url)
+        host, port = parts.hostname, parts.port or 80
+    else:
+        host, port = '127.0.0.1', free_port()
+        env = dict(os.environ)
+        if args.no_cache:
+            env['CHAT_CACHE_ENTRIES'] = '0'
+        process = start_server(args.server, port, args.workers, env)
+
+    try:
+        latencies = []
+        statuses = Counter()
+        deadline = time.monotonic() + args.duration
+        threads = [
+            threading.Thread(target=client, args=(host, port, deadline, args.etag, args.batch, path,
+                                                 seed, latencies, statuses))
+            for seed in range(args.clients)
+        ]
+        started = time.monotonic()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.monotonic() - started
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    latencies.sort()
+    if not latencies:
+        print("No successful requests")
+        return
+    print(f"{len(latencies)} requests in {elapsed:.1f} s with {args.clients} clients: "
+          f"{len(latencies) / elapsed:.0f} req/s")
+    if args.batch:
+        print(f"{args.batch} messages per request to {path}: {len(latencies) * args.batch / elapsed:.0f} messages/s")
+    print(f"latency p50 {percentile(latencies, 0.5) * 1000:.2f} ms, "
+          f"p99 {percentile(latencies, 0.99) * 1000:.2f} ms, max {latencies[-1] * 1000:.2f} ms")
+    print("statuses: " + ', '.join(f"{status}: {count}" for status, count in sorted(statuses.items(), key=str)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,182 @@
+import re
+import struct
+import binascii
+import logging
+from enum import IntEnum
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Catalogue keys used by AnimalManager; every other spelling maps onto these
+ANIMAL_TYPES = ('dogs', 'cats', 'others')
+ANIMAL_TYPE_ALIASES = {
+    'dog': 'dogs', 'dogs': 'dogs',
+    'cat': 'cats', 'cats': 'cats',
+    'other': 'others', 'others': 'others',
+}
+ANIMAL_TYPE_LABELS = {
+    'dogs': 'cachorros',
+    'cats': 'gatos',
+    'others': 'outros animais',
+}
+_ANIMAL_TYPE_CODES = {animal_type: code for code, animal_type in enumerate(ANIMAL_TYPES, 1)}
+
+# Telegram rejects callback_data longer than this many bytes
+MAX_CALLBACK_DATA = 64
+
+PAYLOAD_VERSION = 1
+_HEADER = struct.Struct('>BB')
+# Every compact payload starts with this base64 character (the version byte),
+# which never starts one of the older 'animal_dog' style strings
+_VERSION_PREFIX = binascii.b2a_base64(bytes([PAYLOAD_VERSION, 0]), newline=False)[:1].decode()
+
+# Argument codes: T = animal type (1 byte), I = unsigned 32-bit integer
+_FIELD_FORMATS = {'T': 'B', 'I': 'I'}
+
+
+def canonical_animal_type(animal_type: str) -> str:
+    """Map 'dog'/'dogs'/'cat'/... to the catalogue key, raising ValueError if unknown"""
+    try:
+        return ANIMAL_TYPE_ALIASES[animal_type]
+    except KeyError:
+        raise ValueError(f"Invalid animal type: {animal_type}")
+
+
+def _animal_type_for_code(code: int) -> str:
+    """Catalogue key of an encoded animal type, raising ValueError if the code is out of range"""
+    if not 1 <= code <= len(ANIMAL_TYPES):
+        raise ValueError(f"Invalid animal type code: {code}")
+    return ANIMAL_TYPES[code - 1]
+
+
+class Action(IntEnum):
+    BACK_TO_TYPES = 1
+    LIST_ANIMALS = 2
+    ANIMAL_DETAILS = 3
+    START_INTERVIEW = 4
+    GENERATE_PDF = 5
+
+
+Handler = Callable[..., Awaitable[Any]]
+
+
+class _Route:
+    __slots__ = ('action', 'fields', 'struct', 'handler', 'has_types')
+
+    def __init__(self, action: Action, fields: str, handler: Handler):
+        self.action = action
+        self.fields = fields
+        self.struct = struct.Struct('>' + ''.join(_FIELD_FORMATS[field] for field in fields))
+        self.handler = handler
+        self.has_types = 'T' in fields
+
+
+class CallbackRouter:
+    """Encodes callback_data as compact binary payloads and dispatches them.
+
+    A payload is base64 of a version byte, an action byte and the packed
+    arguments of that action, so decoding is one table lookup plus a
+    struct unpack. Decoded payloads are memoized, since the same buttons
+    are pressed over and over. Strings in the older 'start_interview_dog_3'
+    format are still understood so buttons in already-sent messages keep
+    working.
+    """
+
+    CACHE_SIZE = 4096
+
+    _LEGACY_PATTERN = re.compile(r'^(animal|list|select_animal|start_interview)_([a-z]+)(?:_(\d+))?$')
+    _LEGACY_ACTIONS = {
+        'animal': Action.LIST_ANIMALS,
+        'list': Action.LIST_ANIMALS,
+        'select_animal': Action.ANIMAL_DETAILS,
+        'start_interview': Action.START_INTERVIEW,
+    }
+
+    def __init__(self):
+        self._routes: Dict[int, _Route] = {}
+        self._cache: Dict[str, Tuple[Handler, tuple]] = {}
+
+    def route(self, action: Action, fields: str = '') -> Callable[[Handler], Handler]:
+        """Register a handler for an action; it receives (update, context, *args)"""
+        def decorator(handler: Handler) -> Handler:
+            self._routes[action] = _Route(action, fields, handler)
+            self._cache.clear()
+            return handler
+        return decorator
+
+    def encode(self, action: Action, *args) -> str:
+        """Build callback_data for an action and its arguments"""
+        route = self._routes[action]
+        values = [
+            _ANIMAL_TYPE_CODES[canonical_animal_type(arg)] if field == 'T' else arg
+            for field, arg in zip(route.fields, args)
+        ]
+        raw = _HEADER.pack(PAYLOAD_VERSION, action) + route.struct.pack(*values)
+        data = binascii.b2a_base64(raw, newline=False).decode()
+        if len(data) > MAX_CALLBACK_DATA:
+            raise ValueError(f"Callback data for {action.name} is {len(data)} bytes long")
+        return data
+
+    def decode(self, data: str) -> Optional[Tuple[Handler, tuple]]:
+        """Resolve callback_data to its handler and typed arguments"""
+        resolved = self._cache.get(data)
+        if resolved is not None:
+            return resolved
+        if not data:
+            return None
+        if data[0] != _VERSION_PREFIX:
+            resolved = self._decode_legacy(data)
+        else:
+            resolved = self._decode_compact(data)
+        if resolved is not None:
+            if len(self._cache) >= self.CACHE_SIZE:
+                self._cache.clear()
+            self._cache[data] = resolved
+        return resolved
+
+    def _decode_compact(self, data: str) -> Optional[Tuple[Handler, tuple]]:
+        try:
+            raw = binascii.a2b_base64(data)
+            version, action = _HEADER.unpack_from(raw)
+            route = self._routes[action]
+            if version != PAYLOAD_VERSION:
+                raise ValueError(f"Unsupported payload version {version}")
+            if len(raw) != _HEADER.size + route.struct.size:
+                raise ValueError(f"Payload is {len(raw)} bytes long")
+            values = route.struct.unpack_from(raw, _HEADER.size)
+            if route.has_types:
+                values = tuple([
+                    _animal_type_for_code(value) if field == 'T' else value
+                    for field, value in zip(route.fields, values)
+                ])
+            return route.handler, values
+        except Exception as e:
+            logger.error(f"Invalid callback data {data!r}: {str(e)}")
+            return None
+
+    def _decode_legacy(self, data: str) -> Optional[Tuple[Handler, tuple]]:
+        if data == 'back_to_types':
+            route = self._routes.get(Action.BACK_TO_TYPES)
+            return (route.handler, ()) if route else None
+        match = self._LEGACY_PATTERN.match(data)
+        if not match:
+            return None
+        prefix, animal_type, animal_id = match.groups()
+        route = self._routes.get(self._LEGACY_ACTIONS[prefix])
+        animal_type = ANIMAL_TYPE_ALIASES.get(animal_type)
+        if route is None or animal_type is None:
+            return None
+        if 'I' in route.fields:
+            if animal_id is None:
+                return None
+            return route.handler, (animal_type, int(animal_id))
+        return route.handler, (animal_type,)
+
+    async def dispatch(self, update, context) -> bool:
+        """Run the handler for update.callback_query; returns False if nothing matched"""
+        resolved = self.decode(update.callback_query.data)
+        if resolved is None:
+            return False
+        handler, args = resolved
+        await handler(update, context, *args)
+        return True
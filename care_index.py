@@ -0,0 +1,215 @@
+import os
+import re
+import json
+import time
+import logging
+import threading
+from collections import Counter
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+import numpy as np
+from text_utils import fold
+
+logger = logging.getLogger(__name__)
+
+_WORD = re.compile(r'[a-z0-9]+')
+# Word prefixes of these lengths act as a light stemmer for English and Portuguese:
+# 'vaccine' and 'vaccination' share 'vaccin', 'vacinação' and 'vacina' share 'vacina'
+PREFIX_LENGTHS = (4, 5, 6)
+STOPWORDS = frozenset("""
+    a an and are as at be can do does for from how i in is it me my of on or should
+    so that the this to what when with you your
+    as com como da das de do dos e em eu meu minha na no o os para por qual que se um uma
+""".split())
+
+
+def terms(text: str) -> List[str]:
+    """Index terms of a text: its folded words except stopwords, plus their prefixes"""
+    result = []
+    for word in _WORD.findall(fold(text)):
+        if word in STOPWORDS:
+            continue
+        result.append(word)
+        result.extend('#' + word[:length] for length in PREFIX_LENGTHS if length <= len(word))
+    return result
+
+
+# Upper bound on the queries x topics score matrix search_many() builds at once
+_MAX_SCORE_CELLS = 1 << 20
+
+
+class CareHit(NamedTuple):
+    topic: str
+    answer: str
+    score: float
+
+
+class CareIndex:
+    """TF-IDF retrieval over the pet care knowledge base (data/pet_care.json).
+
+    The JSON maps topic names to answers, either plain text or
+    {"answer": ..., "keywords": [...]} where keywords are indexed with the
+    answer but never shown. Topic names are indexed with extra weight.
+
+    Document vectors are kept as an inverted index in flat NumPy arrays
+    (per term: the documents containing it and their L2-normalized
+    weights), so a query only touches the postings of its own terms and
+    costs the same whether there are 4 topics or thousands. search()
+    reloads the file when its modification time changes, checked at most
+    every check_interval seconds.
+    """
+
+    def __init__(self, path: str, check_interval: float = 2.0):
+        self.path = path
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._next_check = 0.0
+        self._mtime_ns: Optional[int] = None
+        # Incremented on every rebuild, for caches of answers
+        self.version = 0
+        self._state: Tuple = self._build({})
+        self.reload()
+
+    def _read(self) -> Dict[str, Tuple[str, str]]:
+        with open(self.path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        documents = {}
+        for topic, entry in data.items():
+            if isinstance(entry, dict):
+                answer = entry.get('answer', '')
+                extra = ' '.join(entry.get('keywords', []))
+            else:
+                answer, extra = entry, ''
+            # The topic name counts twice, like a title
+            title = topic.replace('_', ' ')
+            documents[topic] = (answer, f"{title} {title} {extra} {answer}")
+        return documents
+
+    @staticmethod
+    def _build(documents: Dict[str, Tuple[str, str]]) -> Tuple:
+        topics = list(documents)
+        answers = [documents[topic][0] for topic in topics]
+        counts = [Counter(terms(documents[topic][1])) for topic in topics]
+
+        vocabulary: Dict[str, int] = {}
+        for doc_counts in counts:
+            for term in doc_counts:
+                vocabulary.setdefault(term, len(vocabulary))
+
+        n_docs = len(topics)
+        rows, cols, tfs = [], [], []
+        for doc, doc_counts in enumerate(counts):
+            rows.extend([doc] * len(doc_counts))
+            cols.extend(vocabulary[term] for term in doc_counts)
+            tfs.extend(doc_counts.values())
+        rows = np.array(rows, dtype=np.int32)
+        cols = np.array(cols, dtype=np.int32)
+        # Sublinear term frequency, smoothed inverse document frequency
+        df = np.bincount(cols, minlength=len(vocabulary))
+        idf = np.log((1 + n_docs) / (1 + df)) + 1.0
+        weights = (1.0 + np.log(np.array(tfs, dtype=np.float64))) * idf[cols]
+        norms = np.sqrt(np.bincount(rows, weights=weights ** 2, minlength=n_docs))
+        weights /= np.where(norms > 0, norms, 1.0)[rows]
+
+        # Postings ordered by term: the documents of term t are docs[starts[t]:starts[t + 1]]
+        order = np.argsort(cols, kind='stable')
+        docs = rows[order]
+        post_weights = weights[order]
+        starts = np.zeros(len(vocabulary) + 1, dtype=np.int64)
+        np.cumsum(df, out=starts[1:])
+        return topics, answers, vocabulary, idf, starts, docs, post_weights, dict(zip(topics, answers))
+
+    def reload(self) -> bool:
+        """Rebuild the index if the file changed; returns whether it was rebuilt"""
+        with self._lock:
+            try:
+                mtime_ns = os.stat(self.path).st_mtime_ns
+            except FileNotFoundError:
+                logger.warning(f"Pet care data {self.path} not found")
+                return False
+            if mtime_ns == self._mtime_ns:
+                return False
+            # A broken file is reported once, and read again when it changes
+            self._mtime_ns = mtime_ns
+            try:
+                started = time.perf_counter()
+                state = self._build(self._read())
+            except Exception as e:
+                logger.error(f"Error loading pet care data: {str(e)}")
+                return False
+            self._state = state
+            self.version += 1
+            logger.info(
+                f"Pet care index built with {len(state[0])} topics and {len(state[2])} terms "
+                f"in {(time.perf_counter() - started) * 1000:.1f} ms"
+            )
+            return True
+
+    def refresh(self) -> None:
+        """Reload the file if it changed, checking at most every check_interval seconds"""
+        now = time.monotonic()
+        if now >= self._next_check:
+            self._next_check = now + self.check_interval
+            self.reload()
+
+    def search(self, query: str, k: int = 3, min_score: float = 0.1) -> List[CareHit]:
+        """Up to k topics most similar to the query, best first"""
+        return self.search_many([query], k, min_score)[0]
+
+    def search_many(self, queries: List[str], k: int = 3, min_score: float = 0.1) -> List[List[CareHit]]:
+        """search() for several queries, scored together in one pass over their postings"""
+        self.refresh()
+        topics, answers, vocabulary, idf, starts, docs, post_weights, _ = self._state
+        n_docs = len(topics)
+        results: List[List[CareHit]] = [[] for _ in queries]
+        if not n_docs or k <= 0:
+            return results
+        rows, ids, query_weights = [], [], []
+        for row, query in enumerate(queries):
+            query_counts = Counter(term for term in terms(query) if term in vocabulary)
+            if not query_counts:
+                continue
+            term_ids = np.fromiter((vocabulary[term] for term in query_counts), dtype=np.int64, count=len(query_counts))
+            weights = (1.0 + np.log(np.fromiter(query_counts.values(), dtype=np.float64))) * idf[term_ids]
+            rows.append(np.full(len(term_ids), row, dtype=np.int64))
+            ids.append(term_ids)
+            query_weights.append(weights / np.linalg.norm(weights))
+        if not rows:
+            return results
+        rows, ids, query_weights = np.concatenate(rows), np.concatenate(ids), np.concatenate(query_weights)
+
+        # Gather the postings of every (query, term) pair and sum them into a
+        # queries x topics score matrix, a block of queries at a time
+        lengths = starts[ids + 1] - starts[ids]
+        positions = np.repeat(starts[ids] - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+        posting_rows = np.repeat(rows, lengths)
+        posting_weights = post_weights[positions] * np.repeat(query_weights, lengths)
+        posting_docs = docs[positions]
+        k = min(k, n_docs)
+        block = max(1, _MAX_SCORE_CELLS // n_docs)
+        bounds = np.searchsorted(posting_rows, np.arange(0, len(queries) + block, block))
+        for first, low, high in zip(range(0, len(queries), block), bounds[:-1], bounds[1:]):
+            if low == high:
+                continue
+            height = min(block, len(queries) - first)
+            scores = np.bincount(
+                (posting_rows[low:high] - first) * n_docs + posting_docs[low:high],
+                weights=posting_weights[low:high], minlength=height * n_docs
+            ).reshape(height, n_docs)
+            best = np.argpartition(-scores, k - 1, axis=1)[:, :k] if k < n_docs else np.argsort(-scores, axis=1)
+            best_scores = np.take_along_axis(scores, best, axis=1)
+            order = np.argsort(-best_scores, axis=1, kind='stable')
+            best = np.take_along_axis(best, order, axis=1).tolist()
+            best_scores = np.take_along_axis(best_scores, order, axis=1).tolist()
+            for offset in range(height):
+                results[first + offset] = [
+                    CareHit(topics[doc], answers[doc], score)
+                    for doc, score in zip(best[offset], best_scores[offset]) if score >= min_score
+                ]
+        return results
+
+    def topics(self) -> Iterable[str]:
+        return list(self._state[0])
+
+    def get(self, topic: str) -> Optional[str]:
+        """Answer of a topic by name"""
+        return self._state[-1].get(topic)
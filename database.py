@@ -3,7 +3,7 @@ import logging
 import psycopg2
 from psycopg2 import sql
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterator, List, Optional, Any
 from database_interface import (
     DatabaseInterface, UserInfo, InterviewInfo,
     FileInfo, InterviewResult
@@ -97,7 +97,7 @@ class PostgreSQLDatabase(DatabaseInterface):
 
     def save_interview(self, user_info: UserInfo, animal_type: str, 
                       animal_id: Optional[int], answers: Dict[str, str], 
-                      pdf_path: str, image_paths: List[str]) -> int:
+                      pdf_path: Optional[str], image_paths: List[str]) -> int:
         """Save a complete interview to the database"""
         try:
             with self.conn.cursor() as cur:
@@ -130,10 +130,11 @@ class PostgreSQLDatabase(DatabaseInterface):
                     """, (interview_id, question, answer))
 
                 
-                cur.execute("""
-                    INSERT INTO files (interview_id, file_type, file_path)
-                    VALUES (%s, %s, %s)
-                """, (interview_id, 'pdf', pdf_path))
+                if pdf_path:
+                    cur.execute("""
+                        INSERT INTO files (interview_id, file_type, file_path)
+                        VALUES (%s, %s, %s)
+                    """, (interview_id, 'pdf', pdf_path))
 
                 # Save image files
                 for image_path in image_paths:
@@ -149,6 +150,23 @@ class PostgreSQLDatabase(DatabaseInterface):
             logger.error(f"Error saving interview: {str(e)}")
             raise
 
+    def add_file(self, interview_id: int, file_type: str, file_path: str) -> int:
+        """Attach a file to a saved interview"""
+        try:
+            with self.conn.cursor() as cur:
+                cur.execute("""
+                    INSERT INTO files (interview_id, file_type, file_path)
+                    VALUES (%s, %s, %s)
+                    RETURNING id
+                """, (interview_id, file_type, file_path))
+                file_id = cur.fetchone()[0]
+                self.conn.commit()
+                return file_id
+        except Exception as e:
+            self.conn.rollback()
+            logger.error(f"Error adding file to interview {interview_id}: {str(e)}")
+            raise
+
     def get_interview(self, interview_id: int) -> Optional[InterviewResult]:
         """Retrieve a complete interview by ID"""
         try:
@@ -204,8 +222,16 @@ class PostgreSQLDatabase(DatabaseInterface):
                     for file_data in files_data
                 ]
 
+                interviewee: UserInfo = {
+                    'id': interview_data[7],
+                    'username': interview_data[8],
+                    'first_name': interview_data[9],
+                    'last_name': interview_data[10]
+                }
+
                 return {
                     'interview': interview_info,
+                    'interviewee': interviewee,
                     'answers': answers,
                     'files': files
                 }
@@ -243,6 +269,92 @@ class PostgreSQLDatabase(DatabaseInterface):
             logger.error(f"Error retrieving user interviews: {str(e)}")
             raise
 
+    def iter_interviews(self, animal_type: Optional[str] = None, animal_id: Optional[int] = None,
+                        since: Optional[datetime] = None, until: Optional[datetime] = None,
+                        batch_size: int = 100) -> Iterator[InterviewResult]:
+        """Stream complete interviews matching the filters, oldest first"""
+        conditions, params = [], []
+        if animal_type:
+            conditions.append(sql.SQL("i.animal_type = %s"))
+            params.append(animal_type)
+        if animal_id is not None:
+            conditions.append(sql.SQL("i.animal_id = %s"))
+            params.append(animal_id)
+        if since:
+            conditions.append(sql.SQL("COALESCE(i.completed_at, i.created_at) >= %s"))
+            params.append(since)
+        if until:
+            conditions.append(sql.SQL("COALESCE(i.completed_at, i.created_at) < %s"))
+            params.append(until)
+        where = sql.SQL("WHERE ") + sql.SQL(" AND ").join(conditions) if conditions else sql.SQL("")
+
+        try:
+            # Named (server-side) cursor: rows arrive batch_size at a time
+            with self.conn.cursor(name='iter_interviews') as rows, self.conn.cursor() as cur:
+                rows.itersize = batch_size
+                rows.execute(sql.SQL("""
+                    SELECT i.*, it.telegram_id, it.username, it.first_name, it.last_name
+                    FROM interviews i
+                    JOIN interviewees it ON i.interviewee_id = it.id
+                    {}
+                    ORDER BY i.id
+                """).format(where), params)
+                while True:
+                    batch = rows.fetchmany(batch_size)
+                    if not batch:
+                        break
+                    interview_ids = [interview_data[0] for interview_data in batch]
+
+                    answers: Dict[int, Dict[str, str]] = {interview_id: {} for interview_id in interview_ids}
+                    cur.execute("""
+                        SELECT interview_id, question, answer
+                        FROM answers
+                        WHERE interview_id = ANY(%s)
+                        ORDER BY id
+                    """, (interview_ids,))
+                    for interview_id, question, answer in cur.fetchall():
+                        answers[interview_id][question] = answer
+
+                    files: Dict[int, List[FileInfo]] = {interview_id: [] for interview_id in interview_ids}
+                    cur.execute("""
+                        SELECT id, interview_id, file_type, file_path, created_at
+                        FROM files
+                        WHERE interview_id = ANY(%s)
+                        ORDER BY id
+                    """, (interview_ids,))
+                    for file_data in cur.fetchall():
+                        files[file_data[1]].append({
+                            'id': file_data[0],
+                            'interview_id': file_data[1],
+                            'file_type': file_data[2],
+                            'file_path': file_data[3],
+                            'created_at': file_data[4]
+                        })
+
+                    for interview_data in batch:
+                        yield {
+                            'interview': {
+                                'id': interview_data[0],
+                                'interviewee_id': interview_data[1],
+                                'animal_type': interview_data[2],
+                                'animal_id': interview_data[3],
+                                'status': interview_data[4],
+                                'created_at': interview_data[5],
+                                'completed_at': interview_data[6]
+                            },
+                            'interviewee': {
+                                'id': interview_data[7],
+                                'username': interview_data[8],
+                                'first_name': interview_data[9],
+                                'last_name': interview_data[10]
+                            },
+                            'answers': answers[interview_data[0]],
+                            'files': files[interview_data[0]]
+                        }
+        except Exception as e:
+            logger.error(f"Error iterating interviews: {str(e)}")
+            raise
+
     def close(self) -> None:
         """Close the database connection"""
         if self.conn:
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional, Any, TypedDict, Union
+from typing import Dict, Iterator, List, Optional, Any, TypedDict, Union
 from datetime import datetime
 
 class UserInfo(TypedDict):
@@ -26,6 +26,7 @@ class FileInfo(TypedDict):
 
 class InterviewResult(TypedDict):
     interview: InterviewInfo
+    interviewee: UserInfo
     answers: Dict[str, str]
     files: List[FileInfo]
 
@@ -53,7 +54,17 @@ class DatabaseInterface(ABC):
     @abstractmethod
     def save_interview(self, user_info: UserInfo, animal_type: str, 
                       animal_id: Optional[int], answers: Dict[str, str], 
-                      pdf_path: str, image_paths: List[str]) -> int:
+                      pdf_path: Optional[str], image_paths: List[str]) -> int:
+        """Save a completed interview.
+
+        Args:
+            pdf_path: Path of a stored PDF, or None when the PDF only existed in memory.
+        """
+        pass
+
+    @abstractmethod
+    def add_file(self, interview_id: int, file_type: str, file_path: str) -> int:
+        """Attach a file (e.g. a PDF rendered later) to a saved interview."""
         pass
 
     @abstractmethod
@@ -64,6 +75,20 @@ class DatabaseInterface(ABC):
     def get_interviews_by_user(self, telegram_id: int) -> List[InterviewInfo]:
         pass
 
+    @abstractmethod
+    def iter_interviews(self, animal_type: Optional[str] = None, animal_id: Optional[int] = None,
+                        since: Optional[datetime] = None, until: Optional[datetime] = None,
+                        batch_size: int = 100) -> Iterator[InterviewResult]:
+        """Stream complete interviews matching the filters, oldest first.
+
+        Rows are fetched batch_size at a time, so memory does not grow with
+        the number of interviews.
+
+        Args:
+            since, until: Completion time range in local time, until exclusive.
+        """
+        pass
+
     @abstractmethod
     def close(self) -> None:
         """Close the database connection."""
@@ -1,13 +1,33 @@
 import os
 import sqlite3
 import json
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional
 from dotenv import load_dotenv
 import logging
+from database_interface import (
+    DatabaseInterface, UserInfo, InterviewInfo,
+    FileInfo, InterviewResult
+)
 
 load_dotenv()
 
-class DatabaseManager:
-    def __init__(self):
+
+# SQLite's CURRENT_TIMESTAMP is UTC; callers work with naive local times
+def _to_utc(value: datetime) -> datetime:
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+def _to_local(value: Optional[datetime]) -> Optional[datetime]:
+    if value is None:
+        return None
+    return value.replace(tzinfo=timezone.utc).astimezone().replace(tzinfo=None)
+
+
+class DatabaseManager(DatabaseInterface):
+    """SQLite implementation of DatabaseInterface, stored in data/pet_adoption.db"""
+
+    def __init__(self, db_path: str = 'data/pet_adoption.db'):
+        self.db_path = db_path
         self.conn = None
         self.cursor = None
         self.connect()
@@ -16,19 +36,23 @@ class DatabaseManager:
         """Establish database connection"""
         try:
             
-            os.makedirs('data', exist_ok=True)
+            os.makedirs(os.path.dirname(self.db_path) or '.', exist_ok=True)
             
-            self.conn = sqlite3.connect('data/pet_adoption.db')
+            self.conn = sqlite3.connect(
+                self.db_path,
+                detect_types=sqlite3.PARSE_DECLTYPES,
+                check_same_thread=False
+            )
             
             self.conn.row_factory = sqlite3.Row
             self.cursor = self.conn.cursor()
-            self._create_tables()
+            self.create_tables()
             logging.info("Successfully connected to the database")
         except Exception as e:
             logging.error(f"Error connecting to database: {str(e)}")
             raise
 
-    def _create_tables(self):
+    def create_tables(self):
         """Create necessary tables if they don't exist"""
         try:
             # Create users table
@@ -57,6 +81,54 @@ class DatabaseManager:
                 )
             """)
 
+            self.cursor.execute("""
+                CREATE TABLE IF NOT EXISTS files (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    interview_id INTEGER,
+                    file_type TEXT NOT NULL,
+                    file_path TEXT NOT NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (interview_id) REFERENCES interviews(id)
+                )
+            """)
+
+            # Content-addressed blobs (file_store.ContentStore); files rows count as references
+            self.cursor.execute("""
+                CREATE TABLE IF NOT EXISTS blobs (
+                    digest TEXT PRIMARY KEY,
+                    file_path TEXT UNIQUE NOT NULL,
+                    size INTEGER NOT NULL,
+                    refcount INTEGER NOT NULL DEFAULT 0,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    released_at TIMESTAMP
+                )
+            """)
+            self.cursor.execute("""
+                CREATE TRIGGER IF NOT EXISTS files_blob_ref AFTER INSERT ON files
+                BEGIN
+                    UPDATE blobs SET refcount = refcount + 1 WHERE file_path = NEW.file_path;
+                END
+            """)
+            self.cursor.execute("""
+                CREATE TRIGGER IF NOT EXISTS files_blob_unref AFTER DELETE ON files
+                BEGIN
+                    UPDATE blobs SET refcount = refcount - 1, released_at = CURRENT_TIMESTAMP
+                    WHERE file_path = OLD.file_path;
+                END
+            """)
+            self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_files_path ON files (file_path)")
+
+            # Columns added for DatabaseInterface on databases created before them
+            self._ensure_columns('users', {
+                'username': 'TEXT',
+                'first_name': 'TEXT',
+                'last_name': 'TEXT',
+            })
+            self._ensure_columns('interviews', {
+                'animal_type': 'TEXT',
+                'completed_at': 'TIMESTAMP',
+            })
+
             self.conn.commit()
             logging.info("Database tables created successfully")
         except Exception as e:
@@ -64,6 +136,13 @@ class DatabaseManager:
             self.conn.rollback()
             raise
 
+    def _ensure_columns(self, table: str, columns: Dict[str, str]) -> None:
+        """Add missing columns to an existing table"""
+        existing = {row['name'] for row in self.cursor.execute(f"PRAGMA table_info({table})")}
+        for name, declaration in columns.items():
+            if name not in existing:
+                self.cursor.execute(f"ALTER TABLE {table} ADD COLUMN {name} {declaration}")
+
     def save_user(self, telegram_id: int, name: str = None, phone: str = None, 
                   email: str = None, address: str = None) -> int:
         """Save or update user information"""
@@ -79,21 +158,224 @@ class DatabaseManager:
             self.conn.rollback()
             raise
 
-    def save_interview(self, user_id: int, animal_id: str, answers: dict, 
-                      status: str = 'pending') -> int:
-        """Save interview information"""
+    def save_interview(self, user_info: UserInfo, animal_type: str,
+                      animal_id: Optional[int], answers: Dict[str, str],
+                      pdf_path: Optional[str], image_paths: List[str]) -> int:
+        """Save a complete interview to the database"""
         try:
-            answers_json = json.dumps(answers)
-            self.cursor.execute("""
-                INSERT INTO interviews 
-                (user_id, animal_id, answers, status)
-                VALUES (?, ?, ?, ?)
-            """, (user_id, animal_id, answers_json, status))
-            self.conn.commit()
-            return self.cursor.lastrowid
+            with self.conn:
+                self.cursor.execute("""
+                    INSERT INTO users (telegram_id, username, first_name, last_name)
+                    VALUES (?, ?, ?, ?)
+                    ON CONFLICT (telegram_id) DO UPDATE
+                    SET username = excluded.username,
+                        first_name = excluded.first_name,
+                        last_name = excluded.last_name
+                """, (user_info['id'], user_info.get('username'),
+                      user_info.get('first_name'), user_info.get('last_name')))
+                user_id = self.cursor.execute(
+                    "SELECT id FROM users WHERE telegram_id = ?", (user_info['id'],)
+                ).fetchone()['id']
+
+                self.cursor.execute("""
+                    INSERT INTO interviews
+                    (user_id, animal_type, animal_id, answers, status, completed_at)
+                    VALUES (?, ?, ?, ?, 'pending', CURRENT_TIMESTAMP)
+                """, (user_id, animal_type, animal_id, json.dumps(answers, ensure_ascii=False)))
+                interview_id = self.cursor.lastrowid
+
+                files = [('image', image_path) for image_path in image_paths]
+                if pdf_path:
+                    files.insert(0, ('pdf', pdf_path))
+                self.cursor.executemany("""
+                    INSERT INTO files (interview_id, file_type, file_path)
+                    VALUES (?, ?, ?)
+                """, [(interview_id, file_type, file_path) for file_type, file_path in files])
+
+            logging.info(f"Interview {interview_id} saved successfully")
+            return interview_id
         except Exception as e:
             logging.error(f"Error saving interview: {str(e)}")
-            self.conn.rollback()
+            raise
+
+    def add_file(self, interview_id: int, file_type: str, file_path: str) -> int:
+        """Attach a file to a saved interview"""
+        try:
+            with self.conn:
+                self.cursor.execute("""
+                    INSERT INTO files (interview_id, file_type, file_path)
+                    VALUES (?, ?, ?)
+                """, (interview_id, file_type, file_path))
+            return self.cursor.lastrowid
+        except Exception as e:
+            logging.error(f"Error adding file to interview {interview_id}: {str(e)}")
+            raise
+
+    def register_blob(self, digest: str, file_path: str, size: int) -> None:
+        """Record a stored blob, counting the files rows that already point at it"""
+        try:
+            # Own cursor: blobs are stored from worker threads
+            with self.conn:
+                self.conn.execute("""
+                    INSERT INTO blobs (digest, file_path, size, refcount)
+                    VALUES (?, ?, ?, (SELECT COUNT(*) FROM files WHERE file_path = ?))
+                    ON CONFLICT (digest) DO NOTHING
+                """, (digest, file_path, size, file_path))
+        except Exception as e:
+            logging.error(f"Error registering blob {digest}: {str(e)}")
+            raise
+
+    def move_file_references(self, old_path: str, new_path: str) -> int:
+        """Point the files rows of old_path at the blob stored at new_path; returns how many moved"""
+        try:
+            with self.conn:
+                self.cursor.execute("UPDATE files SET file_path = ? WHERE file_path = ?", (new_path, old_path))
+                moved = self.cursor.rowcount
+                # UPDATE has no trigger; carry the references over by hand
+                self.cursor.execute("""
+                    UPDATE blobs SET refcount = refcount + ? WHERE file_path = ?
+                """, (moved, new_path))
+            return moved
+        except Exception as e:
+            logging.error(f"Error moving references from {old_path}: {str(e)}")
+            raise
+
+    def unreferenced_blobs(self, grace_seconds: float, limit: int = 500) -> List[sqlite3.Row]:
+        """Blobs without references for at least grace_seconds, oldest first"""
+        return self.cursor.execute("""
+            SELECT digest, file_path, size FROM blobs
+            WHERE refcount <= 0
+              AND COALESCE(released_at, created_at) < datetime('now', ?)
+            ORDER BY COALESCE(released_at, created_at)
+            LIMIT ?
+        """, (f"-{int(grace_seconds)} seconds", limit)).fetchall()
+
+    def delete_blob(self, digest: str) -> bool:
+        """Forget a blob if it is still unreferenced; returns whether it was deleted"""
+        with self.conn:
+            self.cursor.execute("DELETE FROM blobs WHERE digest = ? AND refcount <= 0", (digest,))
+            return self.cursor.rowcount > 0
+
+    def referenced_paths(self) -> List[str]:
+        """Every file path known to the files or blobs table"""
+        rows = self.cursor.execute("""
+            SELECT file_path FROM files
+            UNION
+            SELECT file_path FROM blobs
+        """).fetchall()
+        return [row['file_path'] for row in rows]
+
+    def _interview_info(self, row: sqlite3.Row) -> InterviewInfo:
+        animal_id = row['animal_id']
+        return {
+            'id': row['id'],
+            'interviewee_id': row['user_id'],
+            'animal_type': row['animal_type'],
+            'animal_id': int(animal_id) if animal_id not in (None, '') else None,
+            'status': row['status'],
+            'created_at': _to_local(row['created_at']),
+            'completed_at': _to_local(row['completed_at'])
+        }
+
+    def _interview_result(self, row: sqlite3.Row, files: List[FileInfo]) -> InterviewResult:
+        return {
+            'interview': self._interview_info(row),
+            'interviewee': {
+                'id': row['telegram_id'],
+                'username': row['username'],
+                'first_name': row['first_name'],
+                'last_name': row['last_name']
+            },
+            'answers': json.loads(row['answers']) if row['answers'] else {},
+            'files': files
+        }
+
+    def _files_by_interview(self, cursor: sqlite3.Cursor, interview_ids: List[int]) -> Dict[int, List[FileInfo]]:
+        files: Dict[int, List[FileInfo]] = {interview_id: [] for interview_id in interview_ids}
+        placeholders = ', '.join('?' * len(interview_ids))
+        for file_row in cursor.execute(f"""
+            SELECT id, interview_id, file_type, file_path, created_at
+            FROM files
+            WHERE interview_id IN ({placeholders})
+            ORDER BY id
+        """, interview_ids):
+            files[file_row['interview_id']].append(dict(file_row))
+        return files
+
+    def get_interview(self, interview_id: int) -> Optional[InterviewResult]:
+        """Retrieve a complete interview by ID"""
+        try:
+            row = self.cursor.execute("""
+                SELECT i.*, u.telegram_id, u.username, u.first_name, u.last_name
+                FROM interviews i
+                JOIN users u ON u.id = i.user_id
+                WHERE i.id = ?
+            """, (interview_id,)).fetchone()
+            if not row:
+                return None
+
+            files = self._files_by_interview(self.cursor, [interview_id])[interview_id]
+            return self._interview_result(row, files)
+        except Exception as e:
+            logging.error(f"Error retrieving interview: {str(e)}")
+            raise
+
+    def iter_interviews(self, animal_type: Optional[str] = None, animal_id: Optional[int] = None,
+                        since: Optional[datetime] = None, until: Optional[datetime] = None,
+                        batch_size: int = 100) -> Iterator[InterviewResult]:
+        """Stream complete interviews matching the filters, oldest first"""
+        conditions, params = [], []
+        if animal_type:
+            conditions.append("i.animal_type = ?")
+            params.append(animal_type)
+        if animal_id is not None:
+            conditions.append("i.animal_id = ?")
+            params.append(animal_id)
+        if since:
+            conditions.append("COALESCE(i.completed_at, i.created_at) >= ?")
+            params.append(_to_utc(since).isoformat(sep=' ', timespec='seconds'))
+        if until:
+            conditions.append("COALESCE(i.completed_at, i.created_at) < ?")
+            params.append(_to_utc(until).isoformat(sep=' ', timespec='seconds'))
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        # Own cursors, so other queries can run on the connection meanwhile
+        rows = self.conn.cursor()
+        files = self.conn.cursor()
+        try:
+            rows.execute(f"""
+                SELECT i.*, u.telegram_id, u.username, u.first_name, u.last_name
+                FROM interviews i
+                JOIN users u ON u.id = i.user_id
+                {where}
+                ORDER BY i.id
+            """, params)
+            while True:
+                batch = rows.fetchmany(batch_size)
+                if not batch:
+                    break
+                files_by_interview = self._files_by_interview(files, [row['id'] for row in batch])
+                for row in batch:
+                    yield self._interview_result(row, files_by_interview[row['id']])
+        except Exception as e:
+            logging.error(f"Error iterating interviews: {str(e)}")
+            raise
+        finally:
+            rows.close()
+            files.close()
+
+    def get_interviews_by_user(self, telegram_id: int) -> List[InterviewInfo]:
+        """Retrieve all interviews for a specific user"""
+        try:
+            rows = self.cursor.execute("""
+                SELECT i.* FROM interviews i
+                JOIN users u ON u.id = i.user_id
+                WHERE u.telegram_id = ?
+                ORDER BY i.created_at DESC
+            """, (telegram_id,)).fetchall()
+            return [self._interview_info(row) for row in rows]
+        except Exception as e:
+            logging.error(f"Error retrieving user interviews: {str(e)}")
             raise
 
     def get_user_interviews(self, telegram_id: int) -> list:
@@ -112,6 +394,15 @@ class DatabaseManager:
             logging.error(f"Error getting user interviews: {str(e)}")
             raise
 
+    def close(self):
+        """Close database connection"""
+        if self.cursor:
+            self.cursor.close()
+            self.cursor = None
+        if self.conn:
+            self.conn.close()
+            self.conn = None
+
     def __del__(self):
         """Close database connection"""
         if self.cursor:
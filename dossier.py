@@ -0,0 +1,183 @@
+import os
+import logging
+import tempfile
+from io import BytesIO
+from collections import deque
+from concurrent.futures import Executor
+from datetime import datetime, timedelta
+from typing import Any, BinaryIO, Callable, Dict, Iterable, List, Optional, Sequence, Union
+from database_interface import InterviewResult
+from callback_router import ANIMAL_TYPE_ALIASES, ANIMAL_TYPE_LABELS
+from pdf_generator import DossierSection, animal_label, render_dossier_chunk, render_dossier_cover
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TITLE = "Dossiê de Entrevistas de Adoção"
+# Interviews rendered per canvas / per worker task
+DEFAULT_CHUNK_SIZE = 25
+
+# 'gatos', 'cachorros', 'outros' as well as 'cats', 'dog', ...
+_TYPE_NAMES = {
+    **ANIMAL_TYPE_ALIASES,
+    **{label.split()[0]: animal_type for animal_type, label in ANIMAL_TYPE_LABELS.items()}
+}
+
+LabelFor = Callable[[str, int], Optional[str]]
+
+
+def parse_filters(args: Sequence[str]) -> Dict[str, Any]:
+    """Turn arguments like ['gatos', '3', '2026-01-01', '2026-01-31'] into iter_interviews filters.
+
+    An animal type, an animal id and up to two dates (first and last day,
+    both inclusive) may be given in any order. Raises ValueError otherwise.
+    """
+    filters: Dict[str, Any] = {}
+    dates: List[datetime] = []
+    for arg in args:
+        name = arg.lower()
+        if name in _TYPE_NAMES:
+            filters['animal_type'] = _TYPE_NAMES[name]
+        elif arg.isdigit():
+            filters['animal_id'] = int(arg)
+        else:
+            dates.append(datetime.strptime(arg, '%Y-%m-%d'))
+    if len(dates) > 2:
+        raise ValueError("At most two dates can be given")
+    if dates:
+        filters['since'] = min(dates)
+        filters['until'] = max(dates) + timedelta(days=1)
+    return filters
+
+
+def describe_filters(filters: Dict[str, Any]) -> List[str]:
+    """Cover page lines describing the filters"""
+    lines = []
+    if filters.get('animal_type'):
+        lines.append(f"Tipo: {ANIMAL_TYPE_LABELS[filters['animal_type']]}")
+    if filters.get('animal_id') is not None:
+        lines.append(f"Animal ID: {filters['animal_id']}")
+    if filters.get('since'):
+        last_day = filters['until'] - timedelta(days=1)
+        lines.append(f"Período: {filters['since'].strftime('%d/%m/%Y')} a {last_day.strftime('%d/%m/%Y')}")
+    return lines
+
+
+def _section(result: InterviewResult, label_for: Optional[LabelFor],
+             photos: Optional[Dict[int, List[bytes]]]) -> DossierSection:
+    info = result['interview']
+    user = result['interviewee']
+    label = None
+    if label_for and info['animal_type'] and info['animal_id'] is not None:
+        label = label_for(info['animal_type'], info['animal_id'])
+    return (
+        info['id'], user['id'], dict(user), result['answers'], label,
+        info['completed_at'] or info['created_at'],
+        photos.get(info['id'], []) if photos else []
+    )
+
+
+def build_dossier(interviews: Iterable[InterviewResult], output: Union[str, BinaryIO],
+                  title: str = DEFAULT_TITLE, filters: Optional[List[str]] = None,
+                  label_for: Optional[LabelFor] = None, photos: Optional[Dict[int, List[bytes]]] = None,
+                  executor: Optional[Executor] = None, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                  max_in_flight: int = 4) -> int:
+    """Render interviews into one PDF behind a cover page; returns how many were included.
+
+    Interviews are consumed lazily, chunk_size at a time, and each chunk is
+    drawn on one canvas in the executor (inline when None). At most
+    max_in_flight chunks are pending and finished chunks are spooled to
+    temporary files, so the memory used while rendering depends on the
+    chunk size, not on the number of interviews. The final merge is not
+    bounded: pypdf holds every page of every chunk until it writes the
+    output, so its peak memory grows with the size of the dossier.
+
+    photos maps interview ids to JPEG bytes drawn after that interview.
+    """
+    count = 0
+    with tempfile.TemporaryDirectory(prefix='dossier_') as spool_dir:
+        chunk_paths: List[str] = []
+        pending = deque()
+
+        def spool(pdf_bytes: bytes) -> None:
+            path = os.path.join(spool_dir, f"{len(chunk_paths):06d}.pdf")
+            with open(path, 'wb') as f:
+                f.write(pdf_bytes)
+            chunk_paths.append(path)
+
+        def submit(sections: List[DossierSection]) -> None:
+            if executor is None:
+                spool(render_dossier_chunk(sections))
+                return
+            pending.append(executor.submit(render_dossier_chunk, sections))
+            while len(pending) >= max_in_flight:
+                spool(pending.popleft().result())
+
+        sections: List[DossierSection] = []
+        for result in interviews:
+            sections.append(_section(result, label_for, photos))
+            count += 1
+            if len(sections) >= chunk_size:
+                submit(sections)
+                sections = []
+        if sections:
+            submit(sections)
+        while pending:
+            spool(pending.popleft().result())
+
+        if not count:
+            return 0
+
+        from pypdf import PdfWriter
+        writer = PdfWriter()
+        writer.append(BytesIO(render_dossier_cover(title, filters or [], count)))
+        for path in chunk_paths:
+            writer.append(path)
+        writer.write(output)
+        writer.close()
+
+    logger.info(f"Dossier with {count} interviews rendered in {len(chunk_paths)} chunks")
+    return count
+
+
+if __name__ == "__main__":
+    import argparse
+    from concurrent.futures import ProcessPoolExecutor
+    from animal_manager import AnimalManager
+    from database_manager import DatabaseManager
+
+    logging.basicConfig(
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        level=logging.INFO
+    )
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    parser = argparse.ArgumentParser(description="Write one PDF with every matching adoption interview")
+    parser.add_argument('filters', nargs='*',
+                        help="animal type (gatos, cachorros, ...), animal id and up to two dates YYYY-MM-DD")
+    parser.add_argument('-o', '--output', help="output PDF (default: dossie_entrevistas_<timestamp>.pdf)")
+    parser.add_argument('--db', default='data/pet_adoption.db')
+    parser.add_argument('--animals', default=os.path.join(base_dir, 'data', 'animals.json'))
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    filters = parse_filters(args.filters)
+    output = args.output or f"dossie_entrevistas_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
+    animals = AnimalManager(args.animals)
+
+    def label_for(animal_type: str, animal_id: int) -> Optional[str]:
+        return animal_label(animals.get_animal(animal_type, animal_id))
+
+    db = DatabaseManager(args.db)
+    try:
+        with ProcessPoolExecutor(max_workers=args.workers) as executor:
+            count = build_dossier(
+                db.iter_interviews(**filters), output, filters=describe_filters(filters),
+                label_for=label_for, executor=executor, chunk_size=args.chunk_size,
+                max_in_flight=2 * args.workers
+            )
+    finally:
+        db.close()
+    if count:
+        logger.info(f"Wrote {count} interviews to {output}")
+    else:
+        logger.info("No interviews match the filters")
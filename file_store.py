@@ -0,0 +1,141 @@
+import os
+import asyncio
+import hashlib
+import logging
+import tempfile
+import threading
+from typing import Callable, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class ContentStore:
+    """Content-addressed file store.
+
+    Each distinct content is written once, at root/<first 2 hex digits>/<sha256><suffix>,
+    so identical files coming from different users or sessions share one copy.
+    Writes go to a temporary file in the same directory and are renamed into
+    place, so a path either holds the complete content or does not exist.
+
+    With a database, every stored blob is registered in its blobs table,
+    where the files table keeps the reference count up to date, and
+    collect_garbage() deletes blobs nobody references anymore.
+    """
+
+    def __init__(self, root: str, db=None):
+        self.root = root
+        self.db = db
+        # Serializes put() against collect_garbage(), so a blob being
+        # collected cannot be handed out again at the same time
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+
+    def path_for(self, digest: str, suffix: str = '') -> str:
+        return os.path.join(self.root, digest[:2], digest + suffix)
+
+    def put(self, data: bytes, suffix: str = '') -> str:
+        """Store data unless the same content is already stored; returns its path"""
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.path_for(digest, suffix)
+        with self._lock:
+            if not os.path.exists(path):
+                self._write(path, data)
+            if self.db is not None:
+                self.db.register_blob(digest, path, len(data))
+        return path
+
+    def _write(self, path: str, data: bytes) -> None:
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.error(f"Error storing {path}: {str(e)}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def adopt(self, directory: str) -> int:
+        """Move the files of an older, unregistered layout under directory into the store.
+
+        Each file is stored by its content and the files rows pointing at
+        its old path are moved to the new one, so the reference count is
+        right; files nobody refers to are left to collect_garbage(). Safe
+        to repeat after an interruption. Returns how many files were moved.
+        """
+        if self.db is None or not os.path.isdir(directory):
+            return 0
+        moved = 0
+        for dirpath, _, names in os.walk(directory, topdown=False):
+            for name in names:
+                old_path = os.path.join(dirpath, name)
+                if not name.endswith('.tmp'):
+                    data = self.read(old_path)
+                    if data is None:
+                        continue
+                    new_path = self.put(data, os.path.splitext(name)[1])
+                    self.db.move_file_references(old_path, new_path)
+                    moved += 1
+                # Temporaries of interrupted writes are simply dropped
+                os.remove(old_path)
+            try:
+                os.rmdir(dirpath)
+            except OSError:
+                pass
+        if moved:
+            logger.info(f"Moved {moved} files from {directory} into the content store")
+        return moved
+
+    def read(self, path: str) -> Optional[bytes]:
+        """Content stored at path, or None if it is gone"""
+        try:
+            with open(path, 'rb') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def collect_garbage(self, grace_seconds: float, in_use: Iterable[str] = (),
+                        limit: int = 500) -> Tuple[int, int]:
+        """Delete up to limit blobs that have had no references for grace_seconds.
+
+        Paths in in_use (e.g. photos of interviews still in progress) are
+        kept even without references. Returns (blobs deleted, bytes freed).
+        """
+        if self.db is None:
+            return 0, 0
+        in_use = set(in_use)
+        deleted = freed = 0
+        for blob in self.db.unreferenced_blobs(grace_seconds, limit):
+            if blob['file_path'] in in_use:
+                continue
+            with self._lock:
+                if not self.db.delete_blob(blob['digest']):
+                    continue  # referenced again meanwhile
+                try:
+                    os.remove(blob['file_path'])
+                except FileNotFoundError:
+                    pass
+            deleted += 1
+            freed += blob['size']
+        return deleted, freed
+
+    def gc_job(self, grace_seconds: float, in_use: Callable[[], Iterable[str]] = lambda: ()):
+        """Job queue callback that collects garbage in batches, yielding between them"""
+        async def job(context) -> None:
+            try:
+                total_deleted = total_freed = 0
+                while True:
+                    deleted, freed = self.collect_garbage(grace_seconds, in_use())
+                    total_deleted += deleted
+                    total_freed += freed
+                    if not deleted:
+                        break
+                    await asyncio.sleep(0)
+                if total_deleted:
+                    logger.info(f"Removed {total_deleted} unreferenced files ({total_freed / 1024:.0f} KB)")
+            except Exception as e:
+                logger.error(f"Error collecting unreferenced files: {str(e)}")
+        return job
@@ -0,0 +1,230 @@
+import os
+import re
+import json
+import bisect
+import difflib
+import logging
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+from text_utils import fold
+
+logger = logging.getLogger(__name__)
+
+_NON_WORD = re.compile(r'[^a-z0-9]+')
+
+
+class GeoPoint(NamedTuple):
+    lat: float
+    lon: float
+    name: str
+    # 'gazetteer' or 'remote'
+    source: str
+
+
+# remote(query) -> GeoPoint or None; may block on the network
+RemoteGeocoder = Callable[[str], Optional[GeoPoint]]
+
+
+def normalize(text: str) -> str:
+    """Cache and gazetteer key: folded words separated by single spaces"""
+    return _NON_WORD.sub(' ', fold(text)).strip()
+
+
+class Gazetteer:
+    """Local place names (cities, neighbourhoods and their aliases) with coordinates.
+
+    lookup() tries, in order: the exact name, the only place or the
+    largest place whose name starts with the query (at least
+    min_prefix characters), and the closest name by difflib similarity.
+    """
+
+    def __init__(self, places: List[Dict], min_prefix: int = 3, fuzzy_cutoff: float = 0.8):
+        self.min_prefix = min_prefix
+        self.fuzzy_cutoff = fuzzy_cutoff
+        self._places: Dict[str, GeoPoint] = {}
+        # Cities win over neighbourhoods when a prefix matches both
+        self._rank: Dict[str, int] = {}
+        for place in places:
+            point = GeoPoint(place['lat'], place['lon'], place['name'], 'gazetteer')
+            rank = 0 if place.get('kind', 'city') == 'city' else 1
+            for name in [place['name'], *place.get('aliases', [])]:
+                key = normalize(name)
+                if key and (key not in self._rank or rank < self._rank[key]):
+                    self._places[key] = point
+                    self._rank[key] = rank
+        self._names = sorted(self._places)
+
+    @classmethod
+    def load(cls, path: str) -> 'Gazetteer':
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                places = json.load(f)
+        except FileNotFoundError:
+            logger.warning(f"Gazetteer {path} not found")
+            places = []
+        return cls(places)
+
+    def lookup(self, key: str) -> Optional[GeoPoint]:
+        """Place for a normalized name, or None"""
+        point = self._places.get(key)
+        if point is not None:
+            return point
+        if len(key) >= self.min_prefix:
+            start = bisect.bisect_left(self._names, key)
+            matches = []
+            for name in self._names[start:]:
+                if not name.startswith(key):
+                    break
+                matches.append(name)
+            if matches:
+                best = min(matches, key=lambda name: (self._rank[name], len(name)))
+                return self._places[best]
+        close = difflib.get_close_matches(key, self._names, n=1, cutoff=self.fuzzy_cutoff)
+        return self._places[close[0]] if close else None
+
+    def __len__(self) -> int:
+        return len(self._places)
+
+
+class GeocodeCache:
+    """LRU cache of resolved locations, persisted to a JSON file.
+
+    Misses are stored too (as None), so a place the remote geocoder does
+    not know is not asked for again. Only entries put with persist=True
+    are written to disk; the file is rewritten atomically.
+    """
+
+    def __init__(self, path: Optional[str], max_entries: int = 10000):
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries: 'OrderedDict[str, Optional[GeoPoint]]' = OrderedDict()
+        self._persistent: set = set()
+        if path:
+            self._load()
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logger.error(f"Ignoring unreadable geocode cache {self.path}: {str(e)}")
+            return
+        for key, value in list(data.items())[-self.max_entries:]:
+            self._entries[key] = GeoPoint(*value) if value is not None else None
+            self._persistent.add(key)
+
+    def get(self, key: str) -> Tuple[bool, Optional[GeoPoint]]:
+        """(found, point); point may be None for a cached miss"""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, self._entries[key]
+            self.misses += 1
+            return False, None
+
+    def put(self, key: str, point: Optional[GeoPoint], persist: bool = False) -> None:
+        with self._lock:
+            self._entries[key] = point
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                evicted, _ = self._entries.popitem(last=False)
+                self._persistent.discard(evicted)
+            if persist:
+                self._persistent.add(key)
+                self._save()
+
+    def _save(self) -> None:
+        if not self.path:
+            return
+        data = {
+            key: list(point) if point is not None else None
+            for key, point in self._entries.items() if key in self._persistent
+        }
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.error(f"Error saving geocode cache {self.path}: {str(e)}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class Geocoder:
+    """Resolves free-text locations: cache first, then the gazetteer, then an optional remote geocoder.
+
+    'Copacabana, Rio de Janeiro' is tried whole and then part by part.
+    Without a remote geocoder everything stays offline.
+    """
+
+    def __init__(self, gazetteer: Gazetteer, cache: GeocodeCache, remote: Optional[RemoteGeocoder] = None):
+        self.gazetteer = gazetteer
+        self.cache = cache
+        self.remote = remote
+
+    def resolve(self, location: str) -> Optional[GeoPoint]:
+        key = normalize(location or '')
+        if not key:
+            return None
+        found, point = self.cache.get(key)
+        if found:
+            return point
+
+        candidates = [key]
+        if ',' in location:
+            candidates.extend(part for part in map(normalize, location.split(',')) if part)
+        for candidate in candidates:
+            point = self.gazetteer.lookup(candidate)
+            if point is not None:
+                self.cache.put(key, point)
+                return point
+
+        if self.remote is None:
+            return None
+        try:
+            point = self.remote(location)
+        except Exception as e:
+            # Not cached: the failure may be temporary
+            logger.error(f"Error geocoding {location!r}: {str(e)}")
+            return None
+        self.cache.put(key, point, persist=True)
+        return point
+
+
+class StaticGeocoder:
+    """Remote geocoder stand-in answering from a dict, for offline runs and benchmarks"""
+
+    def __init__(self, places: Dict[str, Tuple[float, float]]):
+        self.places = {normalize(name): coordinates for name, coordinates in places.items()}
+        self.calls = 0
+
+    def __call__(self, location: str) -> Optional[GeoPoint]:
+        self.calls += 1
+        coordinates = self.places.get(normalize(location))
+        return GeoPoint(coordinates[0], coordinates[1], location, 'remote') if coordinates else None
+
+
+def nominatim_geocoder(user_agent: str, timeout: float = 5.0) -> RemoteGeocoder:
+    """Remote geocoder backed by geopy's Nominatim (OpenStreetMap); needs network access"""
+    from geopy.geocoders import Nominatim
+    client = Nominatim(user_agent=user_agent, timeout=timeout)
+
+    def geocode(location: str) -> Optional[GeoPoint]:
+        result = client.geocode(location)
+        if result is None:
+            return None
+        return GeoPoint(result.latitude, result.longitude, result.address, 'remote')
+    return geocode
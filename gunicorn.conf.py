@@ -0,0 +1,14 @@
+import os
+import multiprocessing
+
+# gunicorn -c gunicorn.conf.py wsgi:app
+bind = os.getenv('WEB_BIND', '0.0.0.0:8000')
+workers = int(os.getenv('WEB_WORKERS', '0')) or multiprocessing.cpu_count() * 2 + 1
+# Threads per worker; requests are short and mostly CPU-bound, a few threads cover client I/O
+worker_class = 'gthread'
+threads = int(os.getenv('WEB_THREADS', '4'))
+# Build the care, shelter and geocoding indexes once in the master; workers share them copy-on-write
+preload_app = True
+keepalive = 5
+timeout = 30
+accesslog = os.getenv('WEB_ACCESS_LOG') or None
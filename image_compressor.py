@@ -1,5 +1,4 @@
 import os
-from PIL import Image
 import logging
 from io import BytesIO
 
@@ -10,6 +9,38 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Pillow is imported where it is used, so importing this module stays cheap
+
+def perceptual_hash(data):
+    """
+    Calcula o hash perceptual (dHash de 64 bits) de uma imagem.
+    
+    A imagem é decodificada já reduzida (draft do JPEG), então o custo é
+    uma fração de uma decodificação completa. Fotos quase iguais (outra
+    compressão, pequeno redimensionamento) têm hashes a poucos bits de
+    distância.
+    
+    Args:
+        data (bytes): Conteúdo da imagem
+        
+    Returns:
+        int: Hash de 64 bits
+    """
+    from PIL import Image
+    with Image.open(BytesIO(data)) as img:
+        img.draft('L', (32, 32))
+        small = img.convert('L').resize((9, 8), Image.Resampling.BILINEAR)
+    pixels = small.tobytes()
+    value = 0
+    for row in range(0, 72, 9):
+        for col in range(row, row + 8):
+            value = (value << 1) | (pixels[col] > pixels[col + 1])
+    return value
+
+def hash_distance(a, b):
+    """Número de bits diferentes entre dois hashes perceptuais"""
+    return (a ^ b).bit_count()
+
 class ImageCompressor:
     def __init__(self, max_size_kb=500, quality=85):
         """
@@ -29,26 +60,38 @@ class ImageCompressor:
         Args:
             image_path (str): Caminho para a imagem original
             
+        Returns:
+            bytes: Imagem comprimida em bytes
+        """
+        with open(image_path, 'rb') as f:
+            return self.compress_bytes(f.read(), image_path)
+
+    def compress_bytes(self, data, name='imagem'):
+        """
+        Comprime uma imagem já carregada em memória, sem passar pelo disco.
+        
+        Args:
+            data (bytes): Conteúdo da imagem original
+            name (str): Nome da imagem usado nas mensagens de log
+            
         Returns:
             bytes: Imagem comprimida em bytes
         """
         try:
+            original_size = len(data) / 1024
+            
+            
+            if original_size <= self.max_size_kb:
+                logger.info(f"Imagem já está dentro do tamanho máximo ({original_size:.2f}KB)")
+                return data
             
-            with Image.open(image_path) as img:
+            from PIL import Image
+            with Image.open(BytesIO(data)) as img:
                 
                 if img.mode in ('RGBA', 'P'):
                     img = img.convert('RGB')
                 
                 
-                original_size = os.path.getsize(image_path) / 1024
-                
-                
-                if original_size <= self.max_size_kb:
-                    logger.info(f"Imagem já está dentro do tamanho máximo ({original_size:.2f}KB)")
-                    with open(image_path, 'rb') as f:
-                        return f.read()
-                
-                
                 reduction_factor = (self.max_size_kb / original_size) ** 0.5
                 
                 
@@ -68,10 +111,8 @@ class ImageCompressor:
                 return compressed_data
                 
         except Exception as e:
-            logger.error(f"Erro ao comprimir imagem {image_path}: {str(e)}")
-            
-            with open(image_path, 'rb') as f:
-                return f.read()
+            logger.error(f"Erro ao comprimir imagem {name}: {str(e)}")
+            return data
 
     def compress_image_to_file(self, input_path, output_path):
         """
@@ -0,0 +1,137 @@
+from collections import deque
+from typing import Dict, Iterable, List, Mapping, NamedTuple, Optional, Union
+from text_utils import fold
+
+# Keywords by intent, with weights; a trailing '*' also matches longer words ('adot*' -> 'adotar').
+# Shared by the web chat (app.py) and the Telegram bot.
+CHAT_INTENTS: Dict[str, Dict[str, float]] = {
+    'shelter': {
+        'shelter*': 2.0, 'abrigo*': 2.0, 'rescue*': 1.0, 'ong': 1.0, 'near me': 1.0, 'perto de mim': 1.0,
+    },
+    'adopt': {
+        'adopt*': 2.0, 'adot*': 2.0, 'adoca*': 2.0, 'adocoes': 2.0,
+    },
+    'dogs': {
+        'dog*': 2.0, 'puppy': 2.0, 'puppies': 2.0, 'cachorr*': 2.0, 'cao': 2.0, 'caes': 2.0, 'filhote de cachorro': 1.0,
+    },
+    'cats': {
+        'cat': 2.0, 'cats': 2.0, 'kitten*': 2.0, 'gato*': 2.0, 'gatinh*': 2.0, 'felin*': 1.0,
+    },
+    'care': {
+        'care': 1.0, 'cuidado*': 1.0, 'cuidar': 1.0, 'feed*': 2.0, 'food': 2.0, 'aliment*': 2.0, 'racao': 2.0,
+        'comida': 2.0, 'vaccin*': 2.0, 'vacin*': 2.0, 'adapt*': 2.0, 'new home': 2.0, 'nova casa': 2.0,
+        'grooming': 1.0, 'banho': 1.0, 'vet': 1.0, 'veterinari*': 1.0,
+    },
+    'greeting': {
+        'hi': 1.0, 'hello': 1.0, 'hey': 1.0, 'oi': 1.0, 'ola': 1.0, 'bom dia': 1.0, 'boa tarde': 1.0, 'boa noite': 1.0,
+    },
+}
+
+
+class IntentMatch(NamedTuple):
+    intent: str
+    score: float
+    keywords: List[str]
+
+
+class _Keyword(NamedTuple):
+    intent: str
+    phrase: str
+    weight: float
+    length: int
+    prefix: bool
+
+
+class IntentMatcher:
+    """Finds the intents of a message in one pass, whatever the number of keywords.
+
+    Every keyword of every intent is compiled into one Aho-Corasick
+    automaton over accent-folded, lowercased text. Matching walks the
+    message once, so its cost grows with the message length, not with the
+    number of intents or keywords. A match counts only at word boundaries:
+    'cat' does not fire inside 'vacation', while a keyword ending in '*'
+    also matches as the start of a longer word. Each intent scores the sum
+    of the weights of its distinct keywords found.
+    """
+
+    def __init__(self, intents: Mapping[str, Union[Mapping[str, float], Iterable[str]]] = CHAT_INTENTS):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]
+        self._keywords: List[_Keyword] = []
+        for intent, keywords in intents.items():
+            weighted = keywords.items() if isinstance(keywords, Mapping) else ((keyword, 1.0) for keyword in keywords)
+            for phrase, weight in weighted:
+                self._add(intent, phrase, weight)
+        self._link()
+
+    def _add(self, intent: str, phrase: str, weight: float) -> None:
+        prefix = phrase.endswith('*')
+        text = ' '.join(fold(phrase.rstrip('*')).split())
+        if not text:
+            return
+        state = 0
+        for ch in text:
+            following = self._goto[state].get(ch)
+            if following is None:
+                following = len(self._goto)
+                self._goto[state][ch] = following
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = following
+        self._out[state].append(len(self._keywords))
+        self._keywords.append(_Keyword(intent, phrase, weight, len(text), prefix))
+
+    def _link(self) -> None:
+        """Compute failure links breadth first, merging the outputs they lead to"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, following in self._goto[state].items():
+                queue.append(following)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                link = self._goto[fallback].get(ch, 0)
+                self._fail[following] = link if link != following else 0
+                self._out[following] = self._out[following] + self._out[self._fail[following]]
+
+    def match(self, text: str) -> List[IntentMatch]:
+        """Intents found in text, highest score first"""
+        folded = ' '.join(fold(text).split())
+        goto, fail, out, keywords = self._goto, self._fail, self._out, self._keywords
+        found = set()
+        state = 0
+        last = len(folded) - 1
+        for end, ch in enumerate(folded):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for index in out[state]:
+                keyword = keywords[index]
+                start = end - keyword.length + 1
+                if start > 0 and folded[start - 1].isalnum():
+                    continue
+                if not keyword.prefix and end < last and folded[end + 1].isalnum():
+                    continue
+                found.add(index)
+
+        scores: Dict[str, float] = {}
+        matched: Dict[str, List[str]] = {}
+        for index in sorted(found):
+            keyword = keywords[index]
+            scores[keyword.intent] = scores.get(keyword.intent, 0.0) + keyword.weight
+            matched.setdefault(keyword.intent, []).append(keyword.phrase)
+        return sorted(
+            (IntentMatch(intent, score, matched[intent]) for intent, score in scores.items()),
+            key=lambda match: match.score, reverse=True
+        )
+
+    def best(self, text: str, default: Optional[str] = None) -> Optional[str]:
+        """Highest scoring intent of text, or default when none matches"""
+        matches = self.match(text)
+        return matches[0].intent if matches else default
+
+    def __len__(self) -> int:
+        return len(self._keywords)
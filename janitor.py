@@ -0,0 +1,92 @@
+import os
+import glob
+import time
+import asyncio
+import logging
+from typing import Callable, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class Orphan(NamedTuple):
+    path: str
+    size: int
+
+
+def _normalize(path: str) -> str:
+    return os.path.normpath(os.path.abspath(path))
+
+
+class Janitor:
+    """Deletes files on disk that nothing refers to anymore.
+
+    Files matching the glob patterns and older than min_age_seconds are
+    candidates; in_use() returns every path that must be kept (database
+    rows, sessions in progress, catalogue photos). The directory scan runs
+    in a thread. Deletion happens batch_size files at a time with a pause
+    between batches, and in_use() is asked again right before each batch,
+    in the same event loop step as the deletes, so a file referenced after
+    the scan is never removed.
+    """
+
+    def __init__(self, patterns: Sequence[str], in_use: Callable[[], Iterable[str]],
+                 min_age_seconds: float, batch_size: int = 100, pause_seconds: float = 1.0):
+        self.patterns = list(patterns)
+        self.in_use = in_use
+        self.min_age_seconds = min_age_seconds
+        self.batch_size = batch_size
+        self.pause_seconds = pause_seconds
+
+    def find_candidates(self, now: Optional[float] = None) -> List[Orphan]:
+        """Files matching the patterns that were last modified before the age threshold"""
+        cutoff = (now if now is not None else time.time()) - self.min_age_seconds
+        candidates = {}
+        for pattern in self.patterns:
+            for path in glob.iglob(pattern, recursive=True):
+                try:
+                    stat = os.lstat(path)
+                except FileNotFoundError:
+                    continue
+                if os.path.isdir(path) or os.path.islink(path) or stat.st_mtime >= cutoff:
+                    continue
+                candidates[_normalize(path)] = stat.st_size
+        return [Orphan(path, size) for path, size in sorted(candidates.items())]
+
+    def delete_batch(self, batch: Iterable[Orphan]) -> Tuple[int, int]:
+        """Delete the files of a batch that are not in use; returns (files deleted, bytes freed)"""
+        keep = {_normalize(path) for path in self.in_use()}
+        deleted = freed = 0
+        for orphan in batch:
+            if orphan.path in keep:
+                continue
+            try:
+                os.remove(orphan.path)
+            except FileNotFoundError:
+                continue
+            except OSError as e:
+                logger.error(f"Error removing {orphan.path}: {str(e)}")
+                continue
+            deleted += 1
+            freed += orphan.size
+        return deleted, freed
+
+    async def run(self) -> Tuple[int, int]:
+        """Scan once and delete every orphan in paced batches; returns (files deleted, bytes freed)"""
+        candidates = await asyncio.to_thread(self.find_candidates)
+        total_deleted = total_freed = 0
+        for start in range(0, len(candidates), self.batch_size):
+            if start:
+                await asyncio.sleep(self.pause_seconds)
+            deleted, freed = self.delete_batch(candidates[start:start + self.batch_size])
+            total_deleted += deleted
+            total_freed += freed
+        if total_deleted:
+            logger.info(f"Janitor removed {total_deleted} orphaned files ({total_freed / 1024:.0f} KB reclaimed)")
+        return total_deleted, total_freed
+
+    async def job(self, context) -> None:
+        """Job queue callback"""
+        try:
+            await self.run()
+        except Exception as e:
+            logger.error(f"Error removing orphaned files: {str(e)}")
@@ -1,13 +1,18 @@
 import os
 import logging
 from dotenv import load_dotenv
-from telegram.ext import Application, CommandHandler, CallbackQueryHandler, MessageHandler, filters
-from database import PostgreSQLDatabase
+from startup import StartupTimer
+
+# Started before the bot module is imported, so the startup breakdown includes the imports
+startup = StartupTimer()
+
 from telegram_bot import (
-    start, button, handle_message, error_handler,
-    BOT_OWNER_ID, db_config, interview
+    build_application, run_application, close_components,
+    BOT_OWNER_ID
 )
 
+startup.mark('imports')
+
 
 logging.basicConfig(
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
@@ -31,27 +36,19 @@ def main():
         logger.info("Starting bot...")
         
         
-        db_manager = PostgreSQLDatabase(db_config)
-        
-        
-        application = Application.builder().token(token).build()
-
-        
-        application.add_handler(CommandHandler("start", start))
-        application.add_handler(CallbackQueryHandler(button))
-        application.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, handle_message))
-        application.add_handler(MessageHandler(filters.PHOTO, handle_message))
-        application.add_error_handler(error_handler)
+        # Interviews go to the bot's own database (data/pet_adoption.db),
+        # opened with the other components while the application is built
+        application = build_application(token, startup)
 
         
         logger.info("Bot is running...")
-        application.run_polling()
+        run_application(application)
     except Exception as e:
         logger.error(f"Error in main: {str(e)}")
         raise
     finally:
         
-        db_manager.close()
+        close_components()
 
 if __name__ == '__main__':
     main() 
\ No newline at end of file
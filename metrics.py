@@ -0,0 +1,302 @@
+import time
+import bisect
+import asyncio
+import logging
+import threading
+import functools
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds in seconds, from a cached lookup to a slow upload
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+LabelValues = Tuple[str, ...]
+# (metric name suffix, label values, extra label, value)
+Sample = Tuple[str, LabelValues, Optional[Tuple[str, str]], float]
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class _Metric:
+    kind = 'untyped'
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+
+    def samples(self) -> Iterator[Sample]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for suffix, values, extra, value in self.samples():
+            pairs = [f'{label}="{_escape(str(v))}"' for label, v in zip(self.labels, values)]
+            if extra is not None:
+                pairs.append(f'{extra[0]}="{extra[1]}"')
+            labels = '{' + ','.join(pairs) + '}' if pairs else ''
+            lines.append(f"{self.name}{suffix}{labels} {_format_value(value)}")
+        return lines
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        super().__init__(name, help, labels)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, *values: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[values] = self._values.get(values, 0.0) + amount
+
+    def value(self, *values: str) -> float:
+        return self._values.get(values, 0.0)
+
+    def samples(self) -> Iterator[Sample]:
+        with self._lock:
+            items = sorted(self._values.items())
+        for values, value in items:
+            yield '', values, None, value
+
+
+class Gauge(Counter):
+    """A value that goes up and down; with function, read from it at every scrape"""
+    kind = 'gauge'
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = (),
+                 function: Optional[Callable[[], float]] = None):
+        super().__init__(name, help, labels)
+        self.function = function
+
+    def dec(self, *values: str, amount: float = 1.0) -> None:
+        self.inc(*values, amount=-amount)
+
+    def set(self, value: float, *values: str) -> None:
+        with self._lock:
+            self._values[values] = value
+
+    def samples(self) -> Iterator[Sample]:
+        if self.function is not None:
+            try:
+                yield '', (), None, float(self.function())
+            except Exception as e:
+                logger.error(f"Error reading gauge {self.name}: {str(e)}")
+            return
+        yield from super().samples()
+
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [count per bucket (last one is +Inf), sum]
+        self._values: Dict[LabelValues, list] = {}
+
+    def observe(self, value: float, *values: str) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(values)
+            if state is None:
+                state = self._values[values] = [[0] * (len(self.buckets) + 1), 0.0]
+            state[0][index] += 1
+            state[1] += value
+
+    def count(self, *values: str) -> int:
+        state = self._values.get(values)
+        return sum(state[0]) if state else 0
+
+    def totals(self) -> Dict[LabelValues, Tuple[int, float]]:
+        """Observations and their sum, by label values"""
+        with self._lock:
+            return {values: (sum(counts), total) for values, (counts, total) in self._values.items()}
+
+    def samples(self) -> Iterator[Sample]:
+        with self._lock:
+            items = sorted((values, (list(counts), total)) for values, (counts, total) in self._values.items())
+        for values, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float('inf')), counts):
+                cumulative += count
+                yield '_bucket', values, ('le', _format_value(bound)), cumulative
+            yield '_sum', values, None, total
+            yield '_count', values, None, cumulative
+
+
+class _Timing:
+    __slots__ = ('metrics', 'key', 'started')
+
+    def __init__(self, metrics: 'OperationMetrics', name: str):
+        self.metrics = metrics
+        self.key = (name,)
+
+    def __enter__(self) -> None:
+        self.metrics._started(self.key)
+        self.started = time.perf_counter()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.metrics._finished(self.key, time.perf_counter() - self.started, exc_type is None)
+
+
+class OperationMetrics:
+    """Latency histogram, calls by outcome and calls in progress for one kind of operation.
+
+    Every operation of the kind is told apart by one label (the handler,
+    the Bot API method...). time() is a context manager, track() a
+    decorator for plain and async functions, and instrument() wraps
+    methods of an existing object in place.
+    """
+
+    def __init__(self, registry: 'Registry', prefix: str, label: str, what: str,
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.seconds = registry.histogram(f'{prefix}_duration_seconds', f"Time spent in {what}", (label,), buckets)
+        self.calls = registry.counter(f'{prefix}_total', f"Completed {what} by outcome", (label, 'outcome'))
+        self.in_progress = registry.gauge(f'{prefix}_in_progress', f"{what[:1].upper()}{what[1:]} running now", (label,))
+        # One lock for the three, so a call is recorded with two acquisitions instead of four
+        self._lock = self.seconds._lock = self.calls._lock = self.in_progress._lock = threading.Lock()
+
+    def _started(self, key: LabelValues) -> None:
+        in_progress = self.in_progress._values
+        with self._lock:
+            in_progress[key] = in_progress.get(key, 0.0) + 1
+
+    def _finished(self, key: LabelValues, elapsed: float, ok: bool) -> None:
+        seconds = self.seconds
+        index = bisect.bisect_left(seconds.buckets, elapsed)
+        outcome = key + ('ok' if ok else 'error',)
+        calls = self.calls._values
+        with self._lock:
+            state = seconds._values.get(key)
+            if state is None:
+                state = seconds._values[key] = [[0] * (len(seconds.buckets) + 1), 0.0]
+            state[0][index] += 1
+            state[1] += elapsed
+            calls[outcome] = calls.get(outcome, 0.0) + 1
+            self.in_progress._values[key] -= 1
+
+    def time(self, name: str) -> _Timing:
+        return _Timing(self, name)
+
+    def track(self, name: Optional[str] = None) -> Callable:
+        def decorator(func: Callable) -> Callable:
+            label = name or func.__name__
+            if asyncio.iscoroutinefunction(func):
+                @functools.wraps(func)
+                async def async_wrapper(*args, **kwargs):
+                    with _Timing(self, label):
+                        return await func(*args, **kwargs)
+                return async_wrapper
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with _Timing(self, label):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def instrument(self, obj, *method_names: str) -> None:
+        """Replace methods of obj with tracked versions, labelled by method name"""
+        for method_name in method_names:
+            setattr(obj, method_name, self.track(method_name)(getattr(obj, method_name)))
+
+
+class Registry:
+    """Metrics of one process, rendered in the Prometheus text exposition format"""
+
+    def __init__(self, namespace: str = ''):
+        self.namespace = namespace
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def _name(self, name: str) -> str:
+        return f"{self.namespace}_{name}" if self.namespace else name
+
+    def counter(self, name: str, help: str, labels: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(self._name(name), help, labels))
+
+    def gauge(self, name: str, help: str, labels: Sequence[str] = (),
+              function: Optional[Callable[[], float]] = None) -> Gauge:
+        return self._register(Gauge(self._name(name), help, labels, function))
+
+    def histogram(self, name: str, help: str, labels: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(self._name(name), help, labels, buckets))
+
+    def operations(self, prefix: str, label: str, what: str,
+                   buckets: Sequence[float] = DEFAULT_BUCKETS) -> OperationMetrics:
+        return OperationMetrics(self, prefix, label, what, buckets)
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(self._name(name))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+class MetricsServer:
+    """Serves a registry at /metrics over HTTP from a daemon thread"""
+
+    def __init__(self, registry: Registry, host: str = '127.0.0.1', port: int = 9108):
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    def start(self) -> 'MetricsServer':
+        registry = self.registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?', 1)[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                body = registry.render().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', CONTENT_TYPE)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                logger.debug(format % args)
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        threading.Thread(target=self._server.serve_forever, name='metrics', daemon=True).start()
+        logger.info(f"Serving metrics on http://{self.host}:{self.port}/metrics")
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
@@ -0,0 +1,79 @@
+import logging
+from datetime import datetime
+from typing import Any, Awaitable, Callable, List, NamedTuple, Optional, Tuple
+from telegram.error import Forbidden
+from database_interface import UserInfo
+
+logger = logging.getLogger(__name__)
+
+
+class DigestEntry(NamedTuple):
+    interview_id: int
+    user_info: UserInfo
+    animal_name: Optional[str]
+    completed_at: datetime
+    # Blob store paths, read back when the digest is rendered
+    photo_paths: List[str]
+
+
+# send(bot, entries) delivers one digest
+DigestSender = Callable[[Any, List[DigestEntry]], Awaitable[None]]
+
+
+class OwnerDigest:
+    """Batches completed interviews into one notification for the bot owner.
+
+    Interviews are queued with add() and delivered together by flush(),
+    which the job queue runs every few minutes and which is due as soon as
+    max_interviews are waiting. The number of Bot API calls then follows
+    time, not the number of interviews. Entries whose delivery fails are
+    kept for the next flush, up to max_attempts tries and max_pending
+    entries (oldest dropped first); a Forbidden error (bot blocked by the
+    owner) drops them at once, since retrying cannot help.
+    """
+
+    def __init__(self, send: DigestSender, max_interviews: int = 20,
+                 max_attempts: int = 5, max_pending: int = 500):
+        self.send = send
+        self.max_interviews = max_interviews
+        self.max_attempts = max_attempts
+        self.max_pending = max_pending
+        # (entry, failed deliveries so far)
+        self._pending: List[Tuple[DigestEntry, int]] = []
+
+    def add(self, entry: DigestEntry) -> bool:
+        """Queue an interview; returns True when the digest should be flushed now"""
+        self._pending.append((entry, 0))
+        return len(self._pending) >= self.max_interviews
+
+    async def flush(self, bot) -> int:
+        """Send everything queued as one digest; returns how many interviews were sent"""
+        if not self._pending:
+            return 0
+        queued, self._pending = self._pending, []
+        entries = [entry for entry, _ in queued]
+        try:
+            await self.send(bot, entries)
+        except Forbidden as e:
+            logger.error(f"Dropping owner digest with {len(entries)} interviews: {str(e)}")
+            return 0
+        except Exception as e:
+            logger.error(f"Error sending owner digest with {len(entries)} interviews: {str(e)}")
+            retry = [(entry, failures + 1) for entry, failures in queued if failures + 1 < self.max_attempts]
+            self._pending[:0] = retry
+            dropped = len(queued) - len(retry)
+            if len(self._pending) > self.max_pending:
+                dropped += len(self._pending) - self.max_pending
+                del self._pending[:len(self._pending) - self.max_pending]
+            if dropped:
+                logger.warning(f"Dropped {dropped} interviews from the owner digest after repeated failures")
+            return 0
+        logger.info(f"Sent owner digest with {len(entries)} interviews")
+        return len(entries)
+
+    async def job(self, context) -> None:
+        """Job queue callback"""
+        await self.flush(context.bot)
+
+    def __len__(self) -> int:
+        return len(self._pending)
@@ -0,0 +1,242 @@
+import os
+import asyncio
+import logging
+from io import BytesIO
+from datetime import datetime
+from functools import partial
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Dict, Hashable, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from reportlab.pdfgen.canvas import Canvas
+
+logger = logging.getLogger(__name__)
+
+
+# One section of a dossier:
+# (interview_id, user_id, user_info, answers, animal_label, created_at, photos as JPEG bytes)
+DossierSection = Tuple[
+    int, int, Dict[str, Optional[str]], Dict[str, str], Optional[str], Optional[datetime], List[bytes]
+]
+
+# Largest size a photo is drawn at on a dossier page
+PHOTO_BOX = (512, 650)
+
+
+def animal_label(animal) -> Optional[str]:
+    """Animal line printed on interview PDFs"""
+    return f"{animal.name} (ID: {animal.id})" if animal else None
+
+
+def _new_canvas(buffer: BytesIO) -> 'Canvas':
+    """Letter-size canvas writing to buffer; ReportLab is imported on first use, in the worker"""
+    from reportlab.pdfgen.canvas import Canvas
+    from reportlab.lib.pagesizes import letter
+    return Canvas(buffer, pagesize=letter)
+
+
+def _draw_interview(c: 'Canvas', title: str, user_id: int, user_info: Dict[str, Optional[str]],
+                    answers: Dict[str, str], animal_label: Optional[str], created_at: datetime) -> None:
+    """Draw one interview from the top of the current page, adding pages as needed"""
+    # Add title
+    c.setFont("Helvetica-Bold", 16)
+    c.drawString(50, 750, title)
+
+    # Add date
+    c.setFont("Helvetica", 12)
+    c.drawString(50, 720, f"Data: {created_at.strftime('%d/%m/%Y %H:%M')}")
+
+    # Add user info
+    c.drawString(50, 690, f"ID do Usuário: {user_id}")
+    if 'username' in user_info:
+        c.drawString(50, 670, f"Username: @{user_info['username']}")
+    if 'first_name' in user_info:
+        c.drawString(50, 650, f"Nome: {user_info['first_name']}")
+    if 'last_name' in user_info:
+        c.drawString(50, 630, f"Sobrenome: {user_info['last_name']}")
+
+    # Add animal info if selected
+    if animal_label:
+        c.drawString(50, 610, f"Animal: {animal_label}")
+
+    # Add questions and answers
+    y = 580
+    c.setFont("Helvetica-Bold", 12)
+    for question, answer in answers.items():
+        if y < 50:  # New page if we're running out of space
+            c.showPage()
+            y = 750
+            c.setFont("Helvetica-Bold", 12)
+
+        c.drawString(50, y, question)
+        y -= 20
+        c.setFont("Helvetica", 12)
+        c.drawString(50, y, f"Resposta: {answer}")
+        y -= 40
+        c.setFont("Helvetica-Bold", 12)
+
+
+def _draw_photo(c: 'Canvas', title: str, photo: bytes) -> None:
+    """Draw a photo on the current page, scaled down to fit PHOTO_BOX"""
+    from reportlab.lib.utils import ImageReader
+    image = ImageReader(BytesIO(photo))
+    width, height = image.getSize()
+    scale = min(PHOTO_BOX[0] / width, PHOTO_BOX[1] / height, 1)
+    c.setFont("Helvetica-Bold", 12)
+    c.drawString(50, 750, title)
+    c.drawImage(image, 50, 730 - height * scale, width * scale, height * scale)
+
+
+def render_interview_pdf(user_id: int, user_info: Dict[str, Optional[str]], answers: Dict[str, str],
+                         animal_label: Optional[str] = None, created_at: Optional[datetime] = None) -> bytes:
+    """Render an adoption interview to PDF bytes.
+
+    Module-level and free of shared state so it can run in a worker process.
+    """
+    buffer = BytesIO()
+    c = _new_canvas(buffer)
+    _draw_interview(
+        c, "Formulário de Entrevista para Adoção", user_id, user_info, answers,
+        animal_label, created_at or datetime.now()
+    )
+    c.save()
+    return buffer.getvalue()
+
+
+def render_dossier_chunk(sections: List[DossierSection]) -> bytes:
+    """Render consecutive dossier sections into one PDF, each starting on a new page.
+
+    All sections share a single canvas, so document and font setup is paid
+    once per chunk instead of once per interview.
+    """
+    buffer = BytesIO()
+    c = _new_canvas(buffer)
+    for interview_id, user_id, user_info, answers, animal_label, created_at, photos in sections:
+        _draw_interview(
+            c, f"Entrevista #{interview_id}", user_id, user_info, answers,
+            animal_label, created_at or datetime.now()
+        )
+        c.showPage()
+        for number, photo in enumerate(photos, 1):
+            try:
+                _draw_photo(c, f"Entrevista #{interview_id} - Foto {number}", photo)
+                c.showPage()
+            except Exception as e:
+                logger.error(f"Error drawing photo {number} of interview {interview_id}: {str(e)}")
+    c.save()
+    return buffer.getvalue()
+
+
+def render_dossier_cover(title: str, filters: List[str], count: int,
+                         generated_at: Optional[datetime] = None) -> bytes:
+    """Render the cover page of a dossier"""
+    buffer = BytesIO()
+    c = _new_canvas(buffer)
+    c.setFont("Helvetica-Bold", 20)
+    c.drawString(50, 720, title)
+    c.setFont("Helvetica", 12)
+    c.drawString(50, 690, f"Gerado em: {(generated_at or datetime.now()).strftime('%d/%m/%Y %H:%M')}")
+    c.drawString(50, 670, f"Entrevistas: {count}")
+    y = 640
+    for line in filters:
+        c.drawString(50, y, line)
+        y -= 20
+    c.save()
+    return buffer.getvalue()
+
+
+class PDFRenderer:
+    """Runs PDF rendering in a worker pool behind an async API.
+
+    ReportLab is CPU-bound pure Python, so the default process pool keeps
+    rendering off both the event loop and the GIL. The pool is created on
+    first use.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, use_processes: bool = True):
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self.use_processes = use_processes
+        self._executor: Optional[Executor] = None
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            if self.use_processes:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='pdf')
+            logger.info(
+                f"Started PDF {'process' if self.use_processes else 'thread'} pool "
+                f"with {self.max_workers} workers"
+            )
+        return self._executor
+
+    async def run(self, func, *args, **kwargs):
+        """Run a picklable rendering function in the pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, partial(func, *args, **kwargs))
+
+    async def render_interview(self, user_id: int, user_info: Dict[str, Optional[str]],
+                               answers: Dict[str, str], animal_label: Optional[str] = None,
+                               created_at: Optional[datetime] = None) -> bytes:
+        """Render an interview PDF without blocking the event loop"""
+        try:
+            return await self.run(
+                render_interview_pdf, user_id, dict(user_info), dict(answers), animal_label, created_at
+            )
+        except Exception as e:
+            logger.error(f"Error generating PDF: {str(e)}")
+            raise
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+class PDFCache:
+    """LRU cache of rendered PDFs, bounded by their total size in bytes.
+
+    Least recently used PDFs are evicted once max_bytes is exceeded; a PDF
+    larger than max_bytes on its own is never cached.
+    """
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: 'OrderedDict[Hashable, bytes]' = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        pdf = self._entries.get(key)
+        if pdf is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return pdf
+
+    def put(self, key: Hashable, pdf: bytes) -> None:
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.size -= len(old)
+        if len(pdf) > self.max_bytes:
+            return
+        self._entries[key] = pdf
+        self.size += len(pdf)
+        while self.size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.size -= len(evicted)
+
+    def discard(self, key: Hashable) -> None:
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.size -= len(old)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
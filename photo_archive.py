@@ -0,0 +1,137 @@
+import os
+import json
+import mmap
+import struct
+import logging
+import tempfile
+import threading
+from typing import Callable, Dict, Iterable, NamedTuple, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Pack layout: renditions back to back, then the JSON index, then the trailer
+# (index offset, index length, magic)
+_TRAILER = struct.Struct('<QQ8s')
+_MAGIC = b'PETPACK1'
+
+
+class ArchiveEntry(NamedTuple):
+    offset: int
+    length: int
+    # Source file the rendition was made from, to notice when it changes
+    source_mtime_ns: int
+    source_size: int
+
+
+class PhotoArchive:
+    """Precompressed catalogue photos packed into one memory-mapped file.
+
+    get() returns a memoryview into the mapping, so serving a photo opens,
+    stats and copies nothing and repeated listings read from the page cache.
+    sync() makes the pack match a set of source photos: renditions whose
+    source is unchanged are copied over from the current pack, only new or
+    modified photos go through compress, and the new pack replaces the old
+    one atomically. Views handed out before a sync stay valid, since the
+    old mapping lives until they are released.
+    """
+
+    def __init__(self, path: str, compress: Callable[[str], bytes], base_dir: Optional[str] = None):
+        self.path = path
+        self.compress = compress
+        self.base_dir = base_dir or os.path.dirname(os.path.abspath(path))
+        # Catalogue version the pack was last synced against (set by sync)
+        self.version: Optional[int] = None
+        self._lock = threading.Lock()
+        self._state: Tuple[Optional[mmap.mmap], Dict[str, ArchiveEntry]] = (None, {})
+        self._load()
+
+    def _key(self, photo_path: str) -> str:
+        return os.path.relpath(os.path.abspath(photo_path), self.base_dir)
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, 'rb') as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (FileNotFoundError, ValueError):
+            return
+        try:
+            index_offset, index_length, magic = _TRAILER.unpack_from(mapped, len(mapped) - _TRAILER.size)
+            if magic != _MAGIC:
+                raise ValueError("bad magic")
+            raw = json.loads(mapped[index_offset:index_offset + index_length])
+            index = {key: ArchiveEntry(*value) for key, value in raw.items()}
+        except Exception as e:
+            logger.error(f"Ignoring unreadable photo archive {self.path}: {str(e)}")
+            mapped.close()
+            return
+        self._state = (mapped, index)
+
+    def get(self, photo_path: str) -> Optional[memoryview]:
+        """Rendition of a photo, or None if it is not in the archive"""
+        mapped, index = self._state
+        entry = index.get(self._key(photo_path))
+        if entry is None:
+            return None
+        return memoryview(mapped)[entry.offset:entry.offset + entry.length]
+
+    def __contains__(self, photo_path: str) -> bool:
+        return self._key(photo_path) in self._state[1]
+
+    def __len__(self) -> int:
+        return len(self._state[1])
+
+    def sync(self, photo_paths: Iterable[str], version: Optional[int] = None) -> int:
+        """Make the archive hold exactly these photos; returns how many were compressed"""
+        with self._lock:
+            mapped, index = self._state
+            renditions = []
+            compressed = 0
+            changed = False
+            for photo_path in photo_paths:
+                key = self._key(photo_path)
+                try:
+                    stat = os.stat(photo_path)
+                except FileNotFoundError:
+                    logger.warning(f"Catalogue photo {photo_path} not found")
+                    continue
+                entry = index.get(key)
+                if entry is not None and (entry.source_mtime_ns, entry.source_size) == (stat.st_mtime_ns, stat.st_size):
+                    data = memoryview(mapped)[entry.offset:entry.offset + entry.length]
+                else:
+                    try:
+                        data = self.compress(photo_path)
+                    except Exception as e:
+                        logger.error(f"Error compressing {photo_path}: {str(e)}")
+                        continue
+                    compressed += 1
+                    changed = True
+                renditions.append((key, data, stat))
+
+            if changed or len(renditions) != len(index):
+                self._write(renditions)
+                self._load()
+                logger.info(f"Photo archive rebuilt with {len(renditions)} photos ({compressed} compressed)")
+            self.version = version
+            return compressed
+
+    def _write(self, renditions) -> None:
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                index = {}
+                offset = 0
+                for key, data, stat in renditions:
+                    f.write(data)
+                    index[key] = ArchiveEntry(offset, len(data), stat.st_mtime_ns, stat.st_size)
+                    offset += len(data)
+                raw = json.dumps({key: list(entry) for key, entry in index.items()}).encode('utf-8')
+                f.write(raw)
+                f.write(_TRAILER.pack(offset, len(raw), _MAGIC))
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.error(f"Error writing photo archive {self.path}: {str(e)}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
@@ -0,0 +1,177 @@
+import os
+import sys
+import time
+import pstats
+import asyncio
+import cProfile
+import logging
+import threading
+from io import StringIO
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def _frame_label(code, cache: Dict[object, str]) -> str:
+    """'function (file:line)' with the path relative to the project, or to site-packages"""
+    label = cache.get(code)
+    if label is None:
+        filename = code.co_filename
+        if filename.startswith(BASE_DIR):
+            filename = os.path.relpath(filename, BASE_DIR)
+        else:
+            filename = '/'.join(filename.replace('\\', '/').split('/')[-2:])
+        label = cache[code] = f"{code.co_name} ({filename}:{code.co_firstlineno})".replace(';', ',')
+    return label
+
+
+class SampleProfile:
+    """Stacks seen by a SamplingProfiler, with how often each was seen"""
+
+    def __init__(self, stacks: Counter, samples: int, duration: float, sampling_seconds: float, interval: float):
+        self.stacks = stacks
+        self.samples = samples
+        self.duration = duration
+        # Time spent taking samples, during which the sampled threads could not run
+        self.sampling_seconds = sampling_seconds
+        # Mean time between samples, after backing off to stay within the overhead budget
+        self.interval = interval
+
+    @property
+    def overhead(self) -> float:
+        return self.sampling_seconds / self.duration if self.duration else 0.0
+
+    def collapsed(self) -> str:
+        """One 'thread;outer;...;inner count' line per stack, as read by flamegraph.pl and speedscope"""
+        return ''.join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+    def summary(self, top: int = 25) -> str:
+        """Functions by samples in which they were running (self) and on the stack (total)"""
+        own = Counter()
+        total = Counter()
+        threads = Counter()
+        for stack, count in self.stacks.items():
+            frames = stack.split(';')
+            threads[frames[0]] += count
+            if len(frames) > 1:
+                own[frames[-1]] += count
+            for frame in set(frames[1:]):
+                total[frame] += count
+        thread_samples = sum(threads.values()) or 1
+
+        lines = [
+            f"Sampling profile: {self.duration:.1f} s, {self.samples} samples "
+            f"every {self.interval * 1000:.1f} ms, overhead {self.overhead:.2%}",
+            "",
+            "Threads:",
+        ]
+        lines += [f"  {count / thread_samples:7.1%}  {name}" for name, count in threads.most_common()]
+        for title, counter in (("Self", own), ("Total", total)):
+            lines += ["", f"Top {top} functions by {title.lower()} samples:"]
+            lines += [f"  {count / thread_samples:7.1%}  {count:7d}  {label}" for label, count in counter.most_common(top)]
+        return '\n'.join(lines) + '\n'
+
+
+class SamplingProfiler:
+    """Statistical profiler for a live process: every thread's stack, sampled from a thread of its own.
+
+    Each sample holds the GIL while it walks the stacks, so the other threads
+    are paused for its duration. The interval between samples grows when
+    that pause would exceed max_overhead of the wall time. Code running in
+    other processes (the PDF rendering pool) is not seen.
+    """
+
+    def __init__(self, interval: float = 0.005, max_overhead: float = 0.02):
+        self.interval = interval
+        self.max_overhead = max_overhead
+
+    def run(self, seconds: float, stop: Optional[threading.Event] = None) -> SampleProfile:
+        """Sample for seconds (or until stop is set) from the calling thread"""
+        stop = stop or threading.Event()
+        own = threading.get_ident()
+        labels: Dict[object, str] = {}
+        stacks = Counter()
+        samples = 0
+        sampling = 0.0
+        started = time.perf_counter()
+        deadline = started + seconds
+        while True:
+            sample_started = time.perf_counter()
+            if sample_started >= deadline:
+                break
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                frames = []
+                while frame is not None:
+                    frames.append(_frame_label(frame.f_code, labels))
+                    frame = frame.f_back
+                frames.append(names.get(ident, str(ident)))
+                stacks[';'.join(reversed(frames))] += 1
+            samples += 1
+            cost = time.perf_counter() - sample_started
+            sampling += cost
+            # Sleep long enough that cost / (cost + sleep) stays within the budget
+            pause = max(self.interval, cost * (1 / self.max_overhead - 1))
+            if stop.wait(min(pause, max(0.0, deadline - time.perf_counter()))):
+                break
+        duration = time.perf_counter() - started
+        return SampleProfile(stacks, samples, duration, sampling, duration / samples if samples else 0.0)
+
+
+async def profile_event_loop(seconds: float) -> pstats.Stats:
+    """cProfile the thread running the event loop for seconds: every call of every task and callback.
+
+    Deterministic, so it sees each call but slows the loop down noticeably;
+    threads (to_thread work, the job queue) are not included.
+    """
+    profile = cProfile.Profile()
+    profile.enable()
+    try:
+        await asyncio.sleep(seconds)
+    finally:
+        profile.disable()
+    return pstats.Stats(profile)
+
+
+def cprofile_summary(stats: pstats.Stats, seconds: float, top: int = 25) -> str:
+    output = StringIO()
+    stats.stream = output
+    output.write(f"cProfile of the event loop thread: {seconds:.1f} s, {stats.total_calls} calls\n")
+    for key in ('tottime', 'cumulative'):
+        stats.sort_stats(key).print_stats(top)
+    return output.getvalue()
+
+
+def save_profile(directory: str, stem: str, summary: str,
+                 collapsed: Optional[str] = None, stats: Optional[pstats.Stats] = None) -> List[str]:
+    """Write the summary (.txt) and the collapsed stacks (.collapsed) or cProfile data (.prof); returns the paths"""
+    os.makedirs(directory, exist_ok=True)
+    base = os.path.join(directory, stem)
+    paths = [f"{base}.txt"]
+    with open(paths[0], 'w', encoding='utf-8') as f:
+        f.write(summary)
+    if collapsed is not None:
+        paths.append(f"{base}.collapsed")
+        with open(paths[-1], 'w', encoding='utf-8') as f:
+            f.write(collapsed)
+    if stats is not None:
+        paths.append(f"{base}.prof")
+        stats.dump_stats(paths[-1])
+    return paths
+
+
+def sample_to_files(profiler: SamplingProfiler, seconds: float, directory: str, stem: str,
+                    top: int = 25) -> Tuple[List[str], SampleProfile]:
+    """Run a sampling session and save its summary and collapsed stacks"""
+    profile = profiler.run(seconds)
+    paths = save_profile(directory, stem, profile.summary(top), collapsed=profile.collapsed())
+    logger.info(
+        f"Profiled {profile.duration:.1f} s ({profile.samples} samples, overhead {profile.overhead:.2%}): "
+        f"{', '.join(paths)}"
+    )
+    return paths, profile
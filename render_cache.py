@@ -0,0 +1,95 @@
+import os
+import logging
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+from telegram import InlineKeyboardMarkup
+from animal import Animal
+
+logger = logging.getLogger(__name__)
+
+CAPTION_EMOJI = {
+    'dogs': '🐶',
+    'cats': '🐱',
+    'others': '🐾',
+}
+
+
+class AnimalPayload(NamedTuple):
+    """Prebuilt messages for one animal in a listing"""
+    animal_id: int
+    caption: str
+    photos: Tuple[str, ...]
+    card: str
+    reply_markup: Optional[InlineKeyboardMarkup]
+
+
+class RenderCache:
+    """Caches rendered cards, captions and keyboards per animal.
+
+    Entries are keyed by (animal_type, animal_id) and tagged with the
+    manager's version counter for that animal, so a mutation through
+    update_animal, add_photo or update_adoption_status invalidates them.
+    Whole listings are cached against the manager's catalogue version.
+    """
+
+    def __init__(self, animal_manager, base_dir: str,
+                 keyboard_factory: Callable[[str, Animal], Optional[InlineKeyboardMarkup]]):
+        self.animal_manager = animal_manager
+        self.base_dir = base_dir
+        self.keyboard_factory = keyboard_factory
+        self._payloads: Dict[Tuple[str, int], Tuple[int, AnimalPayload]] = {}
+        self._listings: Dict[str, Tuple[int, List[AnimalPayload]]] = {}
+
+    def build_caption(self, animal_type: str, animal: Animal) -> str:
+        """Caption sent with each photo of an animal"""
+        emoji = CAPTION_EMOJI.get(animal_type, '🐾')
+        return (
+            f"{emoji} {animal.name} - {animal.breed}\n"
+            f"Idade: {animal.age} anos\n"
+            f"Gênero: {animal.gender}\n"
+            f"Porte: {animal.size}"
+        )
+
+    def _build_payload(self, animal_type: str, animal: Animal) -> AnimalPayload:
+        photos = []
+        for photo_path in animal.photos:
+            abs_path = os.path.join(self.base_dir, photo_path)
+            if os.path.exists(abs_path):
+                photos.append(abs_path)
+            else:
+                logger.warning(f"Photo {abs_path} of {animal.name} not found")
+        return AnimalPayload(
+            animal_id=animal.id,
+            caption=self.build_caption(animal_type, animal),
+            photos=tuple(photos),
+            card=self.animal_manager.generate_animal_card(animal),
+            reply_markup=self.keyboard_factory(animal_type, animal),
+        )
+
+    def get_payload(self, animal_type: str, animal: Animal) -> AnimalPayload:
+        """Get the prebuilt payload of an animal, rendering it if it changed"""
+        key = (animal_type, animal.id)
+        version = self.animal_manager.get_version(animal_type, animal.id)
+        cached = self._payloads.get(key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        payload = self._build_payload(animal_type, animal)
+        self._payloads[key] = (version, payload)
+        return payload
+
+    def get_listing(self, animal_type: str) -> List[AnimalPayload]:
+        """Get the payloads of all available animals of a type"""
+        version = self.animal_manager.catalogue_version
+        cached = self._listings.get(animal_type)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        listing = [
+            self.get_payload(animal_type, animal)
+            for animal in self.animal_manager.get_available_animals(animal_type)
+        ]
+        self._listings[animal_type] = (version, listing)
+        return listing
+
+    def clear(self) -> None:
+        """Drop every cached payload"""
+        self._payloads.clear()
+        self._listings.clear()
@@ -0,0 +1,59 @@
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable, NamedTuple, Optional
+
+
+class CachedResponse(NamedTuple):
+    body: bytes
+    etag: str
+    status: int
+
+
+def make_response(payload: Any, status: int = 200) -> CachedResponse:
+    """Serialize a JSON payload once and tag it with a hash of its bytes"""
+    body = json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return CachedResponse(body, hashlib.blake2b(body, digest_size=12).hexdigest(), status)
+
+
+class ResponseCache:
+    """In-process LRU of serialized responses.
+
+    Keys are built by the caller from the normalized request (and any data
+    version the response depends on). Each process of a multi-worker
+    server keeps its own cache. max_entries=0 disables caching.
+    """
+
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries: 'OrderedDict[Hashable, CachedResponse]' = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[CachedResponse]:
+        with self._lock:
+            response = self._entries.get(key)
+            if response is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return response
+
+    def put(self, key: Hashable, response: CachedResponse) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = response
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,148 @@
+import json
+import math
+import logging
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+import numpy as np
+from text_utils import fold
+
+logger = logging.getLogger(__name__)
+
+EARTH_RADIUS_KM = 6371.0088
+# Half the circumference: no two points are farther apart
+MAX_DISTANCE_KM = math.pi * EARTH_RADIUS_KM
+
+
+class Shelter(NamedTuple):
+    name: str
+    address: str
+    city: str
+    lat: float
+    lon: float
+    phone: Optional[str] = None
+
+
+def haversine_km(lat: float, lon: float, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+    """Great-circle distances in km from one point to arrays of points, all in degrees"""
+    lat1, lon1 = math.radians(lat), math.radians(lon)
+    lat2, lon2 = np.radians(lats), np.radians(lons)
+    a = np.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+class ShelterIndex:
+    """Shelters bucketed in a lat/lon grid for nearest and radius queries.
+
+    Shelters are sorted by grid cell (cell_degrees on each side), and each
+    occupied cell keeps the range of its shelters in that order. A radius
+    query only looks at the cells overlapping the circle's bounding box
+    and ranks those shelters with vectorized haversine distances. nearest()
+    grows the radius until it holds k shelters, which makes it exact.
+    """
+
+    def __init__(self, shelters: Sequence[Shelter], cell_degrees: float = 1.0):
+        self.shelters = list(shelters)
+        self.cell_degrees = cell_degrees
+        self._rows = int(math.ceil(180 / cell_degrees)) + 1
+        self._cols = int(math.ceil(360 / cell_degrees))
+        lats = np.array([shelter.lat for shelter in self.shelters], dtype=np.float64)
+        lons = np.array([shelter.lon for shelter in self.shelters], dtype=np.float64)
+        keys = self._cell(lats, lons)
+        order = np.argsort(keys, kind='stable')
+        self._order = order
+        self._lats = lats[order]
+        self._lons = lons[order]
+        unique, starts, counts = np.unique(keys[order], return_index=True, return_counts=True)
+        self._cells: Dict[int, Tuple[int, int]] = {
+            int(key): (int(start), int(start + count)) for key, start, count in zip(unique, starts, counts)
+        }
+        self._by_city: Dict[str, List[int]] = {}
+        for position, shelter in enumerate(self.shelters):
+            self._by_city.setdefault(fold(shelter.city).strip(), []).append(position)
+
+    @classmethod
+    def load(cls, path: str, cell_degrees: float = 1.0) -> 'ShelterIndex':
+        """Build the index from a JSON list of shelters"""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                shelters = [Shelter(**entry) for entry in json.load(f)]
+        except FileNotFoundError:
+            logger.warning(f"Shelter registry {path} not found")
+            shelters = []
+        logger.info(f"Shelter index built with {len(shelters)} shelters")
+        return cls(shelters, cell_degrees)
+
+    def _cell(self, lats, lons):
+        rows = np.floor((np.asarray(lats) + 90) / self.cell_degrees).astype(np.int64)
+        cols = np.floor((np.asarray(lons) + 180) / self.cell_degrees).astype(np.int64) % self._cols
+        return rows * self._cols + cols
+
+    def _candidates(self, lat: float, lon: float, radius_km: float) -> np.ndarray:
+        """Positions (in cell order) of the shelters in cells overlapping the circle's bounding box"""
+        if not (math.isfinite(lat) and math.isfinite(lon) and math.isfinite(radius_km)) \
+                or not -90 <= lat <= 90 or radius_km < 0:
+            return np.empty(0, dtype=np.int64)
+        lat_delta = math.degrees(radius_km / EARTH_RADIUS_KM)
+        low, high = lat - lat_delta, lat + lat_delta
+        cos_lat = math.cos(math.radians(max(abs(low), abs(high))))
+        if low <= -90 or high >= 90 or cos_lat <= 0 or radius_km >= MAX_DISTANCE_KM / 2:
+            return np.arange(len(self.shelters))
+        lon_delta = math.degrees(radius_km / (EARTH_RADIUS_KM * cos_lat))
+        row_range = range(int((low + 90) // self.cell_degrees), int((high + 90) // self.cell_degrees) + 1)
+        if 2 * lon_delta >= 360:
+            col_range = range(self._cols)
+        else:
+            first = int((lon - lon_delta + 180) // self.cell_degrees)
+            last = int((lon + lon_delta + 180) // self.cell_degrees)
+            col_range = [col % self._cols for col in range(first, min(last, first + self._cols - 1) + 1)]
+        ranges = [
+            self._cells[row * self._cols + col]
+            for row in row_range for col in col_range
+            if row * self._cols + col in self._cells
+        ]
+        if not ranges:
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate([np.arange(start, end) for start, end in ranges])
+
+    def within(self, lat: float, lon: float, radius_km: float,
+               limit: Optional[int] = None) -> List[Tuple[Shelter, float]]:
+        """Shelters within radius_km of a point, nearest first, with their distances"""
+        positions = self._candidates(lat, lon, radius_km)
+        if not len(positions):
+            return []
+        distances = haversine_km(lat, lon, self._lats[positions], self._lons[positions])
+        inside = distances <= radius_km
+        positions, distances = positions[inside], distances[inside]
+        if limit is not None and limit < len(distances):
+            nearest = np.argpartition(distances, limit - 1)[:limit]
+            positions, distances = positions[nearest], distances[nearest]
+        ranking = np.argsort(distances, kind='stable')
+        return [
+            (self.shelters[self._order[position]], float(distance))
+            for position, distance in zip(positions[ranking], distances[ranking])
+        ]
+
+    def nearest(self, lat: float, lon: float, k: int = 3,
+                start_radius_km: Optional[float] = None) -> List[Tuple[Shelter, float]]:
+        """The k shelters closest to a point, nearest first, with their distances"""
+        if not self.shelters or k <= 0:
+            return []
+        k = min(k, len(self.shelters))
+        radius = start_radius_km or self.cell_degrees * 111.0
+        while True:
+            found = self.within(lat, lon, radius, limit=k)
+            if len(found) >= k or radius >= MAX_DISTANCE_KM:
+                return found
+            radius = min(radius * 2, MAX_DISTANCE_KM)
+
+    def city_center(self, city: str) -> Optional[Tuple[float, float]]:
+        """Mean position of the shelters of a city, for queries by city name"""
+        positions = self._by_city.get(fold(city).strip())
+        if not positions:
+            return None
+        return (
+            float(np.mean([self.shelters[position].lat for position in positions])),
+            float(np.mean([self.shelters[position].lon for position in positions]))
+        )
+
+    def __len__(self) -> int:
+        return len(self.shelters)
@@ -0,0 +1,257 @@
+import json
+import os
+import sqlite3
+import logging
+from animal import Animal, AdoptionStatus
+from animal_manager import AnimalManager
+
+logger = logging.getLogger(__name__)
+
+# Top-level fields that live in their own columns; anything else is kept in `extra`
+COLUMNS = ('name', 'breed', 'age', 'gender', 'size', 'history', 'adoption_status')
+JSON_COLUMNS = ('health', 'behavior', 'photos')
+VALID_STATUSES = [status.value for status in AdoptionStatus]
+
+
+class SQLiteAnimalManager(AnimalManager):
+    """AnimalManager backend that keeps the catalogue in SQLite instead of memory.
+
+    Rows are decoded on demand, so memory use does not grow with the size of
+    the catalogue. The public methods mirror AnimalManager.
+    """
+
+    def __init__(self, db_path, json_file=None):
+        self.data_file = db_path
+        self.conn = None
+        self._versions = {}
+        self.catalogue_version = 0
+        self.connect()
+        if json_file and self.count_animals() == 0:
+            self.migrate_from_json(json_file)
+
+    def connect(self):
+        """Open the SQLite database and create the schema"""
+        try:
+            os.makedirs(os.path.dirname(self.data_file) or '.', exist_ok=True)
+            self.conn = sqlite3.connect(self.data_file, check_same_thread=False)
+            self.conn.row_factory = sqlite3.Row
+            self._create_tables()
+        except Exception as e:
+            logger.error(f"Error connecting to animal database: {str(e)}")
+            raise
+
+    def _create_tables(self):
+        """Create animals table and indexes if they don't exist"""
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS animals (
+                animal_type TEXT NOT NULL,
+                id INTEGER NOT NULL,
+                name TEXT,
+                breed TEXT,
+                age INTEGER,
+                gender TEXT,
+                size TEXT,
+                history TEXT,
+                adoption_status TEXT NOT NULL DEFAULT 'Disponível',
+                health TEXT NOT NULL DEFAULT '{}',
+                behavior TEXT NOT NULL DEFAULT '{}',
+                photos TEXT NOT NULL DEFAULT '[]',
+                extra TEXT NOT NULL DEFAULT '{}',
+                PRIMARY KEY (animal_type, id)
+            );
+            CREATE INDEX IF NOT EXISTS idx_animals_type_status ON animals (animal_type, adoption_status);
+            CREATE INDEX IF NOT EXISTS idx_animals_age ON animals (animal_type, age);
+            CREATE INDEX IF NOT EXISTS idx_animals_size ON animals (animal_type, size);
+            CREATE INDEX IF NOT EXISTS idx_animals_gender ON animals (animal_type, gender);
+        """)
+        self.conn.commit()
+
+    def _row_to_animal(self, row):
+        """Rebuild the animal record from a row, in the same key order as animals.json"""
+        animal = {'id': row['id']}
+        for column in ('name', 'breed', 'age', 'gender', 'size'):
+            animal[column] = row[column]
+        animal.update(json.loads(row['extra']))
+        animal['health'] = json.loads(row['health'])
+        animal['behavior'] = json.loads(row['behavior'])
+        animal['history'] = row['history']
+        animal['adoption_status'] = row['adoption_status']
+        animal['photos'] = json.loads(row['photos'])
+        return Animal.from_dict(animal)
+
+    def _animal_to_row(self, animal_type, animal):
+        """Split an animal dict into column values"""
+        known = {'id', *COLUMNS, *JSON_COLUMNS}
+        extra = {key: value for key, value in animal.items() if key not in known}
+        return (
+            animal_type, animal['id'],
+            *(animal.get(column) for column in COLUMNS),
+            json.dumps(animal.get('health', {}), ensure_ascii=False),
+            json.dumps(animal.get('behavior', {}), ensure_ascii=False),
+            json.dumps(animal.get('photos', []), ensure_ascii=False),
+            json.dumps(extra, ensure_ascii=False),
+        )
+
+    def _write_animal(self, animal_type, animal):
+        self.conn.execute("""
+            INSERT OR REPLACE INTO animals
+            (animal_type, id, name, breed, age, gender, size, history, adoption_status,
+             health, behavior, photos, extra)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, self._animal_to_row(animal_type, animal))
+
+    def _check_type(self, animal_type):
+        if animal_type not in ('dogs', 'cats', 'others'):
+            raise ValueError(f"Invalid animal type: {animal_type}")
+
+    def count_animals(self, animal_type=None):
+        """Count animals, optionally of a single type"""
+        if animal_type is None:
+            return self.conn.execute("SELECT COUNT(*) FROM animals").fetchone()[0]
+        return self.conn.execute(
+            "SELECT COUNT(*) FROM animals WHERE animal_type = ?", (animal_type,)
+        ).fetchone()[0]
+
+    def migrate_from_json(self, json_file):
+        """Import every animal from an animals.json file in a single transaction"""
+        try:
+            with open(json_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            with self.conn:
+                for animal_type, animals in data.items():
+                    for animal in animals:
+                        self._write_animal(animal_type, animal)
+            total = sum(len(animals) for animals in data.values())
+            logger.info(f"Migrated {total} animals from {json_file}")
+            return total
+        except Exception as e:
+            logger.error(f"Error migrating animals from {json_file}: {str(e)}")
+            raise
+
+    def add_animal(self, animal_type, animal_data):
+        """Add a new animal to the database"""
+        self._check_type(animal_type)
+        with self.conn:
+            new_id = self.conn.execute(
+                "SELECT COALESCE(MAX(id), 0) + 1 FROM animals WHERE animal_type = ?",
+                (animal_type,)
+            ).fetchone()[0]
+            animal_data['id'] = new_id
+            animal_data['adoption_status'] = AdoptionStatus.AVAILABLE.value
+            animal_data['photos'] = []
+            self._write_animal(animal_type, animal_data)
+        self._bump_version(animal_type, new_id)
+        return new_id
+
+    def update_animal(self, animal_type, animal_id, updates):
+        """Update animal information"""
+        with self.conn:
+            animal = self.get_animal(animal_type, animal_id)
+            if animal is None:
+                return False
+            animal.update(updates)
+            self._write_animal(animal_type, animal.to_dict())
+        self._bump_version(animal_type, animal_id)
+        return True
+
+    def get_animal(self, animal_type, animal_id):
+        """Get animal information by ID"""
+        row = self.conn.execute(
+            "SELECT * FROM animals WHERE animal_type = ? AND id = ?",
+            (animal_type, animal_id)
+        ).fetchone()
+        return self._row_to_animal(row) if row else None
+
+    def iter_animals(self, animal_type, where="", params=()):
+        """Yield animals of a type one row at a time"""
+        cursor = self.conn.execute(
+            f"SELECT * FROM animals WHERE animal_type = ? {where} ORDER BY id",
+            (animal_type, *params)
+        )
+        for row in cursor:
+            yield self._row_to_animal(row)
+
+    def get_available_animals(self, animal_type):
+        """Get list of available animals of a specific type"""
+        return list(self.iter_animals(
+            animal_type, "AND adoption_status = ?", (AdoptionStatus.AVAILABLE.value,)
+        ))
+
+    def add_photo(self, animal_type, animal_id, photo_path):
+        """Add photo path to animal's photo list"""
+        try:
+            if os.path.isabs(photo_path):
+                photo_path = os.path.relpath(photo_path, os.path.dirname(self.data_file))
+            with self.conn:
+                cursor = self.conn.execute("""
+                    UPDATE animals SET photos = json_insert(photos, '$[#]', ?)
+                    WHERE animal_type = ? AND id = ?
+                """, (photo_path, animal_type, animal_id))
+            if cursor.rowcount == 0:
+                return False
+            self._bump_version(animal_type, animal_id)
+            return True
+        except Exception as e:
+            logger.error(f"Error adding photo: {str(e)}")
+            return False
+
+    def update_adoption_status(self, animal_type, animal_id, status):
+        """Update animal's adoption status"""
+        if status not in VALID_STATUSES:
+            raise ValueError(f"Invalid status. Must be one of: {VALID_STATUSES}")
+
+        with self.conn:
+            cursor = self.conn.execute(
+                "UPDATE animals SET adoption_status = ? WHERE animal_type = ? AND id = ?",
+                (status, animal_type, animal_id)
+            )
+        if cursor.rowcount == 0:
+            return False
+        self._bump_version(animal_type, animal_id)
+        return True
+
+    def search_animals(self, animal_type, criteria):
+        """Search animals based on criteria"""
+        clauses = []
+        params = []
+        for key, value in criteria.items():
+            if key in ('health', 'behavior') and isinstance(value, dict):
+                # Nested keys missing from an animal do not exclude it, as in AnimalManager
+                for subkey, subvalue in value.items():
+                    path = f'$.{subkey}'
+                    clauses.append(f"(json_type({key}, ?) IS NULL OR json_extract({key}, ?) = ?)")
+                    params.extend([path, path, subvalue])
+            elif key == 'id' or key in COLUMNS:
+                clauses.append(f"{key} = ?")
+                params.append(value)
+            else:
+                path = f'$.{key}'
+                clauses.append("(json_type(extra, ?) IS NULL OR json_extract(extra, ?) = ?)")
+                params.extend([path, path, value])
+        where = "".join(f" AND {clause}" for clause in clauses)
+        return list(self.iter_animals(animal_type, where, params))
+
+    def close(self):
+        """Close the database connection"""
+        if self.conn:
+            self.conn.close()
+            self.conn = None
+
+
+if __name__ == "__main__":
+    import sys
+
+    logging.basicConfig(
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        level=logging.INFO
+    )
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    json_path = sys.argv[1] if len(sys.argv) > 1 else os.path.join(base_dir, 'data', 'animals.json')
+    db_path = sys.argv[2] if len(sys.argv) > 2 else os.path.join(base_dir, 'data', 'animals.db')
+
+    manager = SQLiteAnimalManager(db_path)
+    if manager.count_animals():
+        logger.info(f"{db_path} already contains animals, skipping migration")
+    else:
+        manager.migrate_from_json(json_path)
+    manager.close()
@@ -1,17 +1,38 @@
 import os
+import time
+import signal
+import asyncio
 import logging
-from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
+import threading
+from io import BytesIO
+from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup, InputMediaPhoto
 from telegram.ext import Application, CommandHandler, MessageHandler, CallbackQueryHandler, ContextTypes, filters
+from telegram.request import HTTPXRequest
+from telegram.error import BadRequest
 from dotenv import load_dotenv
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import letter
 from datetime import datetime
 import shutil
 from animal_manager import AnimalManager
-from image_compressor import ImageCompressor
+from sqlite_animal_manager import SQLiteAnimalManager
+from image_compressor import ImageCompressor, perceptual_hash, hash_distance
+from file_store import ContentStore
+from render_cache import RenderCache
+from photo_archive import PhotoArchive
+from janitor import Janitor
+from intent_matcher import IntentMatcher
+from callback_router import (
+    CallbackRouter, Action, ANIMAL_TYPE_LABELS, canonical_animal_type
+)
 from database_interface import DatabaseInterface, UserInfo
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Set
 from database_manager import DatabaseManager
+from update_processor import PerUserUpdateProcessor
+from pdf_generator import PDFRenderer, PDFCache, animal_label
+from dossier import build_dossier, describe_filters, parse_filters
+from owner_digest import OwnerDigest, DigestEntry
+from startup import StartupTimer
+from metrics import Registry, MetricsServer
+from profiler import SamplingProfiler, profile_event_loop, cprofile_summary, save_profile, sample_to_files
 
 # Configure logging
 logging.basicConfig(
@@ -26,6 +47,26 @@ load_dotenv()
 # Get bot owner ID from environment variable
 BOT_OWNER_ID = int(os.getenv('BOT_OWNER_ID', '0'))
 
+# Update delivery: polling (default) or webhook
+BOT_MODE = os.getenv('BOT_MODE', 'polling').lower()
+WEBHOOK_URL = os.getenv('WEBHOOK_URL')
+WEBHOOK_LISTEN = os.getenv('WEBHOOK_LISTEN', '0.0.0.0')
+WEBHOOK_PORT = int(os.getenv('WEBHOOK_PORT', '8443'))
+WEBHOOK_PATH = os.getenv('WEBHOOK_PATH', 'telegram')
+WEBHOOK_SECRET = os.getenv('WEBHOOK_SECRET')
+# Updates processed at the same time; each user's updates still run in order
+CONCURRENT_UPDATES = int(os.getenv('CONCURRENT_UPDATES', '16'))
+# Interview PDFs: eager renders one per completed interview, lazy sends the
+# owner a summary with a "Gerar PDF" button and renders only when pressed
+INTERVIEW_PDF_MODE = os.getenv('INTERVIEW_PDF_MODE', 'eager').lower()
+# Owner notifications: immediate (one per interview) or digest (batched every
+# DIGEST_INTERVAL_MINUTES or DIGEST_MAX_INTERVIEWS; urgent interviews still go out at once)
+OWNER_NOTIFY_MODE = os.getenv('OWNER_NOTIFY_MODE', 'immediate').lower()
+DIGEST_INTERVAL_MINUTES = float(os.getenv('DIGEST_INTERVAL_MINUTES', '30'))
+DIGEST_MAX_INTERVIEWS = int(os.getenv('DIGEST_MAX_INTERVIEWS', '20'))
+# Alternative Bot API server, e.g. benchmarks/fake_telegram.py
+TELEGRAM_API_URL = os.getenv('TELEGRAM_API_URL')
+
 # Base directories
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 IMAGE_DIR = os.path.join(BASE_DIR, "images")
@@ -33,26 +74,162 @@ DOGS_DIR = os.path.join(IMAGE_DIR, "dogs")
 CATS_DIR = os.path.join(IMAGE_DIR, "cats")
 OTHERS_DIR = os.path.join(IMAGE_DIR, "others")
 DATA_DIR = os.path.join(BASE_DIR, "data")
+# Interview photos and PDFs, stored once per distinct content
+BLOB_DIR = os.path.join(DATA_DIR, "blobs")
+# Photo store of older versions, moved into BLOB_DIR at startup
+LEGACY_PHOTO_STORE_DIR = os.path.join(IMAGE_DIR, "store")
+# Unreferenced blobs are deleted once they have been unreferenced this long
+BLOB_GC_GRACE_HOURS = float(os.getenv('BLOB_GC_GRACE_HOURS', '24'))
+BLOB_GC_INTERVAL_MINUTES = float(os.getenv('BLOB_GC_INTERVAL_MINUTES', '60'))
+# Files nothing refers to (abandoned uploads, PDFs of failed completions, untracked blobs)
+# are deleted by the janitor once older than ORPHAN_MIN_AGE_HOURS
+JANITOR_INTERVAL_MINUTES = float(os.getenv('JANITOR_INTERVAL_MINUTES', '360'))
+ORPHAN_MIN_AGE_HOURS = float(os.getenv('ORPHAN_MIN_AGE_HOURS', '24'))
+JANITOR_BATCH_SIZE = int(os.getenv('JANITOR_BATCH_SIZE', '100'))
+JANITOR_BATCH_PAUSE_SECONDS = float(os.getenv('JANITOR_BATCH_PAUSE_SECONDS', '1'))
+# Interviews without activity for this long are dropped
+SESSION_IDLE_HOURS = float(os.getenv('SESSION_IDLE_HOURS', '24'))
 
-# Ensure directories exist
-try:
-    os.makedirs(DOGS_DIR, exist_ok=True)
-    os.makedirs(CATS_DIR, exist_ok=True)
-    os.makedirs(OTHERS_DIR, exist_ok=True)
-    os.makedirs(DATA_DIR, exist_ok=True)
-    logger.info("All required directories created successfully")
-except Exception as e:
-    logger.error(f"Error creating directories: {str(e)}")
-    raise
+# ANIMAL_BACKEND=sqlite keeps the catalogue in data/animals.db (migrated from animals.json on first run)
+ANIMAL_BACKEND = os.getenv('ANIMAL_BACKEND', 'json').lower()
+# Append a JSON line with the startup breakdown to this file on every start
+STARTUP_REPORT = os.getenv('STARTUP_REPORT')
+# Prometheus metrics are served at http://METRICS_HOST:METRICS_PORT/metrics; 0 disables the endpoint
+METRICS_HOST = os.getenv('METRICS_HOST', '127.0.0.1')
+METRICS_PORT = int(os.getenv('METRICS_PORT', '0'))
+# Opt-in profiling of the running bot: the owner's /perfil command and SIGUSR1
+PROFILING = os.getenv('PROFILING', '0') == '1'
+PROFILE_DIR = os.getenv('PROFILE_DIR', os.path.join(DATA_DIR, 'profiles'))
+PROFILE_SECONDS = float(os.getenv('PROFILE_SECONDS', '30'))
+PROFILE_MAX_SECONDS = float(os.getenv('PROFILE_MAX_SECONDS', '300'))
+# Sampling interval, stretched when taking samples would use more than PROFILE_MAX_OVERHEAD of the time
+PROFILE_INTERVAL_MS = float(os.getenv('PROFILE_INTERVAL_MS', '5'))
+PROFILE_MAX_OVERHEAD = float(os.getenv('PROFILE_MAX_OVERHEAD', '0.02'))
 
-# Initialize animal manager with absolute path
-animal_manager = AnimalManager(os.path.join(DATA_DIR, 'animals.json'))
+# Latency, outcomes and concurrency of update handlers, expensive internals and Bot API calls
+metrics = Registry('petbot')
+handler_metrics = metrics.operations('handler', 'handler', 'update handlers')
+operation_metrics = metrics.operations('operation', 'operation', 'internal operations')
+telegram_metrics = metrics.operations('telegram_request', 'method', 'Bot API requests')
+startup_seconds = metrics.gauge('startup_seconds', 'Time from process start to a ready bot')
 
 # Initialize image compressor
 image_compressor = ImageCompressor(max_size_kb=500, quality=85)
+# compress_image goes through compress_bytes, so each compression is recorded once
+operation_metrics.instrument(image_compressor, 'compress_bytes')
+# Photos whose perceptual hashes differ in at most this many bits count as the same photo
+PHOTO_DUPLICATE_DISTANCE = int(os.getenv('PHOTO_DUPLICATE_DISTANCE', '6'))
+
+# Callback routing for inline keyboard buttons
+router = CallbackRouter()
+
+def interview_keyboard(animal_type, animal):
+    return InlineKeyboardMarkup([
+        [InlineKeyboardButton("Iniciar Entrevista", callback_data=router.encode(Action.START_INTERVIEW, animal_type, animal.id))]
+    ])
+
+# Keyword intents of free text sent outside an interview (shared with app.py)
+chat_intents = IntentMatcher()
+
+# PHOTO_ARCHIVE=1 packs the compressed catalogue photos into one memory-mapped file
+# instead of compressing each photo file every time a listing is sent
+PHOTO_ARCHIVE = os.getenv('PHOTO_ARCHIVE', '0').lower() in ('1', 'true', 'yes')
+photo_archive_lock = asyncio.Lock()
+
+# Wired by create_components() when the application is built, so importing
+# this module creates no directories and opens no files
+animal_manager: Optional[AnimalManager] = None
+# Prebuilt listing messages
+render_cache: Optional[RenderCache] = None
+photo_archive: Optional[PhotoArchive] = None
+db_manager: Optional[DatabaseManager] = None
+# Content-addressed storage; reference counts live in db_manager's blobs table
+blob_store: Optional[ContentStore] = None
+
+def ensure_directories() -> None:
+    """Create the image and data directories the bot writes to"""
+    try:
+        os.makedirs(DOGS_DIR, exist_ok=True)
+        os.makedirs(CATS_DIR, exist_ok=True)
+        os.makedirs(OTHERS_DIR, exist_ok=True)
+        os.makedirs(DATA_DIR, exist_ok=True)
+        os.makedirs(BLOB_DIR, exist_ok=True)
+        logger.info("All required directories created successfully")
+    except Exception as e:
+        logger.error(f"Error creating directories: {str(e)}")
+        raise
+
+def load_catalogue():
+    """Animal manager for ANIMAL_BACKEND and a render cache with every listing prebuilt"""
+    if ANIMAL_BACKEND == 'sqlite':
+        manager = SQLiteAnimalManager(
+            os.path.join(DATA_DIR, 'animals.db'),
+            json_file=os.path.join(DATA_DIR, 'animals.json')
+        )
+    else:
+        manager = AnimalManager(os.path.join(DATA_DIR, 'animals.json'))
+    cache = RenderCache(manager, BASE_DIR, interview_keyboard)
+    for animal_type in ANIMAL_TYPE_LABELS:
+        cache.get_listing(animal_type)
+    return manager, cache
+
+def open_database():
+    """Interview database and the blob store that counts references in it"""
+    database = DatabaseManager(os.path.join(DATA_DIR, 'pet_adoption.db'))
+    operation_metrics.instrument(database, 'save_interview', 'get_interview')
+    store = ContentStore(BLOB_DIR, database)
+    store.adopt(LEGACY_PHOTO_STORE_DIR)
+    operation_metrics.instrument(store, 'put')
+    return database, store
+
+def open_photo_archive() -> Optional[PhotoArchive]:
+    if not PHOTO_ARCHIVE:
+        return None
+    return PhotoArchive(os.path.join(DATA_DIR, 'catalogue_photos.pack'), image_compressor.compress_image, BASE_DIR)
 
-# Initialize database manager
-db_manager = DatabaseManager()
+def create_components(startup: Optional[StartupTimer] = None) -> None:
+    """Create the directories, then load the catalogue, database and photo archive concurrently.
+
+    Called by build_application(); does nothing once the components exist.
+    """
+    global animal_manager, render_cache, photo_archive, db_manager, blob_store
+    if db_manager is not None:
+        return
+    startup = startup or StartupTimer()
+    with startup.stage('directories'):
+        ensure_directories()
+    loaded = startup.run_concurrently('load', {
+        'catalogue': load_catalogue,
+        'database': open_database,
+        'photo_archive': open_photo_archive,
+    })
+    animal_manager, render_cache = loaded['catalogue']
+    db_manager, blob_store = loaded['database']
+    photo_archive = loaded['photo_archive']
+
+def close_components() -> None:
+    """Close the database and stop the PDF workers"""
+    global db_manager
+    if db_manager is not None:
+        db_manager.close()
+        db_manager = None
+    pdf_renderer.shutdown()
+
+# Interview PDFs are rendered in memory by a worker pool (PDF_EXECUTOR=process|thread)
+pdf_renderer = PDFRenderer(
+    max_workers=int(os.getenv('PDF_WORKERS', '0')) or None,
+    use_processes=os.getenv('PDF_EXECUTOR', 'process').lower() == 'process'
+)
+operation_metrics.instrument(pdf_renderer, 'render_interview')
+# Rendered PDFs by interview id, so repeated requests are not rendered again
+pdf_cache = PDFCache(max_bytes=int(os.getenv('PDF_CACHE_MB', '32')) * 1024 * 1024)
+
+# Answers longer than this are cut in the owner's interview summary
+SUMMARY_ANSWER_CHARS = 80
+# Telegram accepts 2-10 photos per media group
+MEDIA_GROUP_SIZE = 10
+# Longest caption Telegram accepts on a document, in UTF-16 code units
+CAPTION_LIMIT = 1024
 
 # Interview questions in Portuguese
 QUESTIONS = [
@@ -76,16 +253,25 @@ class AdoptionInterview:
         self.user_info: UserInfo = {}
         self.animal_type: Optional[str] = None
         self.animal_images: List[str] = []
+        # Compressed bytes of animal_images, kept to forward them to the owner
+        self.animal_image_bytes: List[bytes] = []
+        # Telegram file_unique_ids and perceptual hashes of photos already received
+        self.photo_ids: Set[str] = set()
+        self.photo_hashes: List[int] = []
         self.selected_animal_id: Optional[int] = None
         self.db_manager = db_manager
+        self.last_active: float = time.monotonic()
 
     def start_interview(self, user_info: UserInfo, animal_type: str, animal_id: Optional[int] = None) -> str:
         self.answers = {}
         self.current_question = 0
         self.is_interview_active = True
         self.user_info = user_info
-        self.animal_type = animal_type
+        self.animal_type = canonical_animal_type(animal_type)
         self.animal_images = []
+        self.animal_image_bytes = []
+        self.photo_ids = set()
+        self.photo_hashes = []
         self.selected_animal_id = animal_id
         return QUESTIONS[0]
 
@@ -99,86 +285,276 @@ class AdoptionInterview:
             self.is_interview_active = False
             return None
 
-    def add_image(self, image_path: str) -> None:
+    def add_image(self, image_path: str, image_bytes: bytes, photo_hash: int) -> None:
         self.animal_images.append(image_path)
+        self.animal_image_bytes.append(image_bytes)
+        self.photo_hashes.append(photo_hash)
+
+    def is_duplicate_photo(self, photo_hash: int) -> bool:
+        """Whether a photo looks the same as one already sent in this interview"""
+        return any(hash_distance(photo_hash, seen) <= PHOTO_DUPLICATE_DISTANCE for seen in self.photo_hashes)
+
+    def get_animal(self):
+        """Get the animal this interview is about, if any"""
+        if self.selected_animal_id is None:
+            return None
+        return animal_manager.get_animal(self.animal_type, self.selected_animal_id)
+
+def interview_summary(interview_id: int, user_info: UserInfo, animal, answers: Dict[str, str],
+                      completed_at: datetime) -> str:
+    """Compact text version of an interview for the bot owner"""
+    lines = [
+        "📄 Nova entrevista de adoção",
+        "",
+        f"👤 Usuário: {user_info.get('first_name')} (@{user_info.get('username')})",
+        f"📱 ID: {user_info['id']}",
+        f"📅 Data: {completed_at.strftime('%d/%m/%Y %H:%M')}",
+        f"🐾 Animal: {animal.name if animal else 'Não especificado'}",
+        f"📋 ID da Entrevista: {interview_id}",
+        ""
+    ]
+    for question, answer in answers.items():
+        if len(answer) > SUMMARY_ANSWER_CHARS:
+            answer = answer[:SUMMARY_ANSWER_CHARS - 1] + '…'
+        lines.append(f"• {question}\n  {answer}")
+    return "\n".join(lines)
+
+def pdf_keyboard(interview_id: int) -> InlineKeyboardMarkup:
+    return InlineKeyboardMarkup([
+        [InlineKeyboardButton("Gerar PDF", callback_data=router.encode(Action.GENERATE_PDF, interview_id))]
+    ])
+
+async def send_owner_photos(bot, photos: List[bytes], caption: str) -> None:
+    """Send photos to the owner as media groups, uploaded concurrently"""
+    async def send_group(group: List[bytes]) -> None:
+        if len(group) == 1:
+            await bot.send_photo(chat_id=BOT_OWNER_ID, photo=group[0], caption=caption)
+        else:
+            await bot.send_media_group(
+                chat_id=BOT_OWNER_ID,
+                media=[InputMediaPhoto(photo, caption=caption if i == 0 else None) for i, photo in enumerate(group)]
+            )
+
+    await asyncio.gather(*(
+        send_group(photos[start:start + MEDIA_GROUP_SIZE]) for start in range(0, len(photos), MEDIA_GROUP_SIZE)
+    ))
 
-    def get_target_dir(self) -> str:
+async def notify_owner(bot, interview_id: int, user_info: UserInfo, animal, answers: Dict[str, str],
+                       completed_at: datetime, photos: List[bytes]) -> None:
+    """Send a completed interview to the bot owner; runs as a background task"""
+    async def send_interview():
+        if INTERVIEW_PDF_MODE == 'lazy':
+            await bot.send_message(
+                chat_id=BOT_OWNER_ID,
+                text=interview_summary(interview_id, user_info, animal, answers, completed_at),
+                reply_markup=pdf_keyboard(interview_id)
+            )
+            return
+        pdf_bytes = await pdf_renderer.render_interview(
+            user_info['id'], user_info, answers, animal_label(animal), completed_at
+        )
+        pdf_cache.put(interview_id, pdf_bytes)
+        await store_interview_pdf(interview_id, pdf_bytes)
+        await bot.send_document(
+            chat_id=BOT_OWNER_ID,
+            document=pdf_bytes,
+            filename=f"adoption_interview_{user_info['id']}_{completed_at.strftime('%Y%m%d_%H%M%S')}.pdf",
+            caption=f"📄 Nova entrevista de adoção\n\n"
+                   f"👤 Usuário: {user_info['first_name']} (@{user_info['username']})\n"
+                   f"📱 ID: {user_info['id']}\n"
+                   f"📅 Data: {completed_at.strftime('%d/%m/%Y %H:%M')}\n"
+                   f"🐾 Animal: {animal.name if animal else 'Não especificado'}\n"
+                   f"📋 ID da Entrevista: {interview_id}"
+        )
+
+    async def send_photos():
+        if photos:
+            await send_owner_photos(
+                bot, photos,
+                f"📸 Foto do animal enviada por {user_info['first_name']} (entrevista {interview_id})"
+            )
+
+    async def send_sms_notification():
+        # Send notification to bot owner's phone number if available
+        owner_info = await bot.get_chat(BOT_OWNER_ID)
+        if getattr(owner_info, 'phone_number', None):
+            await bot.send_message(
+                chat_id=BOT_OWNER_ID,
+                text=f"📱 Notificação por SMS:\n\n"
+                     f"Nova entrevista de adoção recebida!\n"
+                     f"Usuário: {user_info['first_name']}\n"
+                     f"Animal: {animal.name if animal else 'Não especificado'}\n"
+                     f"Data: {completed_at.strftime('%d/%m/%Y %H:%M')}\n"
+                     f"ID da Entrevista: {interview_id}"
+            )
+
+    results = await asyncio.gather(
+        send_interview(), send_photos(), send_sms_notification(), return_exceptions=True
+    )
+    for what, result in zip(('PDF', 'photos', 'SMS notification'), results):
+        if isinstance(result, Exception):
+            logger.error(f"Error sending {what} to owner for interview {interview_id}: {str(result)}")
+
+def stored_animal_label(animal_type: str, animal_id: int) -> Optional[str]:
+    """PDF animal line for an interview loaded from the database"""
+    return animal_label(animal_manager.get_animal(animal_type, animal_id))
+
+async def store_interview_pdf(interview_id: int, pdf_bytes: bytes) -> None:
+    """Keep a rendered PDF in the blob store and attach it to its interview"""
+    try:
+        file_path = await asyncio.to_thread(blob_store.put, pdf_bytes, '.pdf')
+        db_manager.add_file(interview_id, 'pdf', file_path)
+    except Exception as e:
+        logger.error(f"Error storing PDF of interview {interview_id}: {str(e)}")
+
+def live_session_files() -> List[str]:
+    """Stored photos of interviews still in progress, not yet referenced by the database"""
+    return [path for session in list(sessions.values()) for path in session.animal_images]
+
+async def get_interview_pdf(interview_id: int) -> Optional[bytes]:
+    """PDF of a stored interview: from memory, from the blob store, or rendered from the database"""
+    pdf_bytes = pdf_cache.get(interview_id)
+    if pdf_bytes is not None:
+        return pdf_bytes
+
+    result = db_manager.get_interview(interview_id)
+    if result is None:
+        return None
+    for file_info in result['files']:
+        if file_info['file_type'] == 'pdf':
+            pdf_bytes = blob_store.read(file_info['file_path'])
+            if pdf_bytes is not None:
+                pdf_cache.put(interview_id, pdf_bytes)
+                return pdf_bytes
+    info = result['interview']
+    label = None
+    if info['animal_type'] and info['animal_id'] is not None:
+        label = stored_animal_label(info['animal_type'], info['animal_id'])
+    interviewee = result['interviewee']
+    pdf_bytes = await pdf_renderer.render_interview(
+        interviewee['id'], interviewee, result['answers'], label,
+        info['completed_at'] or info['created_at']
+    )
+    pdf_cache.put(interview_id, pdf_bytes)
+    await store_interview_pdf(interview_id, pdf_bytes)
+    return pdf_bytes
+
+# Interview sessions, one per Telegram user
+sessions: Dict[int, AdoptionInterview] = {}
+metrics.gauge('interview_sessions', 'Interview sessions in memory', function=lambda: len(sessions))
+
+def get_session(user_id: int) -> AdoptionInterview:
+    """Get the interview session of a user, creating it if needed"""
+    session = sessions.get(user_id)
+    if session is None:
+        session = sessions[user_id] = AdoptionInterview(db_manager)
+    session.last_active = time.monotonic()
+    return session
+
+def expire_idle_sessions(max_idle_seconds: float) -> int:
+    """Drop sessions idle for longer than max_idle_seconds; returns how many were dropped"""
+    cutoff = time.monotonic() - max_idle_seconds
+    idle = [user_id for user_id, session in sessions.items() if session.last_active < cutoff]
+    for user_id in idle:
+        sessions.pop(user_id, None)
+    return len(idle)
+
+def files_in_use() -> List[str]:
+    """Files the janitor must keep: database references, sessions in progress and catalogue photos"""
+    paths = db_manager.referenced_paths()
+    paths.extend(live_session_files())
+    for animal_type in ANIMAL_TYPE_LABELS:
+        for animal in animal_manager.search_animals(animal_type, {}):
+            paths.extend(os.path.join(BASE_DIR, photo_path) for photo_path in animal.photos)
+    return paths
+
+janitor = Janitor(
+    [
+        # Uploads of older versions: images/<type>/<user id>_<timestamp>.jpg
+        os.path.join(IMAGE_DIR, '*', '[0-9]*_[0-9]*_[0-9]*.jpg'),
+        os.path.join(DATA_DIR, 'adoption_interview_*.pdf'),
+        # Blobs never registered in the database, and temporaries of interrupted writes
+        os.path.join(BLOB_DIR, '**', '*'),
+    ],
+    files_in_use,
+    min_age_seconds=ORPHAN_MIN_AGE_HOURS * 3600,
+    batch_size=JANITOR_BATCH_SIZE,
+    pause_seconds=JANITOR_BATCH_PAUSE_SECONDS
+)
+
+async def janitor_job(context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Expire idle sessions, then remove orphaned files"""
+    expired = expire_idle_sessions(SESSION_IDLE_HOURS * 3600)
+    if expired:
+        logger.info(f"Dropped {expired} idle interview sessions")
+    await janitor.job(context)
+
+def catalogue_photo_paths() -> List[str]:
+    """Photos of every animal currently listed"""
+    return [
+        photo_path
+        for animal_type in ANIMAL_TYPE_LABELS
+        for payload in render_cache.get_listing(animal_type)
+        for photo_path in payload.photos
+    ]
+
+async def refresh_photo_archive() -> None:
+    """Bring the photo archive up to date if the catalogue changed since the last sync"""
+    if photo_archive is None or photo_archive.version == animal_manager.catalogue_version:
+        return
+    async with photo_archive_lock:
+        version = animal_manager.catalogue_version
+        if photo_archive.version == version:
+            return
         try:
-            if self.animal_type == 'dog':
-                return DOGS_DIR
-            elif self.animal_type == 'cat':
-                return CATS_DIR
-            else:
-                return OTHERS_DIR
+            await asyncio.to_thread(photo_archive.sync, catalogue_photo_paths(), version)
         except Exception as e:
-            logger.error(f"Error getting target directory: {str(e)}")
-            return IMAGE_DIR
+            logger.error(f"Error updating photo archive: {str(e)}")
+
+async def refresh_photo_archive_job(context: ContextTypes.DEFAULT_TYPE) -> None:
+    await refresh_photo_archive()
 
-    def generate_pdf(self, user_id: int) -> str:
+async def send_animal_listing(context: ContextTypes.DEFAULT_TYPE, chat_id: int, payloads):
+    """Send the photos and card of each animal in a prebuilt listing"""
+    await refresh_photo_archive()
+    for payload in payloads:
         try:
-            # Create PDF filename with timestamp
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            filename = f"adoption_interview_{user_id}_{timestamp}.pdf"
-            filepath = os.path.join(DATA_DIR, filename)
-            
-            # Create PDF
-            c = canvas.Canvas(filepath, pagesize=letter)
-            
-            # Add title
-            c.setFont("Helvetica-Bold", 16)
-            c.drawString(50, 750, "Formulário de Entrevista para Adoção")
-            
-            # Add date
-            c.setFont("Helvetica", 12)
-            c.drawString(50, 720, f"Data: {datetime.now().strftime('%d/%m/%Y %H:%M')}")
-            
-            # Add user info
-            c.drawString(50, 690, f"ID do Usuário: {user_id}")
-            if 'username' in self.user_info:
-                c.drawString(50, 670, f"Username: @{self.user_info['username']}")
-            if 'first_name' in self.user_info:
-                c.drawString(50, 650, f"Nome: {self.user_info['first_name']}")
-            if 'last_name' in self.user_info:
-                c.drawString(50, 630, f"Sobrenome: {self.user_info['last_name']}")
-            
-            # Add animal info if selected
-            if self.selected_animal_id:
-                animal = animal_manager.get_animal(self.animal_type, self.selected_animal_id)
-                if animal:
-                    c.drawString(50, 610, f"Animal: {animal['name']} (ID: {animal['id']})")
-            
-            # Add questions and answers
-            y = 580
-            c.setFont("Helvetica-Bold", 12)
-            for question, answer in self.answers.items():
-                if y < 50:  # New page if we're running out of space
-                    c.showPage()
-                    y = 750
-                    c.setFont("Helvetica-Bold", 12)
-                
-                c.drawString(50, y, question)
-                y -= 20
-                c.setFont("Helvetica", 12)
-                c.drawString(50, y, f"Resposta: {answer}")
-                y -= 40
-                c.setFont("Helvetica-Bold", 12)
-            
-            # Save and close PDF
-            c.save()
-            return filepath
-        except Exception as e:
-            logger.error(f"Error generating PDF: {str(e)}")
-            raise
+            # Send animal photos first
+            for photo_path in payload.photos:
+                try:
+                    packed = photo_archive.get(photo_path) if photo_archive is not None else None
+                    if packed is not None:
+                        # The Bot API client takes bytes, so this is the only copy
+                        compressed_image = bytes(packed)
+                    else:
+                        # Compress the image before sending, off the event loop
+                        compressed_image = await asyncio.to_thread(image_compressor.compress_image, photo_path)
+                    await context.bot.send_photo(
+                        chat_id=chat_id,
+                        photo=compressed_image,
+                        caption=payload.caption
+                    )
+                except Exception as e:
+                    logger.error(f"Error sending animal photo: {str(e)}")
+                    continue
 
-# Initialize interview system
-interview = AdoptionInterview(db_manager)
+            # Send animal information
+            await context.bot.send_message(
+                chat_id=chat_id,
+                text=payload.card,
+                parse_mode='Markdown',
+                reply_markup=payload.reply_markup
+            )
+        except Exception as e:
+            logger.error(f"Error processing animal {payload.animal_id}: {str(e)}")
+            continue
 
 async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
     try:
         # Get all available animals
         try:
-            dogs = animal_manager.get_available_animals('dogs')
-            cats = animal_manager.get_available_animals('cats')
+            dogs = render_cache.get_listing('dogs')
+            cats = render_cache.get_listing('cats')
         except Exception as e:
             logger.error(f"Error getting available animals: {str(e)}")
             await update.message.reply_text(
@@ -203,89 +579,18 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
         # Show cats first
         if cats:
             await update.message.reply_text("🐈 Gatos disponíveis:")
-            for cat in cats:
-                try:
-                    # Send cat photos first
-                    if cat['photos']:
-                        for photo_path in cat['photos']:
-                            try:
-                                abs_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), photo_path)
-                                if os.path.exists(abs_path):
-                                    # Compress the image before sending
-                                    compressed_image = image_compressor.compress_image(abs_path)
-                                    await context.bot.send_photo(
-                                        chat_id=update.effective_chat.id,
-                                        photo=compressed_image,
-                                        caption=f"🐱 {cat['name']} - {cat['breed']}\nIdade: {cat['age']} anos\nGênero: {cat['gender']}\nPorte: {cat['size']}"
-                                    )
-                            except Exception as e:
-                                logger.error(f"Error sending cat photo {cat['name']}: {str(e)}")
-                                continue
-                    
-                    # Send cat information
-                    cat_card = animal_manager.generate_animal_card(cat)
-                    keyboard = [
-                        [InlineKeyboardButton("Iniciar Entrevista", callback_data=f'start_interview_cat_{cat["id"]}')]
-                    ]
-                    reply_markup = InlineKeyboardMarkup(keyboard)
-                    
-                    await update.message.reply_text(
-                        cat_card,
-                        parse_mode='Markdown',
-                        reply_markup=reply_markup
-                    )
-                except Exception as e:
-                    logger.error(f"Error processing cat {cat['name']}: {str(e)}")
-                    continue
+            await send_animal_listing(context, update.effective_chat.id, cats)
 
         # Show dogs
         if dogs:
             await update.message.reply_text("🐕 Cachorros disponíveis:")
-            for dog in dogs:
-                try:
-                    # Send dog photos first
-                    if dog['photos']:
-                        for photo_path in dog['photos']:
-                            try:
-                                abs_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), photo_path)
-                                if os.path.exists(abs_path):
-                                    # Compress the image before sending
-                                    compressed_image = image_compressor.compress_image(abs_path)
-                                    await context.bot.send_photo(
-                                        chat_id=update.effective_chat.id,
-                                        photo=compressed_image,
-                                        caption=f"🐶 {dog['name']} - {dog['breed']}\nIdade: {dog['age']} anos\nGênero: {dog['gender']}\nPorte: {dog['size']}"
-                                    )
-                            except Exception as e:
-                                logger.error(f"Error sending dog photo {dog['name']}: {str(e)}")
-                                continue
-                    
-                    # Send dog information
-                    dog_card = animal_manager.generate_animal_card(dog)
-                    keyboard = [
-                        [InlineKeyboardButton("Iniciar Entrevista", callback_data=f'start_interview_dog_{dog["id"]}')]
-                    ]
-                    reply_markup = InlineKeyboardMarkup(keyboard)
-                    
-                    await update.message.reply_text(
-                        dog_card,
-                        parse_mode='Markdown',
-                        reply_markup=reply_markup
-                    )
-                except Exception as e:
-                    logger.error(f"Error processing dog {dog['name']}: {str(e)}")
-                    continue
+            await send_animal_listing(context, update.effective_chat.id, dogs)
 
         # Add filter options
         filter_text = (
             "\n🔍 Você pode filtrar os animais por tipo:"
         )
-        keyboard = [
-            [InlineKeyboardButton("Cachorros 🐕", callback_data='animal_dog')],
-            [InlineKeyboardButton("Gatos 🐈", callback_data='animal_cat')]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
-        await update.message.reply_text(filter_text, reply_markup=reply_markup)
+        await update.message.reply_text(filter_text, reply_markup=animal_type_keyboard())
 
         logger.info(f"User {update.effective_user.id} started the bot successfully")
     except Exception as e:
@@ -295,86 +600,63 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
             "Por favor, tente novamente mais tarde."
         )
 
+def animal_type_keyboard():
+    """Keyboard used to pick the type of animal to list"""
+    return InlineKeyboardMarkup([
+        [InlineKeyboardButton("Cachorros 🐕", callback_data=router.encode(Action.LIST_ANIMALS, 'dogs'))],
+        [InlineKeyboardButton("Gatos 🐈", callback_data=router.encode(Action.LIST_ANIMALS, 'cats'))]
+    ])
+
+@router.route(Action.LIST_ANIMALS, 'T')
+@handler_metrics.track()
 async def show_available_animals(update: Update, context: ContextTypes.DEFAULT_TYPE, animal_type: str):
     try:
-        if animal_type not in ['dog', 'cat']:
-            raise ValueError(f"Invalid animal type: {animal_type}")
+        animal_type = canonical_animal_type(animal_type)
+        label = ANIMAL_TYPE_LABELS[animal_type]
 
-        animals = animal_manager.get_available_animals(animal_type)
+        animals = render_cache.get_listing(animal_type)
         if not animals:
-            await update.callback_query.message.reply_text(
-                f"Desculpe, não há {animal_type}s disponíveis para adoção no momento."
+            await update.effective_message.reply_text(
+                f"Desculpe, não há {label} disponíveis para adoção no momento."
             )
             return
 
         # Send message about available animals
-        animal_emoji = "🐕" if animal_type == "dog" else "🐈"
-        await update.callback_query.message.reply_text(
-            f"Aqui estão os {animal_type}s disponíveis para adoção:"
+        await update.effective_message.reply_text(
+            f"Aqui estão os {label} disponíveis para adoção:"
         )
-
-        for animal in animals:
-            try:
-                # Send animal photos first
-                if animal['photos']:
-                    for photo_path in animal['photos']:
-                        try:
-                            abs_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), photo_path)
-                            if os.path.exists(abs_path):
-                                # Compress the image before sending
-                                compressed_image = image_compressor.compress_image(abs_path)
-                                await context.bot.send_photo(
-                                    chat_id=update.effective_chat.id,
-                                    photo=compressed_image,
-                                    caption=f"{animal_emoji} {animal['name']} - {animal['breed']}\nIdade: {animal['age']} anos\nGênero: {animal['gender']}\nPorte: {animal['size']}"
-                                )
-                        except Exception as e:
-                            logger.error(f"Error sending animal photo: {str(e)}")
-                            continue
-                
-                # Send animal information
-                animal_card = animal_manager.generate_animal_card(animal)
-                keyboard = [
-                    [InlineKeyboardButton("Iniciar Entrevista", callback_data=f'start_interview_{animal_type}_{animal["id"]}')]
-                ]
-                reply_markup = InlineKeyboardMarkup(keyboard)
-                
-                await update.callback_query.message.reply_text(
-                    animal_card,
-                    parse_mode='Markdown',
-                    reply_markup=reply_markup
-                )
-            except Exception as e:
-                logger.error(f"Error processing animal {animal['name']}: {str(e)}")
-                continue
+        await send_animal_listing(context, update.effective_chat.id, animals)
 
         # Add back button
-        keyboard = [[InlineKeyboardButton("Voltar", callback_data='back_to_types')]]
+        keyboard = [[InlineKeyboardButton("Voltar", callback_data=router.encode(Action.BACK_TO_TYPES))]]
         reply_markup = InlineKeyboardMarkup(keyboard)
-        await update.callback_query.message.reply_text(
+        await update.effective_message.reply_text(
             "Selecione uma opção:",
             reply_markup=reply_markup
         )
     except Exception as e:
         logger.error(f"Error showing available animals: {str(e)}")
-        await update.callback_query.message.reply_text(
+        await update.effective_message.reply_text(
             "Desculpe, ocorreu um erro ao mostrar os animais disponíveis. "
             "Por favor, tente novamente."
         )
 
+@router.route(Action.ANIMAL_DETAILS, 'TI')
+@handler_metrics.track()
 async def show_animal_details(update: Update, context: ContextTypes.DEFAULT_TYPE, animal_type, animal_id):
     try:
+        animal_type = canonical_animal_type(animal_type)
         animal = animal_manager.get_animal(animal_type, animal_id)
         if not animal:
             await update.callback_query.message.reply_text("Animal não encontrado.")
             return
 
-        # Generate animal card
-        card = animal_manager.generate_animal_card(animal)
+        # Reuse the cached animal card
+        card = render_cache.get_payload(animal_type, animal).card
         
         keyboard = [
-            [InlineKeyboardButton("Iniciar Entrevista", callback_data=f'start_interview_{animal_type}_{animal_id}')],
-            [InlineKeyboardButton("Voltar", callback_data=f'list_{animal_type}')]
+            [InlineKeyboardButton("Iniciar Entrevista", callback_data=router.encode(Action.START_INTERVIEW, animal_type, animal_id))],
+            [InlineKeyboardButton("Voltar", callback_data=router.encode(Action.LIST_ANIMALS, animal_type))]
         ]
         reply_markup = InlineKeyboardMarkup(keyboard)
         
@@ -387,84 +669,68 @@ async def show_animal_details(update: Update, context: ContextTypes.DEFAULT_TYPE
         logger.error(f"Error showing animal details: {str(e)}")
         await update.callback_query.message.reply_text("Desculpe, ocorreu um erro. Por favor, tente novamente.")
 
+@router.route(Action.BACK_TO_TYPES)
+@handler_metrics.track()
+async def show_animal_types(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    await update.callback_query.message.reply_text(
+        "Por favor, selecione o tipo de animal que você deseja adotar:",
+        reply_markup=animal_type_keyboard()
+    )
+
+@router.route(Action.START_INTERVIEW, 'TI')
+@handler_metrics.track()
+async def start_animal_interview(update: Update, context: ContextTypes.DEFAULT_TYPE, animal_type: str, animal_id: int):
+    try:
+        animal_type = canonical_animal_type(animal_type)
+        user_info = {
+            'username': update.effective_user.username,
+            'first_name': update.effective_user.first_name,
+            'last_name': update.effective_user.last_name
+        }
+        first_question = get_session(update.effective_user.id).start_interview(user_info, animal_type, animal_id)
+        await update.callback_query.message.reply_text(
+            f"Ótimo! Vamos começar a entrevista para adoção.\n\n"
+            f"{first_question}"
+        )
+        logger.info(f"User {update.effective_user.id} started interview for {animal_type} {animal_id}")
+    except Exception as e:
+        logger.error(f"Error starting interview: {str(e)}")
+        await update.callback_query.message.reply_text(
+            "Desculpe, ocorreu um erro ao iniciar a entrevista. "
+            "Por favor, tente novamente."
+        )
+
+@router.route(Action.GENERATE_PDF, 'I')
+@handler_metrics.track()
+async def send_interview_pdf(update: Update, context: ContextTypes.DEFAULT_TYPE, interview_id: int):
+    if update.effective_user.id != BOT_OWNER_ID:
+        await update.callback_query.message.reply_text("Apenas o responsável pelo bot pode gerar este PDF.")
+        return
+    try:
+        pdf_bytes = await get_interview_pdf(interview_id)
+        if pdf_bytes is None:
+            await update.callback_query.message.reply_text("Entrevista não encontrada.")
+            return
+        await context.bot.send_document(
+            chat_id=update.effective_chat.id,
+            document=pdf_bytes,
+            filename=f"adoption_interview_{interview_id}.pdf",
+            caption=f"📋 ID da Entrevista: {interview_id}"
+        )
+    except Exception as e:
+        logger.error(f"Error generating PDF for interview {interview_id}: {str(e)}")
+        await update.callback_query.message.reply_text(
+            "Desculpe, ocorreu um erro ao gerar o PDF da entrevista. "
+            "Por favor, tente novamente."
+        )
+
 async def button(update: Update, context: ContextTypes.DEFAULT_TYPE):
     try:
         query = update.callback_query
         await query.answer()
-        
-        if query.data == 'back_to_types':
-            keyboard = [
-                [InlineKeyboardButton("Cachorro 🐕", callback_data='animal_dog')],
-                [InlineKeyboardButton("Gato 🐈", callback_data='animal_cat')]
-            ]
-            reply_markup = InlineKeyboardMarkup(keyboard)
-            await query.message.reply_text(
-                "Por favor, selecione o tipo de animal que você deseja adotar:",
-                reply_markup=reply_markup
-            )
-        
-        elif query.data.startswith('animal_'):
-            try:
-                animal_type = query.data.split('_')[1]
-                if animal_type not in ['dog', 'cat']:
-                    raise ValueError(f"Invalid animal type: {animal_type}")
-                await show_available_animals(update, context, animal_type)
-            except Exception as e:
-                logger.error(f"Error in animal selection: {str(e)}")
-                await query.message.reply_text(
-                    "Desculpe, ocorreu um erro ao mostrar os animais. "
-                    "Por favor, tente novamente."
-                )
-        
-        elif query.data.startswith('list_'):
-            try:
-                animal_type = query.data.split('_')[1]
-                if animal_type not in ['dog', 'cat']:
-                    raise ValueError(f"Invalid animal type: {animal_type}")
-                await show_available_animals(update, context, animal_type)
-            except Exception as e:
-                logger.error(f"Error listing animals: {str(e)}")
-                await query.message.reply_text(
-                    "Desculpe, ocorreu um erro ao listar os animais. "
-                    "Por favor, tente novamente."
-                )
-        
-        elif query.data.startswith('select_animal_'):
-            try:
-                _, _, animal_type, animal_id = query.data.split('_')
-                if animal_type not in ['dog', 'cat']:
-                    raise ValueError(f"Invalid animal type: {animal_type}")
-                await show_animal_details(update, context, animal_type, int(animal_id))
-            except Exception as e:
-                logger.error(f"Error showing animal details: {str(e)}")
-                await query.message.reply_text(
-                    "Desculpe, ocorreu um erro ao mostrar os detalhes do animal. "
-                    "Por favor, tente novamente."
-                )
-        
-        elif query.data.startswith('start_interview_'):
-            try:
-                _, _, animal_type, animal_id = query.data.split('_')
-                if animal_type not in ['dog', 'cat']:
-                    raise ValueError(f"Invalid animal type: {animal_type}")
-                
-                user_info = {
-                    'username': update.effective_user.username,
-                    'first_name': update.effective_user.first_name,
-                    'last_name': update.effective_user.last_name
-                }
-                first_question = interview.start_interview(user_info, animal_type, int(animal_id))
-                await query.message.reply_text(
-                    f"Ótimo! Vamos começar a entrevista para adoção.\n\n"
-                    f"{first_question}"
-                )
-                logger.info(f"User {update.effective_user.id} started interview for {animal_type} {animal_id}")
-            except Exception as e:
-                logger.error(f"Error starting interview: {str(e)}")
-                await query.message.reply_text(
-                    "Desculpe, ocorreu um erro ao iniciar a entrevista. "
-                    "Por favor, tente novamente."
-                )
+
+        if not await router.dispatch(update, context):
+            logger.warning(f"Unknown callback data: {query.data!r}")
     
     except Exception as e:
         logger.error(f"Error in button handler: {str(e)}")
@@ -473,30 +739,47 @@ async def button(update: Update, context: ContextTypes.DEFAULT_TYPE):
             "Por favor, tente novamente mais tarde."
         )
 
+async def reply_duplicate_photo(update: Update) -> None:
+    await update.message.reply_text(
+        "Essa foto é igual a uma que você já enviou, então não foi adicionada novamente. "
+        "Por favor, continue respondendo às perguntas."
+    )
+
 async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
     try:
-        if interview.is_interview_active:
+        interview = sessions.get(update.effective_user.id)
+        if interview and interview.is_interview_active:
+            interview.last_active = time.monotonic()
             # Check if the message contains a photo
             if update.message.photo:
                 try:
                     # Get the largest photo
                     photo = update.message.photo[-1]
-                    # Download the photo
+                    # The very same Telegram file again: no need to download it
+                    if photo.file_unique_id in interview.photo_ids:
+                        await reply_duplicate_photo(update)
+                        return
+
+                    # Download the photo into memory
                     photo_file = await context.bot.get_file(photo.file_id)
-                    # Generate filename
-                    filename = f"{update.effective_user.id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jpg"
-                    target_dir = interview.get_target_dir()
-                    file_path = os.path.join(target_dir, filename)
+                    buffer = BytesIO()
+                    await photo_file.download_to_memory(buffer)
                     
-                    # Download and save the photo
-                    await photo_file.download_to_drive(file_path)
+                    # A resend of a photo from this interview is dropped before compressing it
+                    photo_hash = await asyncio.to_thread(perceptual_hash, buffer.getvalue())
+                    if interview.is_duplicate_photo(photo_hash):
+                        await reply_duplicate_photo(update)
+                        return
                     
-                    # Compress the image before adding to interview
-                    compressed_image = image_compressor.compress_image(file_path)
-                    with open(file_path, 'wb') as f:
-                        f.write(compressed_image)
+                    # Compress in a thread (Pillow releases the GIL) and store the result once
+                    compressed_image = await asyncio.to_thread(
+                        image_compressor.compress_bytes, buffer.getvalue(), photo.file_id
+                    )
+                    file_path = await asyncio.to_thread(blob_store.put, compressed_image, '.jpg')
                     
-                    interview.add_image(file_path)
+                    interview.add_image(file_path, compressed_image, photo_hash)
+                    # Only once it is stored: a photo that failed above can be sent again
+                    interview.photo_ids.add(photo.file_unique_id)
                     
                     await update.message.reply_text("Foto recebida! Por favor, continue respondendo às perguntas.")
                     return
@@ -533,6 +816,8 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
                     )
                     return
 
+                answer = update.message.text
+
                 # Verifica se a pergunta atual é sobre idade
                 current_question = QUESTIONS[interview.current_question]
                 if "idade" in current_question.lower():
@@ -559,7 +844,7 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
                             return
                             
                         # Atualiza a resposta com o número inteiro
-                        update.message.text = str(age)
+                        answer = str(age)
                         
                     except ValueError:
                         await update.message.reply_text(
@@ -568,14 +853,15 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
                         )
                         return
 
-                next_question = interview.answer_question(update.message.text)
+                next_question = interview.answer_question(answer)
                 
                 if next_question:
                     await update.message.reply_text(next_question)
                 else:
-                    # Interview is complete, generate PDF
+                    # Interview is complete, save it and notify the owner
                     try:
-                        pdf_file = interview.generate_pdf(update.effective_user.id)
+                        animal = interview.get_animal()
+                        completed_at = datetime.now()
                         
                         # Save interview to database
                         user_info = {
@@ -589,7 +875,7 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
                             interview.animal_type,
                             interview.selected_animal_id,
                             interview.answers,
-                            pdf_file,
+                            None,
                             interview.animal_images
                         )
                         
@@ -599,111 +885,34 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
                             "Seu formulário será analisado pela nossa equipe."
                         )
                         
-                        # Send PDF to bot owner
+                        # Owner-side I/O runs in the background, the adopter does not wait for it
                         if BOT_OWNER_ID:
-                            try:
-                                # Send PDF to bot owner's chat
-                                with open(pdf_file, 'rb') as pdf:
-                                    await context.bot.send_document(
-                                        chat_id=BOT_OWNER_ID,
-                                        document=pdf,
-                                        caption=f"📄 Nova entrevista de adoção\n\n"
-                                               f"👤 Usuário: {update.effective_user.first_name} (@{update.effective_user.username})\n"
-                                               f"📱 ID: {update.effective_user.id}\n"
-                                               f"📅 Data: {datetime.now().strftime('%d/%m/%Y %H:%M')}\n"
-                                               f"🐾 Animal: {animal['name'] if animal else 'Não especificado'}\n"
-                                               f"📋 ID da Entrevista: {interview_id}"
-                                    )
-                                
-                                # Send images to bot owner
-                                for image_path in interview.animal_images:
-                                    try:
-                                        if os.path.exists(image_path):
-                                            # Compress the image before sending
-                                            compressed_image = image_compressor.compress_image(image_path)
-                                            await context.bot.send_photo(
-                                                chat_id=BOT_OWNER_ID,
-                                                photo=compressed_image,
-                                                caption=f"📸 Foto do animal enviada por {update.effective_user.first_name}"
-                                            )
-                                    except Exception as e:
-                                        logger.error(f"Error sending photo to owner: {str(e)}")
-                                        continue
-                                
-                                # Send notification to bot owner's phone number if available
-                                try:
-                                    owner_info = await context.bot.get_chat(BOT_OWNER_ID)
-                                    if owner_info.phone_number:
-                                        await context.bot.send_message(
-                                            chat_id=BOT_OWNER_ID,
-                                            text=f"📱 Notificação por SMS:\n\n"
-                                                 f"Nova entrevista de adoção recebida!\n"
-                                                 f"Usuário: {update.effective_user.first_name}\n"
-                                                 f"Animal: {animal['name'] if animal else 'Não especificado'}\n"
-                                                 f"Data: {datetime.now().strftime('%d/%m/%Y %H:%M')}\n"
-                                                 f"ID da Entrevista: {interview_id}"
-                                        )
-                                except Exception as e:
-                                    logger.error(f"Error sending SMS notification: {str(e)}")
-                            except Exception as e:
-                                logger.error(f"Error sending PDF to owner: {str(e)}")
+                            if OWNER_NOTIFY_MODE == 'digest' and not is_urgent_interview(animal):
+                                entry = DigestEntry(
+                                    interview_id, user_info, animal.name if animal else None,
+                                    completed_at, list(interview.animal_images)
+                                )
+                                if owner_digest.add(entry):
+                                    context.application.create_task(owner_digest.flush(context.bot))
+                            else:
+                                context.application.create_task(notify_owner(
+                                    context.bot, interview_id, user_info, animal, dict(interview.answers),
+                                    completed_at, list(interview.animal_image_bytes)
+                                ))
                         else:
                             logger.error("BOT_OWNER_ID not set")
                         
-                        # Clean up files
-                        try:
-                            if os.path.exists(pdf_file):
-                                os.remove(pdf_file)
-                            for image_path in interview.animal_images:
-                                if os.path.exists(image_path):
-                                    os.remove(image_path)
-                        except Exception as e:
-                            logger.error(f"Error cleaning up files: {str(e)}")
-                        
+                        sessions.pop(update.effective_user.id, None)
                         logger.info(f"User {update.effective_user.id} completed the interview")
 
                         # Show available animals to the user
                         try:
-                            available_animals = animal_manager.get_available_animals(interview.animal_type)
+                            available_animals = render_cache.get_listing(interview.animal_type)
                             if available_animals:
                                 await update.message.reply_text(
                                     "Aqui estão outros animais disponíveis para adoção:"
                                 )
-                                
-                                for animal in available_animals:
-                                    try:
-                                        # Send animal photos first
-                                        if animal['photos']:
-                                            for photo_path in animal['photos']:
-                                                try:
-                                                    abs_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), photo_path)
-                                                    if os.path.exists(abs_path):
-                                                        # Compress the image before sending
-                                                        compressed_image = image_compressor.compress_image(abs_path)
-                                                        await context.bot.send_photo(
-                                                            chat_id=update.effective_chat.id,
-                                                            photo=compressed_image,
-                                                            caption=f"🐱 {animal['name']} - {animal['breed']}\nIdade: {animal['age']} anos\nGênero: {animal['gender']}\nPorte: {animal['size']}"
-                                                        )
-                                                except Exception as e:
-                                                    logger.error(f"Error sending animal photo: {str(e)}")
-                                                    continue
-                                        
-                                        # Send animal information
-                                        animal_card = animal_manager.generate_animal_card(animal)
-                                        keyboard = [
-                                            [InlineKeyboardButton("Iniciar Entrevista", callback_data=f'start_interview_{interview.animal_type}_{animal["id"]}')]
-                                        ]
-                                        reply_markup = InlineKeyboardMarkup(keyboard)
-                                        
-                                        await update.message.reply_text(
-                                            animal_card,
-                                            parse_mode='Markdown',
-                                            reply_markup=reply_markup
-                                        )
-                                    except Exception as e:
-                                        logger.error(f"Error processing animal {animal['name']}: {str(e)}")
-                                        continue
+                                await send_animal_listing(context, update.effective_chat.id, available_animals)
                             else:
                                 await update.message.reply_text(
                                     "No momento, não há outros animais disponíveis para adoção."
@@ -716,7 +925,7 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
                     except Exception as e:
                         logger.error(f"Error in interview completion: {str(e)}")
                         await update.message.reply_text(
-                            "Desculpe, ocorreu um erro ao gerar o PDF da entrevista. "
+                            "Desculpe, ocorreu um erro ao salvar a entrevista. "
                             "Por favor, tente novamente mais tarde."
                         )
             except Exception as e:
@@ -726,19 +935,21 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
                     "Por favor, tente novamente com uma resposta mais clara."
                 )
         else:
+            # "Quero ver os gatos" goes straight to the listing of that type
+            animal_types = {
+                match.intent for match in chat_intents.match(update.message.text or '')
+            } & {'dogs', 'cats'}
+            if len(animal_types) == 1:
+                await show_available_animals(update, context, animal_types.pop())
+                return
+
             # Se não estiver em uma entrevista ativa, mostra as opções disponíveis
             welcome_text = (
                 "🐾 Bem-vindo ao Bot de Adoção de Animais! 🐾\n\n"
                 "Para começar, use o comando /start ou selecione uma das opções abaixo:"
             )
             
-            keyboard = [
-                [InlineKeyboardButton("Cachorro 🐕", callback_data='animal_dog')],
-                [InlineKeyboardButton("Gato 🐈", callback_data='animal_cat')]
-            ]
-            reply_markup = InlineKeyboardMarkup(keyboard)
-            
-            await update.message.reply_text(welcome_text, reply_markup=reply_markup)
+            await update.message.reply_text(welcome_text, reply_markup=animal_type_keyboard())
     except Exception as e:
         logger.error(f"Critical error in message handler: {str(e)}")
         await update.message.reply_text(
@@ -746,6 +957,203 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
             "Por favor, tente novamente mais tarde."
         )
 
+@operation_metrics.track()
+def write_dossier(output: BytesIO, filters: Optional[Dict[str, Any]] = None,
+                  interview_ids: Optional[List[int]] = None, **kwargs) -> int:
+    """Render the interviews matching filters, or the given ids, into output (runs in a thread)"""
+    # Own connection, so streaming the interviews does not interleave with the bot's queries
+    reader = DatabaseManager(db_manager.db_path)
+    try:
+        if interview_ids is not None:
+            interviews = filter(None, map(reader.get_interview, interview_ids))
+        else:
+            interviews = reader.iter_interviews(**(filters or {}))
+            kwargs.setdefault('filters', describe_filters(filters or {}))
+        return build_dossier(
+            interviews, output, label_for=stored_animal_label, executor=pdf_renderer.executor,
+            max_in_flight=2 * pdf_renderer.max_workers, **kwargs
+        )
+    finally:
+        reader.close()
+
+def is_urgent_interview(animal) -> bool:
+    """Interviews the owner hears about at once, even in digest mode"""
+    return bool(animal and animal.special_needs)
+
+def telegram_length(text: str) -> int:
+    """Length as Telegram counts it: UTF-16 code units, so most emoji count twice"""
+    return len(text.encode('utf-16-le')) // 2
+
+def digest_caption(entries: List[DigestEntry]) -> str:
+    """One line per interview, cut to fit a document caption"""
+    photos = sum(len(entry.photo_paths) for entry in entries)
+    header = f"📬 {len(entries)} novas entrevistas de adoção"
+    if photos:
+        header += f" ({photos} fotos no PDF)"
+    lines = [header, ""]
+    length = telegram_length(header) + 1
+    for shown, entry in enumerate(entries):
+        line = (
+            f"📋 {entry.interview_id} • {entry.user_info['first_name']} (@{entry.user_info['username']}) • "
+            f"{entry.animal_name or 'Não especificado'} • {entry.completed_at.strftime('%d/%m %H:%M')}"
+        )
+        rest = f"… e mais {len(entries) - shown}"
+        if length + telegram_length(line) + telegram_length(rest) + 2 > CAPTION_LIMIT:
+            lines.append(rest)
+            break
+        lines.append(line)
+        length += telegram_length(line) + 1
+    return "\n".join(lines)
+
+def write_digest(output: BytesIO, entries: List[DigestEntry]) -> int:
+    """Render a digest with the photos read back from the blob store (runs in a thread)"""
+    photos = {
+        entry.interview_id: [data for data in map(blob_store.read, entry.photo_paths) if data is not None]
+        for entry in entries
+    }
+    return write_dossier(
+        output,
+        interview_ids=[entry.interview_id for entry in entries],
+        title="Resumo de Entrevistas de Adoção",
+        photos=photos
+    )
+
+async def send_owner_digest(bot, entries: List[DigestEntry]) -> None:
+    """Send queued interviews as one document: a dossier with their answers and photos"""
+    output = BytesIO()
+    count = await asyncio.to_thread(write_digest, output, entries)
+    if not count:
+        await bot.send_message(chat_id=BOT_OWNER_ID, text=digest_caption(entries))
+        return
+    filename = f"resumo_entrevistas_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
+    caption = digest_caption(entries)
+    try:
+        await bot.send_document(chat_id=BOT_OWNER_ID, document=output.getvalue(), filename=filename, caption=caption)
+    except BadRequest as e:
+        # Most likely the caption; the PDF still goes out, with the summary as its own message
+        logger.error(f"Error sending owner digest caption: {str(e)}")
+        await bot.send_document(chat_id=BOT_OWNER_ID, document=output.getvalue(), filename=filename)
+        await bot.send_message(chat_id=BOT_OWNER_ID, text=caption)
+
+# Interviews waiting for the next owner digest (OWNER_NOTIFY_MODE=digest)
+owner_digest = OwnerDigest(send_owner_digest, max_interviews=DIGEST_MAX_INTERVIEWS)
+
+async def flush_owner_digest(application: Application) -> None:
+    """Send what is left in the digest when the bot stops"""
+    await owner_digest.flush(application.bot)
+
+async def dossier_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """/dossie [tipo] [id do animal] [AAAA-MM-DD [AAAA-MM-DD]]: all matching interviews in one PDF"""
+    if update.effective_user.id != BOT_OWNER_ID:
+        await update.message.reply_text("Apenas o responsável pelo bot pode gerar dossiês.")
+        return
+    try:
+        filters = parse_filters(context.args or [])
+    except ValueError:
+        await update.message.reply_text(
+            "Uso: /dossie [gatos|cachorros|outros] [id do animal] [AAAA-MM-DD [AAAA-MM-DD]]"
+        )
+        return
+
+    try:
+        await update.message.reply_text("Gerando o dossiê, aguarde...")
+        output = BytesIO()
+        count = await asyncio.to_thread(write_dossier, output, filters)
+        if not count:
+            await update.message.reply_text("Nenhuma entrevista encontrada para esses filtros.")
+            return
+        await context.bot.send_document(
+            chat_id=update.effective_chat.id,
+            document=output.getvalue(),
+            filename=f"dossie_entrevistas_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf",
+            caption=f"📚 Dossiê com {count} entrevistas"
+        )
+    except Exception as e:
+        logger.error(f"Error generating dossier: {str(e)}")
+        await update.message.reply_text(
+            "Desculpe, ocorreu um erro ao gerar o dossiê. "
+            "Por favor, tente novamente mais tarde."
+        )
+
+# One profiling session at a time, whether started by /perfil or SIGUSR1
+profile_lock = threading.Lock()
+
+def new_profiler() -> SamplingProfiler:
+    return SamplingProfiler(interval=PROFILE_INTERVAL_MS / 1000, max_overhead=PROFILE_MAX_OVERHEAD)
+
+def profile_stem() -> str:
+    return f"perfil_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+
+async def profile_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """/perfil [segundos] [cprofile]: profile the running bot and send the results (PROFILING=1)"""
+    if update.effective_user.id != BOT_OWNER_ID:
+        await update.message.reply_text("Apenas o responsável pelo bot pode perfilar o processo.")
+        return
+    args = [arg.lower() for arg in context.args or []]
+    use_cprofile = 'cprofile' in args
+    numbers = [arg for arg in args if arg != 'cprofile']
+    try:
+        seconds = float(numbers[0]) if numbers else PROFILE_SECONDS
+        if len(numbers) > 1 or not 0 < seconds <= PROFILE_MAX_SECONDS:
+            raise ValueError(seconds)
+    except ValueError:
+        await update.message.reply_text(
+            f"Uso: /perfil [segundos, até {PROFILE_MAX_SECONDS:.0f}] [cprofile]"
+        )
+        return
+    if not profile_lock.acquire(blocking=False):
+        await update.message.reply_text("Já existe uma sessão de perfilamento em andamento.")
+        return
+
+    try:
+        mode = "cProfile do loop de eventos" if use_cprofile else "amostragem"
+        await update.message.reply_text(f"Perfilando o bot por {seconds:.0f} s ({mode})...")
+        if use_cprofile:
+            stats = await profile_event_loop(seconds)
+            summary = cprofile_summary(stats, seconds)
+            paths = await asyncio.to_thread(save_profile, PROFILE_DIR, profile_stem(), summary, stats=stats)
+            caption = f"📈 cProfile de {seconds:.0f} s, {stats.total_calls} chamadas"
+        else:
+            paths, profile = await asyncio.to_thread(
+                sample_to_files, new_profiler(), seconds, PROFILE_DIR, profile_stem()
+            )
+            caption = (
+                f"📈 {profile.samples} amostras em {profile.duration:.0f} s, "
+                f"overhead {profile.overhead:.2%}"
+            )
+        for index, path in enumerate(paths):
+            with open(path, 'rb') as f:
+                await context.bot.send_document(
+                    chat_id=update.effective_chat.id,
+                    document=f.read(),
+                    filename=os.path.basename(path),
+                    caption=caption if index == 0 else None
+                )
+    except Exception as e:
+        logger.error(f"Error profiling the bot: {str(e)}")
+        await update.message.reply_text(
+            "Desculpe, ocorreu um erro ao perfilar o bot. "
+            "Por favor, tente novamente mais tarde."
+        )
+    finally:
+        profile_lock.release()
+
+def profile_in_background(signum=None, frame=None) -> None:
+    """SIGUSR1: sample the process for PROFILE_SECONDS in a thread, saving the results to PROFILE_DIR"""
+    if not profile_lock.acquire(blocking=False):
+        logger.warning("Profiling already in progress; signal ignored")
+        return
+
+    def run():
+        try:
+            sample_to_files(new_profiler(), PROFILE_SECONDS, PROFILE_DIR, profile_stem())
+        except Exception as e:
+            logger.error(f"Error profiling the bot: {str(e)}")
+        finally:
+            profile_lock.release()
+
+    threading.Thread(target=run, name='profiler', daemon=True).start()
+
 async def error_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
     logger.error(f"Update {update} caused error {context.error}")
     if update and update.effective_message:
@@ -753,6 +1161,107 @@ async def error_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
             "Desculpe, ocorreu um erro. Por favor, tente novamente."
         )
 
+class InstrumentedRequest(HTTPXRequest):
+    """Bot API client that records every call by method (getUpdates long polls use their own client)"""
+
+    async def do_request(self, url, method, request_data=None, *args, **kwargs):
+        # File downloads (.../file/bot<token>/<path>) share one label instead of one per file
+        name = 'downloadFile' if '/file/bot' in url else url.rsplit('/', 1)[-1]
+        with telegram_metrics.time(name):
+            return await super().do_request(url, method, request_data, *args, **kwargs)
+
+def build_application(token: str, startup: Optional[StartupTimer] = None) -> Application:
+    """Create the components, then the Application with handlers and concurrent update processing.
+
+    The startup breakdown is logged once the Bot API connection is initialized.
+    """
+    startup = startup or StartupTimer()
+    create_components(startup)
+
+    async def report_startup(application: Application) -> None:
+        startup.mark('initialize')
+        startup_seconds.set(startup.elapsed())
+        startup.report(STARTUP_REPORT)
+
+    builder = Application.builder().token(token).request(InstrumentedRequest(connection_pool_size=256))
+    if TELEGRAM_API_URL:
+        builder = builder.base_url(f"{TELEGRAM_API_URL}/bot").base_file_url(f"{TELEGRAM_API_URL}/file/bot")
+    builder = builder.concurrent_updates(PerUserUpdateProcessor(CONCURRENT_UPDATES))
+    builder = builder.post_init(report_startup).post_stop(flush_owner_digest)
+    application = builder.build()
+
+    if application.job_queue is None:
+        logger.warning(
+            "Job queue unavailable (install python-telegram-bot[job-queue]); "
+            "unreferenced files are not collected and idle sessions never expire"
+        )
+    else:
+        application.job_queue.run_repeating(
+            blob_store.gc_job(BLOB_GC_GRACE_HOURS * 3600, live_session_files),
+            interval=BLOB_GC_INTERVAL_MINUTES * 60, first=60
+        )
+        application.job_queue.run_repeating(janitor_job, interval=JANITOR_INTERVAL_MINUTES * 60, first=120)
+        if photo_archive is not None:
+            # Pack the catalogue before the first listing asks for it
+            application.job_queue.run_once(refresh_photo_archive_job, 0)
+
+    if OWNER_NOTIFY_MODE == 'digest':
+        if application.job_queue is None:
+            logger.warning(
+                "Job queue unavailable (install python-telegram-bot[job-queue]); "
+                f"the owner digest is only sent every {DIGEST_MAX_INTERVIEWS} interviews"
+            )
+        else:
+            interval = DIGEST_INTERVAL_MINUTES * 60
+            application.job_queue.run_repeating(owner_digest.job, interval=interval, first=interval)
+
+    # Add handlers
+    application.add_handler(CommandHandler("start", handler_metrics.track()(start)))
+    application.add_handler(CommandHandler("dossie", handler_metrics.track()(dossier_command)))
+    application.add_handler(CallbackQueryHandler(handler_metrics.track()(button)))
+    if PROFILING:
+        application.add_handler(CommandHandler("perfil", profile_command))
+    tracked_message = handler_metrics.track()(handle_message)
+    application.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, tracked_message))
+    application.add_handler(MessageHandler(filters.PHOTO, tracked_message))
+    application.add_error_handler(error_handler)
+    startup.mark('application')
+    return application
+
+def start_metrics_server() -> Optional[MetricsServer]:
+    """Serve the metrics endpoint if METRICS_PORT is set"""
+    if not METRICS_PORT:
+        return None
+    try:
+        return MetricsServer(metrics, METRICS_HOST, METRICS_PORT).start()
+    except OSError as e:
+        logger.error(f"Error starting metrics endpoint on {METRICS_HOST}:{METRICS_PORT}: {str(e)}")
+        return None
+
+def run_application(application: Application) -> None:
+    """Serve updates by webhook or long polling, depending on BOT_MODE"""
+    metrics_server = start_metrics_server()
+    if PROFILING and hasattr(signal, 'SIGUSR1'):
+        signal.signal(signal.SIGUSR1, profile_in_background)
+        logger.info(f"Send SIGUSR1 to process {os.getpid()} to profile it for {PROFILE_SECONDS:.0f} s")
+    try:
+        if BOT_MODE == 'webhook':
+            if not WEBHOOK_URL:
+                raise ValueError("WEBHOOK_URL not found in environment variables")
+            logger.info(f"Listening for webhook updates on {WEBHOOK_LISTEN}:{WEBHOOK_PORT}/{WEBHOOK_PATH}")
+            application.run_webhook(
+                listen=WEBHOOK_LISTEN,
+                port=WEBHOOK_PORT,
+                url_path=WEBHOOK_PATH,
+                webhook_url=f"{WEBHOOK_URL.rstrip('/')}/{WEBHOOK_PATH}",
+                secret_token=WEBHOOK_SECRET
+            )
+        else:
+            application.run_polling()
+    finally:
+        if metrics_server is not None:
+            metrics_server.stop()
+
 def main():
     try:
         # Get the token from environment variable
@@ -764,29 +1273,17 @@ def main():
             raise ValueError("BOT_OWNER_ID not found in environment variables")
         
         logger.info("Starting bot...")
-        # Create the Application and pass it your bot's token
-        application = Application.builder().token(token).build()
-
-        # Add handlers
-        application.add_handler(CommandHandler("start", start))
-        application.add_handler(CallbackQueryHandler(button))
-        application.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, handle_message))
-        application.add_handler(MessageHandler(filters.PHOTO, handle_message))
-        application.add_error_handler(error_handler)
+        application = build_application(token)
 
         # Start the Bot
-        logger.info("Bot is running...")
-        application.run_polling()
+        logger.info(f"Bot is running ({BOT_MODE}, up to {CONCURRENT_UPDATES} concurrent updates)...")
+        run_application(application)
     except Exception as e:
         logger.error(f"Error in main: {str(e)}")
         raise
     finally:
-        # Close database connection
-        interview.db_manager.close()
+        close_components()
 
 if __name__ == '__main__':
     main()
 
-
-def db_config():
-    return None
\ No newline at end of file
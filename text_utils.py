@@ -0,0 +1,7 @@
+import unicodedata
+
+
+def fold(text: str) -> str:
+    """Lowercase text without accents: 'Vacinação' -> 'vacinacao'"""
+    decomposed = unicodedata.normalize('NFKD', text.lower())
+    return ''.join(ch for ch in decomposed if not unicodedata.combining(ch))
@@ -0,0 +1,76 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Dict, Hashable, List, Optional
+from telegram import Update
+from telegram.ext import BaseUpdateProcessor
+
+logger = logging.getLogger(__name__)
+
+
+class PerUserUpdateProcessor(BaseUpdateProcessor):
+    """Processes updates concurrently while keeping each user's updates in order.
+
+    Updates from different users run in parallel, up to
+    max_concurrent_updates at a time. Updates from the same user (or chat,
+    for updates without a user) wait on a per-user lock, so an interview
+    never sees its answers out of order; only the update holding it takes
+    one of the slots. Locks are dropped as soon as no
+    update of that user is pending.
+    """
+
+    def __init__(self, max_concurrent_updates: int):
+        super().__init__(max_concurrent_updates)
+        # key -> [lock, number of updates holding or waiting for it]
+        self._locks: Dict[Hashable, List[Any]] = {}
+
+    @staticmethod
+    def ordering_key(update: object) -> Optional[Hashable]:
+        """Key whose updates must be processed sequentially"""
+        if not isinstance(update, Update):
+            return None
+        if update.effective_user is not None:
+            return ('user', update.effective_user.id)
+        if update.effective_chat is not None:
+            return ('chat', update.effective_chat.id)
+        return None
+
+    async def process_update(self, update: object, coroutine: Awaitable[Any]) -> None:
+        """Waits for the user's earlier updates, then for a free slot, then processes the update.
+
+        Overrides the base class, which takes the slot first: a burst from one
+        user would otherwise fill every slot with updates that can only wait
+        for that user's lock, holding up everyone else.
+        """
+        key = self.ordering_key(update)
+        if key is None:
+            async with self._semaphore:
+                await self.do_process_update(update, coroutine)
+            return
+
+        entry = self._locks.get(key)
+        if entry is None:
+            entry = self._locks[key] = [asyncio.Lock(), 0]
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                async with self._semaphore:
+                    await self.do_process_update(update, coroutine)
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self._locks[key]
+
+    async def do_process_update(self, update: object, coroutine: Awaitable[Any]) -> None:
+        await coroutine
+
+    @property
+    def pending_users(self) -> int:
+        """Number of users with updates in flight"""
+        return len(self._locks)
+
+    async def initialize(self) -> None:
+        pass
+
+    async def shutdown(self) -> None:
+        if self._locks:
+            logger.warning(f"Shutting down with updates pending for {len(self._locks)} users")